@@ -3,7 +3,7 @@ Admin configuration for artists app.
 """
 
 from django.contrib import admin
-from .models import Artist, ArtistPortfolio
+from .models import Artist, ArtistPortfolio, Tag
 
 
 class PortfolioInline(admin.TabularInline):
@@ -14,7 +14,7 @@ class PortfolioInline(admin.TabularInline):
 @admin.register(Artist)
 class ArtistAdmin(admin.ModelAdmin):
     list_display = ('display_name', 'user', 'specialty', 'status', 
-                    'is_accepting_commissions', 'rating', 'created_at')
+                    'is_accepting_commissions', 'open_commissions', 'rating', 'created_at')
     list_filter = ('status', 'is_accepting_commissions')
     search_fields = ('display_name', 'user__email', 'specialty')
     ordering = ('-created_at',)
@@ -26,3 +26,9 @@ class ArtistPortfolioAdmin(admin.ModelAdmin):
     list_display = ('title', 'artist', 'is_featured', 'order', 'created_at')
     list_filter = ('is_featured',)
     search_fields = ('title', 'artist__display_name')
+
+
+@admin.register(Tag)
+class TagAdmin(admin.ModelAdmin):
+    list_display = ('name',)
+    search_fields = ('name',)
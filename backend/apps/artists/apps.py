@@ -5,3 +5,6 @@ class ArtistsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.artists'
     verbose_name = 'Artists'
+    
+    def ready(self):
+        import apps.artists.signals  # noqa
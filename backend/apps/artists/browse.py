@@ -0,0 +1,26 @@
+"""
+Cache versions for the public artist list and detail endpoints.
+
+The list pages depend on LIST_VERSION and each artist's detail on its own
+version (see apps.core.caching). Profile, portfolio and user changes, and
+newly stored image variants, bump them through signals.py; counter updates,
+which bypass model signals, bump them in counters.py: a changed rating or
+availability invalidates the list, any other counter only the artist's
+detail.
+"""
+
+from apps.core import caching
+
+LIST_VERSION = 'artists:list'
+
+
+def detail_version(artist_id):
+    return f'artists:detail:{artist_id}'
+
+
+def invalidate(*artist_ids, listing=True):
+    """Drop cached detail responses of the artists, and the list pages with `listing`."""
+    names = [detail_version(artist_id) for artist_id in artist_ids]
+    if listing:
+        names.append(LIST_VERSION)
+    caching.bump_on_commit(*names)
@@ -0,0 +1,48 @@
+"""
+Artist capacity.
+
+Each artist keeps `open_commissions`, the number of commissions in their
+queue (see Commission.OPEN_STATUSES), adjusted with F() expressions when a
+commission is created or leaves the queue (see counters.py). The queue
+limit is the artist's `max_queue_depth`, or settings.ARTIST_MAX_QUEUE_DEPTH
+when they have not set one; a limit of None means unlimited.
+
+`is_accepting_commissions` is derived in the database from the artist's
+own switch (`accepting_enabled`) and the free capacity whenever either
+changes, so it flips off when the queue fills up and back on when work is
+finished, and reading it is a primary-key lookup.
+"""
+
+from django.conf import settings
+from django.db.models import BooleanField, Count, ExpressionWrapper, F, Q, Value
+from django.db.models.functions import Coalesce
+from apps.commissions.models import Commission
+
+
+def has_capacity():
+    """Q for artists whose queue is below its limit."""
+    default = settings.ARTIST_MAX_QUEUE_DEPTH
+    if default is None:
+        return Q(max_queue_depth__isnull=True) | Q(open_commissions__lt=F('max_queue_depth'))
+    return Q(open_commissions__lt=Coalesce(F('max_queue_depth'), Value(default)))
+
+
+def accepting_expression():
+    """`is_accepting_commissions` derived from the switch and the queue of the same row."""
+    return ExpressionWrapper(
+        Q(accepting_enabled=True) & has_capacity(), output_field=BooleanField()
+    )
+
+
+def compute_open_counts():
+    """{artist_id: open commissions} from one grouped query."""
+    rows = (
+        Commission.objects.filter(status__in=Commission.OPEN_STATUSES)
+        .order_by()
+        .values('artist_id')
+        .annotate(open_commissions=Count('id'))
+    )
+    return {
+        row['artist_id']: row['open_commissions']
+        for row in rows.iterator(chunk_size=2000)
+    }
@@ -0,0 +1,145 @@
+"""
+Denormalized counters on the Artist row.
+
+Every write to total_commissions, total_reviews, rating_sum, rating,
+open_commissions and is_accepting_commissions goes through this module.
+Increments are applied as `UPDATE ... SET col = col + n` on the counter
+columns only, so concurrent writers cannot lose updates and
+never rewrite unrelated columns such as `tags` from a stale instance.
+
+Code that bumps the same hot artist many times in one transaction can wrap
+the work in `coalesce()`: increments are then summed in memory and flushed
+as a single UPDATE per artist when the block exits.
+"""
+
+import threading
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+from . import browse, tags
+from .capacity import accepting_expression
+from .models import Artist
+from .ratings import rating_expression
+
+COUNTER_FIELDS = ('total_commissions', 'total_reviews', 'rating_sum', 'open_commissions')
+# Counters that `rating` is derived from.
+RATING_FIELDS = ('total_reviews', 'rating_sum')
+# Counters that `is_accepting_commissions` is derived from.
+CAPACITY_FIELDS = ('open_commissions',)
+
+_local = threading.local()
+
+
+def _delta(field, value):
+    if value >= 0:
+        return F(field) + value
+    # Never below zero, and never a negative intermediate on unsigned columns.
+    return Greatest(F(field), Value(-value)) - (-value)
+
+
+def _apply(artist_id, deltas):
+    updates = {field: _delta(field, value) for field, value in deltas.items() if value}
+    if not updates:
+        return
+    artists = Artist.objects.filter(pk=artist_id)
+    artists.update(**updates)
+    # Derived columns get separate statements: MySQL evaluates SET clauses left
+    # to right, so deriving them in the same UPDATE would see new values on MySQL only.
+    rating_changed = any(field in updates for field in RATING_FIELDS)
+    if rating_changed:
+        artists.filter(total_reviews__gt=0).update(rating=rating_expression())
+    if any(field in updates for field in CAPACITY_FIELDS):
+        refresh_accepting(artist_id)
+    # The list shows the rating; the other counters only appear on the detail page.
+    browse.invalidate(artist_id, listing=rating_changed)
+
+
+def increment(artist_id, **deltas):
+    """Add `deltas` (counter field -> amount) to an artist's counters."""
+    unknown = set(deltas) - set(COUNTER_FIELDS)
+    if unknown:
+        raise ValueError(f'Not an artist counter: {", ".join(sorted(unknown))}')
+    pending = getattr(_local, 'pending', None)
+    if pending is not None:
+        pending[artist_id].update(deltas)
+    else:
+        _apply(artist_id, deltas)
+
+
+@contextmanager
+def coalesce():
+    """
+    Buffer increments made in this thread and flush them on exit.
+    
+    Use inside the caller's transaction. Artists are flushed in primary key
+    order so concurrent batches lock rows in the same order. Nested blocks
+    join the outermost one; nothing is written if the block raises.
+    """
+    if getattr(_local, 'pending', None) is not None:
+        yield
+        return
+    _local.pending = pending = defaultdict(Counter)
+    try:
+        yield
+    finally:
+        _local.pending = None
+    for artist_id in sorted(pending):
+        _apply(artist_id, pending[artist_id])
+
+
+def record_completions(artist_id, count=1):
+    """Count commissions the artist completed."""
+    increment(artist_id, total_commissions=count)
+
+
+def record_review(artist_id, rating, previous_rating=None):
+    """
+    Count a client rating for an artist.
+    
+    Pass `previous_rating` when the client is replacing an earlier rating so
+    the review is not counted twice. Must run inside the review's transaction.
+    """
+    added = 0 if previous_rating is not None else 1
+    increment(
+        artist_id, rating_sum=rating - (previous_rating or 0), total_reviews=added
+    )
+
+
+def reserve_slot(artist_id):
+    """
+    Count a new commission in the artist's queue if they are accepting work.
+    
+    The check and the increment are one conditional UPDATE on the artist's
+    row, so concurrent requests cannot overfill the queue. Returns False if
+    the artist is not accepting commissions. Must run inside the
+    commission's transaction.
+    """
+    reserved = Artist.objects.filter(pk=artist_id, is_accepting_commissions=True).update(
+        open_commissions=F('open_commissions') + 1
+    )
+    if reserved:
+        refresh_accepting(artist_id)
+    return bool(reserved)
+
+
+def record_queue_change(artist_id, delta):
+    """Add `delta` commissions to (or remove them from) the artist's queue."""
+    increment(artist_id, open_commissions=delta)
+
+
+def refresh_accepting(*artist_ids):
+    """Re-derive is_accepting_commissions after the switch or the limit changed."""
+    changed = Artist.objects.filter(pk__in=artist_ids).exclude(
+        is_accepting_commissions=accepting_expression()
+    ).update(is_accepting_commissions=accepting_expression())
+    if changed:
+        # Facets only count artists that are accepting commissions.
+        tags.invalidate_facets()
+        browse.invalidate(*artist_ids)
+
+
+def refresh(artist):
+    """Reload the counter columns of an in-memory artist."""
+    artist.refresh_from_db(fields=[*COUNTER_FIELDS, 'rating', 'is_accepting_commissions'])
+    return artist
@@ -0,0 +1 @@
+# This file is required for Python to recognize this as a package
@@ -0,0 +1,65 @@
+"""
+Django management command to reconcile artist queue depths with their open commissions.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from apps.artists import counters
+from apps.artists.capacity import compute_open_counts
+from apps.artists.models import Artist
+
+
+class Command(BaseCommand):
+    help = 'Recounts every artist queue from open commissions, or checks them with --check'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument(
+            '--check', action='store_true',
+            help='Only report artists whose queue differs from their open commissions'
+        )
+    
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        check_only = options['check']
+        expected = compute_open_counts()
+        processed = mismatched = 0
+        
+        for artists in self._artist_batches(batch_size):
+            stale = []
+            for artist in artists:
+                wanted = expected.get(artist.pk, 0)
+                if artist.open_commissions != wanted:
+                    if check_only:
+                        self.stdout.write(self.style.ERROR(
+                            f'artist {artist.pk}: stored={artist.open_commissions} expected={wanted}'
+                        ))
+                    artist.open_commissions = wanted
+                    stale.append(artist)
+            if stale and not check_only:
+                with transaction.atomic():
+                    Artist.objects.bulk_update(stale, ['open_commissions'])
+                    counters.refresh_accepting(*[artist.pk for artist in stale])
+            processed += len(artists)
+            mismatched += len(stale)
+        
+        self.stdout.write(f'{processed} artist(s) processed, {mismatched} out of date')
+        if check_only and mismatched:
+            raise CommandError(f'{mismatched} artist queue(s) are out of date')
+        if check_only:
+            self.stdout.write(self.style.SUCCESS('Artist queues are consistent'))
+        else:
+            self.stdout.write(self.style.SUCCESS('Artist queues reconciled'))
+    
+    def _artist_batches(self, batch_size):
+        """Yield artists in keyset-paginated batches, loading only the queue column."""
+        last_id = 0
+        while True:
+            artists = list(
+                Artist.objects.filter(pk__gt=last_id).order_by('pk')
+                .only('pk', 'open_commissions')[:batch_size]
+            )
+            if not artists:
+                return
+            yield artists
+            last_id = artists[-1].pk
@@ -0,0 +1,71 @@
+"""
+Django management command to reconcile artist ratings with the commission reviews.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from apps.artists.models import Artist
+from apps.artists.ratings import average, compute_ratings, rating_expression
+
+
+class Command(BaseCommand):
+    help = 'Recomputes every artist rating from client reviews, or checks them with --check'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument(
+            '--check', action='store_true',
+            help='Only report artists whose rating differs from their reviews'
+        )
+    
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        check_only = options['check']
+        expected = compute_ratings()
+        processed = mismatched = 0
+        
+        for artists in self._artist_batches(batch_size):
+            stale = []
+            for artist in artists:
+                rating_sum, total_reviews = expected.get(artist.pk, (0, 0))
+                wanted = (rating_sum, total_reviews, average(rating_sum, total_reviews))
+                if (artist.rating_sum, artist.total_reviews, artist.rating) != wanted:
+                    if check_only:
+                        self.stdout.write(self.style.ERROR(
+                            f'artist {artist.pk}: stored=({artist.rating_sum}, '
+                            f'{artist.total_reviews}, {artist.rating}) expected={wanted}'
+                        ))
+                    artist.rating_sum, artist.total_reviews = rating_sum, total_reviews
+                    stale.append(artist)
+            if stale and not check_only:
+                self._write_batch(stale)
+            processed += len(artists)
+            mismatched += len(stale)
+        
+        self.stdout.write(f'{processed} artist(s) processed, {mismatched} out of date')
+        if check_only and mismatched:
+            raise CommandError(f'{mismatched} artist rating(s) are out of date')
+        if check_only:
+            self.stdout.write(self.style.SUCCESS('Artist ratings are consistent'))
+        else:
+            self.stdout.write(self.style.SUCCESS('Artist ratings reconciled'))
+    
+    def _artist_batches(self, batch_size):
+        """Yield artists in keyset-paginated batches, loading only the rating columns."""
+        last_id = 0
+        while True:
+            artists = list(
+                Artist.objects.filter(pk__gt=last_id).order_by('pk')
+                .only('pk', 'rating', 'rating_sum', 'total_reviews')[:batch_size]
+            )
+            if not artists:
+                return
+            yield artists
+            last_id = artists[-1].pk
+    
+    def _write_batch(self, artists):
+        with transaction.atomic():
+            Artist.objects.bulk_update(artists, ['rating_sum', 'total_reviews'])
+            pks = [artist.pk for artist in artists]
+            Artist.objects.filter(pk__in=pks, total_reviews__gt=0).update(rating=rating_expression())
+            Artist.objects.filter(pk__in=pks, total_reviews=0).update(rating=0)
@@ -0,0 +1,63 @@
+# Generated by Django 4.2.9 on 2026-10-17 20:29
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Artist',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('display_name', models.CharField(max_length=100)),
+                ('specialty', models.CharField(max_length=200)),
+                ('description', models.TextField(blank=True, null=True)),
+                ('hourly_rate', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('minimum_price', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('maximum_price', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('turnaround_days', models.PositiveIntegerField(default=7)),
+                ('status', models.CharField(choices=[('pending', 'Pending Approval'), ('approved', 'Approved'), ('suspended', 'Suspended')], default='pending', max_length=20)),
+                ('is_accepting_commissions', models.BooleanField(default=True)),
+                ('rating', models.DecimalField(decimal_places=2, default=0, max_digits=3)),
+                ('total_reviews', models.PositiveIntegerField(default=0)),
+                ('total_commissions', models.PositiveIntegerField(default=0)),
+                ('tags', models.JSONField(blank=True, default=list)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='artist_profile', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Artist',
+                'verbose_name_plural': 'Artists',
+                'db_table': 'artists',
+            },
+        ),
+        migrations.CreateModel(
+            name='ArtistPortfolio',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=200)),
+                ('description', models.TextField(blank=True, null=True)),
+                ('image', models.ImageField(upload_to='portfolio/')),
+                ('is_featured', models.BooleanField(default=False)),
+                ('order', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('artist', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='portfolio_items', to='artists.artist')),
+            ],
+            options={
+                'verbose_name': 'Portfolio Item',
+                'verbose_name_plural': 'Portfolio Items',
+                'db_table': 'artist_portfolios',
+                'ordering': ['order', '-created_at'],
+            },
+        ),
+    ]
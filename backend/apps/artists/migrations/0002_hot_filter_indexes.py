@@ -0,0 +1,17 @@
+# Generated by Django 4.2.9 on 2026-10-17 20:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artists', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='artist',
+            index=models.Index(fields=['status', 'rating'], name='artist_status_rating_idx'),
+        ),
+    ]
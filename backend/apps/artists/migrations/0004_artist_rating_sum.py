@@ -0,0 +1,36 @@
+# Generated by Django 4.2.9 on 2026-10-17 20:37
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def backfill_rating_sums(apps, schema_editor):
+    Artist = apps.get_model('artists', 'Artist')
+    Commission = apps.get_model('commissions', 'Commission')
+    rows = (
+        Commission.objects.filter(client_rating__isnull=False)
+        .order_by()
+        .values('artist_id')
+        .annotate(rating_sum=Sum('client_rating'), total_reviews=Count('id'))
+    )
+    for row in rows.iterator():
+        Artist.objects.filter(pk=row['artist_id']).update(
+            rating_sum=row['rating_sum'], total_reviews=row['total_reviews']
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artists', '0003_artist_fulltext'),
+        ('commissions', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='artist',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_rating_sums, migrations.RunPython.noop),
+    ]
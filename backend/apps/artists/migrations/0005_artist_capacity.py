@@ -0,0 +1,61 @@
+# Generated by Django 4.2.9 on 2026-10-17 21:10
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, F
+
+OPEN_STATUSES = ('pending', 'accepted', 'in_progress', 'revision')
+
+
+def backfill_capacity(apps, schema_editor):
+    Artist = apps.get_model('artists', 'Artist')
+    Commission = apps.get_model('commissions', 'Commission')
+    # The old manual flag becomes the artist's switch.
+    Artist.objects.update(accepting_enabled=F('is_accepting_commissions'))
+    rows = (
+        Commission.objects.filter(status__in=OPEN_STATUSES)
+        .order_by()
+        .values('artist_id')
+        .annotate(open_commissions=Count('id'))
+    )
+    for row in rows.iterator():
+        Artist.objects.filter(pk=row['artist_id']).update(
+            open_commissions=row['open_commissions']
+        )
+    limit = settings.ARTIST_MAX_QUEUE_DEPTH
+    if limit is not None:
+        Artist.objects.filter(open_commissions__gte=limit).update(
+            is_accepting_commissions=False
+        )
+
+
+def restore_flag(apps, schema_editor):
+    Artist = apps.get_model('artists', 'Artist')
+    Artist.objects.update(is_accepting_commissions=F('accepting_enabled'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artists', '0004_artist_rating_sum'),
+        ('commissions', '0007_deadline_reminder'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='artist',
+            name='accepting_enabled',
+            field=models.BooleanField(default=True),
+        ),
+        migrations.AddField(
+            model_name='artist',
+            name='max_queue_depth',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='artist',
+            name='open_commissions',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_capacity, restore_flag),
+    ]
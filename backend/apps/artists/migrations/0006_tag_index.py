@@ -0,0 +1,70 @@
+# Generated by Django 4.2.9 on 2026-10-17 21:13
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def normalize(tags):
+    # Frozen copy of apps.artists.tags.normalize.
+    if not isinstance(tags, (list, tuple)):
+        return []
+    names = []
+    for tag in tags:
+        if isinstance(tag, str):
+            name = ' '.join(tag.split()).lower()[:50]
+            if name and name not in names:
+                names.append(name)
+    return names
+
+
+def backfill_tag_index(apps, schema_editor):
+    Artist = apps.get_model('artists', 'Artist')
+    Tag = apps.get_model('artists', 'Tag')
+    ArtistTag = apps.get_model('artists', 'ArtistTag')
+    tag_ids = {}
+    for pk, tags in Artist.objects.values_list('pk', 'tags').iterator(chunk_size=2000):
+        links = []
+        for name in normalize(tags):
+            if name not in tag_ids:
+                tag_ids[name] = Tag.objects.create(name=name).pk
+            links.append(ArtistTag(artist_id=pk, tag_id=tag_ids[name]))
+        ArtistTag.objects.bulk_create(links)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artists', '0005_artist_capacity'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+            ],
+            options={
+                'verbose_name': 'Tag',
+                'verbose_name_plural': 'Tags',
+                'db_table': 'tags',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArtistTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('artist', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tag_links', to='artists.artist')),
+                ('tag', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='artist_links', to='artists.tag')),
+            ],
+            options={
+                'verbose_name': 'Artist Tag',
+                'verbose_name_plural': 'Artist Tags',
+                'db_table': 'artist_tags',
+                'indexes': [models.Index(fields=['tag', 'artist'], name='artist_tag_tag_idx')],
+                'unique_together': {('artist', 'tag')},
+            },
+        ),
+        migrations.RunPython(backfill_tag_index, migrations.RunPython.noop),
+    ]
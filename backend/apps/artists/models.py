@@ -1,5 +1,5 @@
 """
-Artist models - Artist and ArtistPortfolio (Tables 3-4)
+Artist models - Artist and ArtistPortfolio (Tables 3-4) and the tag index.
 """
 
 from django.db import models
@@ -27,10 +27,20 @@ class Artist(models.Model):
     maximum_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
     turnaround_days = models.PositiveIntegerField(default=7)
     status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
+    # Derived from accepting_enabled and the free queue capacity, see capacity.py.
     is_accepting_commissions = models.BooleanField(default=True)
+    # The artist's own availability switch.
+    accepting_enabled = models.BooleanField(default=True)
+    # Commissions in the artist's queue (Commission.OPEN_STATUSES).
+    open_commissions = models.PositiveIntegerField(default=0)
+    # None falls back to settings.ARTIST_MAX_QUEUE_DEPTH.
+    max_queue_depth = models.PositiveIntegerField(null=True, blank=True)
     rating = models.DecimalField(max_digits=3, decimal_places=2, default=0)
+    # Sum of all client ratings; rating == rating_sum / total_reviews.
+    rating_sum = models.PositiveIntegerField(default=0)
     total_reviews = models.PositiveIntegerField(default=0)
     total_commissions = models.PositiveIntegerField(default=0)
+    # Tags as entered by the artist; indexed in ArtistTag, see tags.py.
     tags = models.JSONField(default=list, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -39,6 +49,9 @@ class Artist(models.Model):
         db_table = 'artists'
         verbose_name = 'Artist'
         verbose_name_plural = 'Artists'
+        indexes = [
+            models.Index(fields=['status', 'rating'], name='artist_status_rating_idx'),
+        ]
     
     def __str__(self):
         return self.display_name
@@ -67,3 +80,45 @@ class ArtistPortfolio(models.Model):
     
     def __str__(self):
         return f"{self.artist.display_name} - {self.title}"
+
+
+class Tag(models.Model):
+    """A normalized artist tag, see tags.py."""
+    
+    name = models.CharField(max_length=50, unique=True)
+    
+    class Meta:
+        db_table = 'tags'
+        verbose_name = 'Tag'
+        verbose_name_plural = 'Tags'
+        ordering = ['name']
+    
+    def __str__(self):
+        return self.name
+
+
+class ArtistTag(models.Model):
+    """Index row linking an artist to one of their tags, synced from Artist.tags."""
+    
+    artist = models.ForeignKey(
+        Artist,
+        on_delete=models.CASCADE,
+        related_name='tag_links'
+    )
+    tag = models.ForeignKey(
+        Tag,
+        on_delete=models.CASCADE,
+        related_name='artist_links'
+    )
+    
+    class Meta:
+        db_table = 'artist_tags'
+        verbose_name = 'Artist Tag'
+        verbose_name_plural = 'Artist Tags'
+        unique_together = ['artist', 'tag']
+        indexes = [
+            models.Index(fields=['tag', 'artist'], name='artist_tag_tag_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.artist_id} - {self.tag_id}"
@@ -0,0 +1,45 @@
+"""
+Incrementally maintained artist ratings.
+
+Each artist keeps a running `rating_sum` and `total_reviews`. A review adjusts
+both with F() expressions in the review's transaction (see
+`counters.record_review`) and `rating` is derived from them in the database,
+so the cost of a review does not grow with the number of reviews the artist
+already has and concurrent reviews cannot overwrite each other.
+"""
+
+from decimal import ROUND_HALF_UP, Decimal
+from django.db.models import Count, ExpressionWrapper, F, FloatField, Sum, Value
+from django.db.models.functions import Round
+from apps.commissions.models import Commission
+
+RATING_PLACES = Decimal('0.01')
+
+
+def rating_expression():
+    """`rating` derived from the running sum and count of the same row."""
+    # The 1.0 literal avoids integer division on SQLite; MySQL reads it as an
+    # exact DECIMAL, so the division and ROUND stay exact there.
+    rating_sum = ExpressionWrapper(F('rating_sum') * Value(1.0), output_field=FloatField())
+    return Round(rating_sum / F('total_reviews'), 2)
+
+
+def average(rating_sum, total_reviews):
+    """Python counterpart of rating_expression()."""
+    if not total_reviews:
+        return Decimal('0.00')
+    return (Decimal(rating_sum) / total_reviews).quantize(RATING_PLACES, ROUND_HALF_UP)
+
+
+def compute_ratings():
+    """{artist_id: (rating_sum, total_reviews)} from one grouped query."""
+    rows = (
+        Commission.objects.filter(client_rating__isnull=False)
+        .order_by()
+        .values('artist_id')
+        .annotate(rating_sum=Sum('client_rating'), total_reviews=Count('id'))
+    )
+    return {
+        row['artist_id']: (row['rating_sum'], row['total_reviews'])
+        for row in rows.iterator(chunk_size=2000)
+    }
@@ -3,20 +3,30 @@ Artist serializers for API endpoints.
 """
 
 from rest_framework import serializers
+from . import counters
 from .models import Artist, ArtistPortfolio
+from apps.core.fieldsets import DynamicFieldsMixin
+from apps.media.serializers import (
+    ImageVariantsField, ImageVariantsListSerializer, ValidatedImageField
+)
 from apps.users.serializers import UserSerializer
 
 
 class ArtistPortfolioSerializer(serializers.ModelSerializer):
     """Serializer for ArtistPortfolio model."""
     
+    image = ValidatedImageField()
+    image_variants = ImageVariantsField(source='image')
+    
     class Meta:
         model = ArtistPortfolio
-        fields = ['id', 'title', 'description', 'image', 'is_featured', 'order', 'created_at']
+        fields = ['id', 'title', 'description', 'image', 'image_variants',
+                  'is_featured', 'order', 'created_at']
         read_only_fields = ['id', 'created_at']
+        list_serializer_class = ImageVariantsListSerializer
 
 
-class ArtistSerializer(serializers.ModelSerializer):
+class ArtistSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer for Artist model."""
     
     user = UserSerializer(read_only=True)
@@ -28,8 +38,39 @@ class ArtistSerializer(serializers.ModelSerializer):
                   'hourly_rate', 'minimum_price', 'maximum_price', 'turnaround_days',
                   'status', 'is_accepting_commissions', 'rating', 'total_reviews',
                   'total_commissions', 'tags', 'portfolio_items', 'created_at', 'updated_at']
-        read_only_fields = ['id', 'user', 'status', 'rating', 'total_reviews', 
+        read_only_fields = ['id', 'user', 'status', 'is_accepting_commissions',
+                           'rating', 'total_reviews',
                            'total_commissions', 'created_at', 'updated_at']
+        select_related = {'user': ['user__profile']}
+        prefetch_related = {'portfolio_items': ['portfolio_items']}
+    
+    def update(self, instance, validated_data):
+        # Save only the edited columns; the counters are maintained with F()
+        # updates and the instance may hold stale values for them.
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        instance.save(update_fields=[*validated_data, 'updated_at'])
+        if {'accepting_enabled', 'max_queue_depth'} & set(validated_data):
+            counters.refresh_accepting(instance.pk)
+            counters.refresh(instance)
+        return instance
+
+
+class ArtistOwnerSerializer(ArtistSerializer):
+    """Artist profile as its owner (or an admin) sees it, with the queue settings."""
+    
+    class Meta(ArtistSerializer.Meta):
+        fields = [*ArtistSerializer.Meta.fields, 'accepting_enabled', 'open_commissions',
+                  'max_queue_depth']
+        read_only_fields = [*ArtistSerializer.Meta.read_only_fields, 'open_commissions']
+    
+    def to_internal_value(self, data):
+        # is_accepting_commissions is derived from the switch and the queue;
+        # clients that still write it are toggling the switch.
+        if 'is_accepting_commissions' in data and 'accepting_enabled' not in data:
+            data = data.copy()
+            data['accepting_enabled'] = data['is_accepting_commissions']
+        return super().to_internal_value(data)
 
 
 class ArtistCreateSerializer(serializers.ModelSerializer):
@@ -47,14 +88,23 @@ class ArtistCreateSerializer(serializers.ModelSerializer):
         return Artist.objects.create(user=user, **validated_data)
 
 
-class ArtistListSerializer(serializers.ModelSerializer):
+class ArtistListSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Lightweight serializer for artist listings."""
     
     username = serializers.CharField(source='user.username', read_only=True)
     avatar = serializers.ImageField(source='user.avatar', read_only=True)
+    avatar_variants = ImageVariantsField(source='user.avatar')
     
     class Meta:
         model = Artist
-        fields = ['id', 'username', 'avatar', 'display_name', 'specialty',
+        fields = ['id', 'username', 'avatar', 'avatar_variants', 'display_name', 'specialty',
                   'minimum_price', 'maximum_price', 'turnaround_days',
                   'is_accepting_commissions', 'rating', 'total_reviews', 'tags']
+        list_serializer_class = ImageVariantsListSerializer
+        select_related = {'username': ['user'], 'avatar': ['user'], 'avatar_variants': ['user']}
+        expandable_fields = {
+            'portfolio_items': {
+                'serializer': ArtistPortfolioSerializer, 'many': True,
+                'prefetch_related': ['portfolio_items'],
+            },
+        }
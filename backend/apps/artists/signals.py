@@ -0,0 +1,70 @@
+"""
+Artist signals: keep the tag index in sync and invalidate the tag facets
+and the cached public artist responses.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from apps.media.derivatives import variants_stored
+from . import browse
+from .models import Artist, ArtistPortfolio
+from .tags import invalidate_facets, sync_artist_tags
+
+
+@receiver(post_save, sender=Artist)
+def sync_tags(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    """Re-index the artist's tags when they were saved."""
+    if raw or (update_fields is not None and 'tags' not in update_fields):
+        return
+    if created and not instance.tags:
+        return
+    sync_artist_tags(instance)
+
+
+post_save.connect(invalidate_facets, sender=Artist, dispatch_uid='tag-facets-save')
+post_delete.connect(invalidate_facets, sender=Artist, dispatch_uid='tag-facets-delete')
+
+
+def artist_changed(sender, instance, **kwargs):
+    browse.invalidate(instance.pk)
+
+
+def portfolio_changed(sender, instance, **kwargs):
+    # Portfolio items only appear on the artist's detail page.
+    browse.invalidate(instance.artist_id, listing=False)
+
+
+def user_changed(sender, instance, update_fields=None, **kwargs):
+    """The list and detail pages show the artist's user and profile."""
+    if instance.role != 'artist' or (update_fields and set(update_fields) <= {'last_login'}):
+        return
+    artist_ids = list(Artist.objects.filter(user_id=instance.pk).values_list('pk', flat=True))
+    if artist_ids:
+        browse.invalidate(*artist_ids)
+
+
+def profile_changed(sender, instance, **kwargs):
+    user_changed(sender, instance.user)
+
+
+def variants_changed(sender, source, **kwargs):
+    """Cached list and detail pages embed the variants of avatars and portfolio images."""
+    artist_ids = set(
+        Artist.objects.filter(user__avatar=source).values_list('pk', flat=True)
+    )
+    portfolio_ids = set(
+        ArtistPortfolio.objects.filter(image=source).values_list('artist_id', flat=True)
+    )
+    if artist_ids:
+        browse.invalidate(*artist_ids)
+    if portfolio_ids - artist_ids:
+        browse.invalidate(*(portfolio_ids - artist_ids), listing=False)
+
+
+for signal in (post_save, post_delete):
+    kind = 'save' if signal is post_save else 'delete'
+    signal.connect(artist_changed, sender=Artist, dispatch_uid=f'artist-browse-{kind}')
+    signal.connect(portfolio_changed, sender=ArtistPortfolio, dispatch_uid=f'portfolio-browse-{kind}')
+post_save.connect(user_changed, sender='users.User', dispatch_uid='user-browse-save')
+post_save.connect(profile_changed, sender='users.UserProfile', dispatch_uid='profile-browse-save')
+variants_stored.connect(variants_changed, dispatch_uid='variants-browse-stored')
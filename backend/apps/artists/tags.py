@@ -0,0 +1,90 @@
+"""
+Artist tag index and facet counts.
+
+`Artist.tags` keeps the tags as the artist typed them. Their normalized
+form (trimmed, single-spaced, lowercase) is indexed as Tag / ArtistTag rows,
+re-synced whenever an artist is saved with its tags (see signals.py), so
+tag filters are index lookups on artist_tags instead of a scan over every
+artist's JSON.
+
+Facet counts for the public browse page (approved artists that are
+accepting commissions) are one grouped query, cached until an artist
+changes.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
+from .models import Artist, ArtistTag, Tag
+
+FACETS_KEY = 'artists:tag-facets'
+MAX_LENGTH = Tag._meta.get_field('name').max_length
+
+
+def normalize(tags):
+    """Normalized, de-duplicated tag names in their original order."""
+    if not isinstance(tags, (list, tuple)):
+        return []
+    names = []
+    for tag in tags:
+        if not isinstance(tag, str):
+            continue
+        name = ' '.join(tag.split()).lower()[:MAX_LENGTH]
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+def sync_artist_tags(artist):
+    """Make the artist's ArtistTag rows match `artist.tags`."""
+    names = normalize(artist.tags)
+    with transaction.atomic():
+        Tag.objects.bulk_create([Tag(name=name) for name in names], ignore_conflicts=True)
+        wanted = set(Tag.objects.filter(name__in=names).values_list('pk', flat=True))
+        links = ArtistTag.objects.filter(artist=artist)
+        current = set(links.values_list('tag_id', flat=True))
+        if current - wanted:
+            links.filter(tag_id__in=current - wanted).delete()
+        ArtistTag.objects.bulk_create(
+            [ArtistTag(artist=artist, tag_id=tag_id) for tag_id in wanted - current],
+            ignore_conflicts=True,
+        )
+
+
+def filter_by_tags(queryset, names, match_all=False):
+    """Artists tagged with any (or, with `match_all`, every) one of `names`."""
+    names = normalize(names)
+    if not names:
+        return queryset
+    links = ArtistTag.objects.filter(tag__name__in=names).order_by().values('artist_id')
+    if match_all and len(names) > 1:
+        links = links.annotate(matched=Count('tag_id')).filter(matched=len(names))
+    return queryset.filter(pk__in=links.values('artist_id'))
+
+
+def compute_facets():
+    """[{'name', 'count'}] over approved artists accepting commissions, most used first."""
+    rows = (
+        ArtistTag.objects.filter(
+            artist__status=Artist.Status.APPROVED,
+            artist__is_accepting_commissions=True,
+        )
+        .values('tag__name')
+        .annotate(count=Count('artist_id'))
+        .order_by('-count', 'tag__name')
+    )
+    return [{'name': row['tag__name'], 'count': row['count']} for row in rows]
+
+
+def get_facets():
+    facets = cache.get(FACETS_KEY)
+    if facets is None:
+        facets = compute_facets()
+        cache.set(FACETS_KEY, facets, settings.ARTIST_TAG_FACETS_TTL)
+    return facets
+
+
+def invalidate_facets(**kwargs):
+    """Drop the cached facets once the transaction commits; usable as a signal receiver."""
+    transaction.on_commit(lambda: cache.delete(FACETS_KEY))
@@ -9,6 +9,7 @@ urlpatterns = [
     path('', views.ArtistListView.as_view(), name='artist-list'),
     path('create/', views.ArtistCreateView.as_view(), name='artist-create'),
     path('me/', views.ArtistUpdateView.as_view(), name='artist-me'),
+    path('tags/', views.ArtistTagFacetView.as_view(), name='artist-tag-facets'),
     path('<int:pk>/', views.ArtistDetailView.as_view(), name='artist-detail'),
     
     # Portfolio
@@ -7,31 +7,74 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.parsers import MultiPartParser, FormParser
 from django.shortcuts import get_object_or_404
+from . import browse, tags
 from .models import Artist, ArtistPortfolio
 from .serializers import (
-    ArtistSerializer, ArtistCreateSerializer, 
+    ArtistSerializer, ArtistCreateSerializer, ArtistOwnerSerializer,
     ArtistListSerializer, ArtistPortfolioSerializer
 )
+from apps.core import caching
+from apps.core.caching import CachedResponseMixin
+from apps.core.conditional import ConditionalGetMixin
+from apps.core.fieldsets import EagerLoadingMixin
 from apps.users.permissions import IsAdminUser, IsArtistUser, IsOwnerOrAdmin
 
 
-class ArtistListView(generics.ListAPIView):
-    """List all approved artists."""
+class ArtistListView(CachedResponseMixin, EagerLoadingMixin, generics.ListAPIView):
+    """
+    List all approved artists.
+    
+    `?tags=a,b` keeps artists with any of the tags, or with all of them
+    when `?tags_match=all` is given. Pages are served from the response cache.
+    """
     
     queryset = Artist.objects.filter(status='approved')
     serializer_class = ArtistListSerializer
     permission_classes = [permissions.AllowAny]
     filterset_fields = ['specialty', 'is_accepting_commissions']
     search_fields = ['display_name', 'specialty', 'description']
+    fulltext_search = True
     ordering_fields = ['rating', 'minimum_price', 'created_at']
+    
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        names = [
+            name for value in self.request.query_params.getlist('tags')
+            for name in value.split(',')
+        ]
+        if names:
+            match_all = self.request.query_params.get('tags_match') == 'all'
+            queryset = tags.filter_by_tags(queryset, names, match_all=match_all)
+        return queryset
+    
+    def get_cache_versions(self):
+        return [browse.LIST_VERSION]
+
+
+class ArtistTagFacetView(APIView):
+    """Tag counts over approved artists that are accepting commissions."""
+    
+    permission_classes = [permissions.AllowAny]
+    
+    def get(self, request):
+        return Response(tags.get_facets())
 
 
-class ArtistDetailView(generics.RetrieveAPIView):
-    """Get artist details."""
+class ArtistDetailView(ConditionalGetMixin, CachedResponseMixin, EagerLoadingMixin,
+                       generics.RetrieveAPIView):
+    """Get artist details, served from the response cache."""
     
     queryset = Artist.objects.filter(status='approved')
     serializer_class = ArtistSerializer
     permission_classes = [permissions.AllowAny]
+    
+    def get_cache_versions(self):
+        return [browse.detail_version(self.kwargs['pk'])]
+    
+    def get_validator_values(self):
+        # The cache version changes whenever the response does; no query needed.
+        tokens = caching.get_versions(self.get_cache_versions())
+        return (*tokens, *[caching.token_time(token) for token in tokens])
 
 
 class ArtistCreateView(generics.CreateAPIView):
@@ -44,22 +87,24 @@ class ArtistCreateView(generics.CreateAPIView):
         serializer.save()
 
 
-class ArtistUpdateView(generics.UpdateAPIView):
-    """Update artist profile."""
+class ArtistUpdateView(generics.RetrieveUpdateAPIView):
+    """Get or update the current artist's own profile, queue settings included."""
     
     queryset = Artist.objects.all()
-    serializer_class = ArtistSerializer
+    serializer_class = ArtistOwnerSerializer
     permission_classes = [permissions.IsAuthenticated]
     
     def get_object(self):
-        return get_object_or_404(Artist, user=self.request.user)
+        return get_object_or_404(
+            Artist.objects.select_related('user__profile'), user=self.request.user
+        )
 
 
-class ArtistAdminListView(generics.ListAPIView):
+class ArtistAdminListView(EagerLoadingMixin, generics.ListAPIView):
     """List all artists for admin."""
     
     queryset = Artist.objects.all()
-    serializer_class = ArtistSerializer
+    serializer_class = ArtistOwnerSerializer
     permission_classes = [permissions.IsAuthenticated, IsAdminUser]
     filterset_fields = ['status', 'is_accepting_commissions']
     search_fields = ['display_name', 'user__email']
@@ -69,7 +114,7 @@ class ArtistAdminUpdateView(generics.UpdateAPIView):
     """Update artist status (admin only)."""
     
     queryset = Artist.objects.all()
-    serializer_class = ArtistSerializer
+    serializer_class = ArtistOwnerSerializer
     permission_classes = [permissions.IsAuthenticated, IsAdminUser]
     
     def patch(self, request, *args, **kwargs):
@@ -77,8 +122,8 @@ class ArtistAdminUpdateView(generics.UpdateAPIView):
         new_status = request.data.get('status')
         if new_status in ['pending', 'approved', 'suspended']:
             artist.status = new_status
-            artist.save()
-            return Response(ArtistSerializer(artist).data)
+            artist.save(update_fields=['status', 'updated_at'])
+            return Response(ArtistOwnerSerializer(artist).data)
         return Response({"error": "Invalid status"}, status=status.HTTP_400_BAD_REQUEST)
 
 
@@ -3,7 +3,11 @@ Admin configuration for commissions app.
 """
 
 from django.contrib import admin
-from .models import Commission, CommissionCategory, CommissionRevision
+from .revisions import SEQUENCE_FIELDS
+from .models import (
+    Commission, CommissionCategory, CommissionRevision, CommissionReferenceImage,
+    ArtworkUpload, ClientCommissionStats, ArtistCommissionStats
+)
 
 
 @admin.register(CommissionCategory)
@@ -20,6 +24,11 @@ class RevisionInline(admin.TabularInline):
     readonly_fields = ('revision_number', 'created_at')
 
 
+class ReferenceImageInline(admin.TabularInline):
+    model = CommissionReferenceImage
+    extra = 0
+
+
 @admin.register(Commission)
 class CommissionAdmin(admin.ModelAdmin):
     list_display = ('title', 'client', 'artist', 'status', 'priority', 
@@ -27,8 +36,16 @@ class CommissionAdmin(admin.ModelAdmin):
     list_filter = ('status', 'priority', 'category')
     search_fields = ('title', 'client__email', 'artist__display_name')
     ordering = ('-created_at',)
-    inlines = [RevisionInline]
-    readonly_fields = ('created_at', 'updated_at', 'started_at', 'completed_at')
+    inlines = [RevisionInline, ReferenceImageInline]
+    readonly_fields = ('created_at', 'updated_at', 'started_at', 'completed_at',
+                       *SEQUENCE_FIELDS)
+    
+    def save_model(self, request, obj, form, change):
+        if not change:
+            return super().save_model(request, obj, form, change)
+        # Only the edited columns: the revision sequence may have moved on
+        # since the form was loaded (see revisions.py).
+        obj.save(update_fields=[*form.changed_data, 'updated_at'])
 
 
 @admin.register(CommissionRevision)
@@ -36,3 +53,25 @@ class CommissionRevisionAdmin(admin.ModelAdmin):
     list_display = ('commission', 'revision_number', 'is_approved', 'created_at')
     list_filter = ('is_approved',)
     search_fields = ('commission__title',)
+
+
+@admin.register(ArtworkUpload)
+class ArtworkUploadAdmin(admin.ModelAdmin):
+    list_display = ('commission', 'target', 'filename', 'received', 'size',
+                    'uploaded_by', 'updated_at')
+    list_filter = ('target',)
+    readonly_fields = ('received', 'created_at', 'updated_at')
+
+
+@admin.register(ClientCommissionStats)
+class ClientCommissionStatsAdmin(admin.ModelAdmin):
+    list_display = ('user', 'total', 'pending', 'in_progress', 'delivered',
+                    'delivered_revenue', 'updated_at')
+    search_fields = ('user__email',)
+
+
+@admin.register(ArtistCommissionStats)
+class ArtistCommissionStatsAdmin(admin.ModelAdmin):
+    list_display = ('artist', 'total', 'pending', 'in_progress', 'delivered',
+                    'delivered_revenue', 'updated_at')
+    search_fields = ('artist__display_name',)
@@ -5,3 +5,6 @@ class CommissionsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.commissions'
     verbose_name = 'Commissions'
+    
+    def ready(self):
+        import apps.commissions.signals  # noqa
@@ -0,0 +1,121 @@
+"""
+Deadline reminders.
+
+Each commission records the last reminder it triggered in
+`deadline_reminder` (none, due soon, overdue). A scan only looks at
+commissions whose reminder is behind for their deadline, as a range on the
+(deadline_reminder, deadline) index, and moves every row it visits to the
+new stage. A run therefore touches only the commissions that became due
+since the previous run, however many deadlines are in the table.
+
+Only open commissions produce notifications; finished ones in the range
+are advanced silently so they are not visited again. Changing a deadline
+resets the stage (see Commission.save).
+"""
+
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from apps.artists.models import Artist
+from apps.notifications.models import Notification
+from .models import Commission
+
+Reminder = Commission.DeadlineReminder
+
+
+def due_soon(today):
+    """Commissions due within DEADLINE_REMINDER_DAYS that were not reminded yet."""
+    horizon = today + timedelta(days=settings.DEADLINE_REMINDER_DAYS)
+    return Commission.objects.filter(
+        deadline_reminder=Reminder.NONE, deadline__gte=today, deadline__lte=horizon
+    )
+
+
+def overdue(today):
+    """Commissions past their deadline that were not reported as overdue yet."""
+    return Commission.objects.filter(
+        deadline_reminder__in=[Reminder.NONE, Reminder.DUE_SOON], deadline__lt=today
+    )
+
+
+def _due_soon_notifications(row, artist_user_id, today):
+    days = (row['deadline'] - today).days
+    when = 'today' if days == 0 else f'in {days} day{"s" if days != 1 else ""}'
+    return [Notification(
+        user_id=artist_user_id, type=Notification.Type.DEADLINE_APPROACHING,
+        title='Deadline approaching',
+        message=f'"{row["title"]}" is due {when}.',
+        link=f'/commissions/{row["pk"]}', data={'commission_id': row['pk']},
+    )]
+
+
+def _overdue_notifications(row, artist_user_id, today):
+    message = f'"{row["title"]}" was due on {row["deadline"].isoformat()}.'
+    return [
+        Notification(
+            user_id=user_id, type=Notification.Type.DEADLINE_MISSED,
+            title='Deadline missed', message=message,
+            link=f'/commissions/{row["pk"]}', data={'commission_id': row['pk']},
+        )
+        for user_id in (artist_user_id, row['client_id'])
+    ]
+
+
+STAGES = (
+    (Reminder.OVERDUE, overdue, _overdue_notifications),
+    (Reminder.DUE_SOON, due_soon, _due_soon_notifications),
+)
+
+
+def _process_batch(queryset, stage, build, today, batch_size, after):
+    """
+    Claim, notify and advance one keyset batch; returns (last key, notified).
+    
+    Rows are locked with SKIP LOCKED where the database supports it, so
+    parallel schedulers split the work instead of notifying twice.
+    """
+    if after is not None:
+        deadline, pk = after
+        queryset = queryset.filter(Q(deadline__gt=deadline) | Q(deadline=deadline, pk__gt=pk))
+    with transaction.atomic():
+        rows = list(
+            queryset.select_for_update(skip_locked=True)
+            .order_by('deadline', 'pk')
+            .values('pk', 'title', 'deadline', 'status', 'client_id', 'artist_id')[:batch_size]
+        )
+        if not rows:
+            return None, 0
+        open_rows = [row for row in rows if row['status'] in Commission.OPEN_STATUSES]
+        artist_users = dict(
+            Artist.objects.filter(pk__in={row['artist_id'] for row in open_rows})
+            .values_list('pk', 'user_id')
+        )
+        notifications = []
+        for row in open_rows:
+            notifications.extend(build(row, artist_users[row['artist_id']], today))
+        Notification.objects.bulk_create(notifications, batch_size=500)
+        Commission.objects.filter(pk__in=[row['pk'] for row in rows]).update(
+            deadline_reminder=stage
+        )
+    last = rows[-1]
+    return (last['deadline'], last['pk']), len(open_rows)
+
+
+def send_reminders(today=None, batch_size=500):
+    """Run one scan; returns {stage label: commissions notified}."""
+    today = today or timezone.localdate()
+    sent = {}
+    # Overdue first: the more urgent reminders go out before the rest.
+    for stage, candidates, build in STAGES:
+        notified, after = 0, None
+        while True:
+            after, count = _process_batch(
+                candidates(today), stage, build, today, batch_size, after
+            )
+            if after is None:
+                break
+            notified += count
+        sent[stage.label] = notified
+    return sent
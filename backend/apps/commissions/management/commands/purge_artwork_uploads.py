@@ -0,0 +1,48 @@
+"""
+Django management command to discard abandoned chunked artwork uploads.
+"""
+
+import os
+from datetime import timedelta
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from apps.commissions.models import ArtworkUpload
+from apps.commissions.uploads import PARTS_DIR, abort
+
+
+class Command(BaseCommand):
+    help = 'Deletes chunked artwork uploads (and their part files) that stopped receiving chunks'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--hours', type=int, default=48,
+            help='Discard uploads that received no chunk for this many hours'
+        )
+    
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options['hours'])
+        stale = ArtworkUpload.objects.filter(updated_at__lt=cutoff)
+        purged = 0
+        for upload in stale.iterator(chunk_size=500):
+            abort(upload)
+            purged += 1
+        orphans = self.purge_orphans(cutoff)
+        self.stdout.write(self.style.SUCCESS(
+            f'{purged} abandoned upload(s) and {orphans} orphaned part file(s) discarded'
+        ))
+    
+    def purge_orphans(self, cutoff):
+        """Delete old part files (plain or claimed `.part.done`) whose upload row is gone."""
+        directory = default_storage.path(PARTS_DIR)
+        if not os.path.isdir(directory):
+            return 0
+        live = {str(pk) for pk in ArtworkUpload.objects.values_list('pk', flat=True)}
+        purged = 0
+        for entry in os.scandir(directory):
+            upload_id = entry.name.split('.', 1)[0]
+            if upload_id in live or entry.stat().st_mtime >= cutoff.timestamp():
+                continue
+            os.unlink(entry.path)
+            purged += 1
+        return purged
@@ -0,0 +1,100 @@
+"""
+Django management command to rebuild or verify the denormalized commission stats.
+"""
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from apps.artists.models import Artist
+from apps.commissions.models import Commission, ClientCommissionStats, ArtistCommissionStats
+from apps.commissions.stats import OWNER_FIELDS, normalize_stats, stats_aggregates
+
+User = get_user_model()
+
+SCOPES = (
+    (ClientCommissionStats, User),
+    (ArtistCommissionStats, Artist),
+)
+
+
+class Command(BaseCommand):
+    help = 'Recomputes client/artist commission stats in batches, or checks them with --check'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument(
+            '--check', action='store_true',
+            help='Only report rows that differ from the commissions table'
+        )
+    
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        check_only = options['check']
+        mismatches = 0
+        
+        for stats_model, owner_model in SCOPES:
+            processed = 0
+            for owner_ids in self._owner_batches(owner_model, batch_size):
+                expected = self._compute_batch(stats_model, owner_ids)
+                if check_only:
+                    mismatches += self._check_batch(stats_model, owner_ids, expected)
+                else:
+                    self._write_batch(stats_model, owner_ids, expected)
+                processed += len(owner_ids)
+            self.stdout.write(f'{stats_model._meta.db_table}: {processed} owner(s) processed')
+        
+        if check_only and mismatches:
+            raise CommandError(f'{mismatches} commission stats row(s) are out of date')
+        if check_only:
+            self.stdout.write(self.style.SUCCESS('Commission stats are consistent'))
+        else:
+            self.stdout.write(self.style.SUCCESS('Commission stats rebuilt'))
+    
+    def _owner_batches(self, owner_model, batch_size):
+        """Yield owner primary keys in keyset-paginated batches."""
+        last_id = 0
+        while True:
+            owner_ids = list(
+                owner_model.objects.filter(pk__gt=last_id)
+                .order_by('pk').values_list('pk', flat=True)[:batch_size]
+            )
+            if not owner_ids:
+                return
+            yield owner_ids
+            last_id = owner_ids[-1]
+    
+    def _compute_batch(self, stats_model, owner_ids):
+        """One grouped aggregate for the whole batch, keyed by owner id."""
+        owner_field = OWNER_FIELDS[stats_model]
+        rows = (
+            Commission.objects.filter(**{f'{owner_field}__in': owner_ids})
+            .order_by()
+            .values(owner_field)
+            .annotate(**stats_aggregates())
+        )
+        return {row[owner_field]: normalize_stats(row) for row in rows}
+    
+    def _write_batch(self, stats_model, owner_ids, expected):
+        with transaction.atomic():
+            stats_model.objects.filter(pk__in=owner_ids).delete()
+            stats_model.objects.bulk_create([
+                stats_model(pk=owner_id, **values)
+                for owner_id, values in expected.items()
+            ])
+    
+    def _check_batch(self, stats_model, owner_ids, expected):
+        fields = list(normalize_stats({}))
+        stored = {
+            row['pk']: normalize_stats(row)
+            for row in stats_model.objects.filter(pk__in=owner_ids).values('pk', *fields)
+        }
+        mismatches = 0
+        for owner_id, actual in stored.items():
+            # Rows that do not exist yet are built lazily on first read.
+            wanted = expected.get(owner_id, normalize_stats({}))
+            if actual != wanted:
+                mismatches += 1
+                self.stdout.write(self.style.ERROR(
+                    f'{stats_model._meta.db_table} {owner_id}: stored={actual} expected={wanted}'
+                ))
+        return mismatches
@@ -0,0 +1,30 @@
+"""
+Django management command to notify artists and clients about deadlines.
+"""
+
+import time
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from apps.commissions.deadlines import send_reminders
+
+
+class Command(BaseCommand):
+    help = 'Notifies about commissions nearing or past their deadline; --loop keeps running'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Scan again every --interval seconds (for running under supervisor)'
+        )
+        parser.add_argument('--interval', type=int, default=300)
+    
+    def handle(self, *args, **options):
+        while True:
+            sent = send_reminders(batch_size=options['batch_size'])
+            summary = ', '.join(f'{count} {label.lower()}' for label, count in sent.items())
+            self.stdout.write(f'Deadline reminders sent: {summary}')
+            if not options['loop']:
+                break
+            close_old_connections()
+            time.sleep(options['interval'])
@@ -0,0 +1,137 @@
+# Generated by Django 4.2.9 on 2026-10-17 20:29
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('users', '0001_initial'),
+        ('artists', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArtistCommissionStats',
+            fields=[
+                ('total', models.IntegerField(default=0)),
+                ('pending', models.IntegerField(default=0)),
+                ('accepted', models.IntegerField(default=0)),
+                ('in_progress', models.IntegerField(default=0)),
+                ('revision', models.IntegerField(default=0)),
+                ('completed', models.IntegerField(default=0)),
+                ('out_for_delivery', models.IntegerField(default=0)),
+                ('delivered', models.IntegerField(default=0)),
+                ('cancelled', models.IntegerField(default=0)),
+                ('rejected', models.IntegerField(default=0)),
+                ('delivered_revenue', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('artist', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='commission_stats', serialize=False, to='artists.artist')),
+            ],
+            options={
+                'verbose_name': 'Artist Commission Stats',
+                'verbose_name_plural': 'Artist Commission Stats',
+                'db_table': 'artist_commission_stats',
+            },
+        ),
+        migrations.CreateModel(
+            name='ClientCommissionStats',
+            fields=[
+                ('total', models.IntegerField(default=0)),
+                ('pending', models.IntegerField(default=0)),
+                ('accepted', models.IntegerField(default=0)),
+                ('in_progress', models.IntegerField(default=0)),
+                ('revision', models.IntegerField(default=0)),
+                ('completed', models.IntegerField(default=0)),
+                ('out_for_delivery', models.IntegerField(default=0)),
+                ('delivered', models.IntegerField(default=0)),
+                ('cancelled', models.IntegerField(default=0)),
+                ('rejected', models.IntegerField(default=0)),
+                ('delivered_revenue', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='client_commission_stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Client Commission Stats',
+                'verbose_name_plural': 'Client Commission Stats',
+                'db_table': 'client_commission_stats',
+            },
+        ),
+        migrations.CreateModel(
+            name='CommissionCategory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('description', models.TextField(blank=True, null=True)),
+                ('icon', models.CharField(blank=True, max_length=50, null=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('order', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Commission Category',
+                'verbose_name_plural': 'Commission Categories',
+                'db_table': 'commission_categories',
+                'ordering': ['order', 'name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Commission',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=200)),
+                ('description', models.TextField()),
+                ('reference_images', models.JSONField(blank=True, default=list)),
+                ('requirements', models.TextField(blank=True, null=True)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('accepted', 'Accepted'), ('in_progress', 'In Progress'), ('revision', 'Revision Requested'), ('completed', 'Completed'), ('out_for_delivery', 'Out for Delivery'), ('delivered', 'Delivered'), ('cancelled', 'Cancelled'), ('rejected', 'Rejected')], default='pending', max_length=20)),
+                ('priority', models.CharField(choices=[('low', 'Low'), ('normal', 'Normal'), ('high', 'High'), ('urgent', 'Urgent')], default='normal', max_length=20)),
+                ('quoted_price', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('final_price', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('deadline', models.DateField(blank=True, null=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('revisions_allowed', models.PositiveIntegerField(default=2)),
+                ('revisions_used', models.PositiveIntegerField(default=0)),
+                ('final_artwork', models.ImageField(blank=True, null=True, upload_to='commissions/final/')),
+                ('client_rating', models.PositiveIntegerField(blank=True, null=True)),
+                ('client_review', models.TextField(blank=True, null=True)),
+                ('notes', models.TextField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('artist', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='artist_commissions', to='artists.artist')),
+                ('category', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='commissions', to='commissions.commissioncategory')),
+                ('client', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='client_commissions', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Commission',
+                'verbose_name_plural': 'Commissions',
+                'db_table': 'commissions',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='CommissionRevision',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('revision_number', models.PositiveIntegerField()),
+                ('artwork', models.ImageField(upload_to='commissions/revisions/')),
+                ('notes', models.TextField(blank=True, null=True)),
+                ('client_feedback', models.TextField(blank=True, null=True)),
+                ('is_approved', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('commission', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='revisions', to='commissions.commission')),
+            ],
+            options={
+                'verbose_name': 'Commission Revision',
+                'verbose_name_plural': 'Commission Revisions',
+                'db_table': 'commission_revisions',
+                'ordering': ['revision_number'],
+                'unique_together': {('commission', 'revision_number')},
+            },
+        ),
+    ]
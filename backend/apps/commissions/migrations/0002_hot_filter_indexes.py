@@ -0,0 +1,29 @@
+# Generated by Django 4.2.9 on 2026-10-17 20:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('commissions', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='commission',
+            index=models.Index(fields=['artist', 'status', 'created_at'], name='commission_artist_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='commission',
+            index=models.Index(fields=['client', 'status'], name='commission_client_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='commission',
+            index=models.Index(fields=['client', 'created_at'], name='commission_client_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='commission',
+            index=models.Index(fields=['status', 'created_at'], name='commission_status_created_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.9 on 2026-10-17 20:42
+
+from django.db import migrations, models
+from django.db.models import Count, Max
+
+
+def backfill_revision_sequence(apps, schema_editor):
+    Commission = apps.get_model('commissions', 'Commission')
+    CommissionRevision = apps.get_model('commissions', 'CommissionRevision')
+    rows = (
+        CommissionRevision.objects.order_by()
+        .values('commission_id')
+        .annotate(last=Max('revision_number'), used=Count('id'))
+    )
+    for row in rows.iterator():
+        Commission.objects.filter(pk=row['commission_id']).update(
+            last_revision_number=row['last'], revisions_used=row['used']
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('commissions', '0003_commission_fulltext'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='commission',
+            name='last_revision_number',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_revision_sequence, migrations.RunPython.noop),
+    ]
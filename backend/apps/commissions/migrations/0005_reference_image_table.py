@@ -0,0 +1,80 @@
+# Generated by Django 4.2.9 on 2026-10-17 20:43
+
+import apps.commissions.models
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+from django.utils.dateparse import parse_datetime
+
+
+def backfill_reference_images(apps, schema_editor):
+    """Copy the reference_images JSON lists into rows."""
+    Commission = apps.get_model('commissions', 'Commission')
+    CommissionReferenceImage = apps.get_model('commissions', 'CommissionReferenceImage')
+    commissions = Commission.objects.exclude(reference_images=[]).values_list('pk', 'reference_images')
+    batch = []
+    for commission_id, images in commissions.iterator(chunk_size=500):
+        for image in images or []:
+            url = image.get('url') or ''
+            if not url:
+                continue
+            name = url[len(settings.MEDIA_URL):] if url.startswith(settings.MEDIA_URL) else url
+            row = CommissionReferenceImage(
+                commission_id=commission_id, image=name,
+                filename=(image.get('filename') or '')[:255],
+            )
+            uploaded_at = parse_datetime(image.get('uploaded_at') or '')
+            if uploaded_at:
+                row.created_at = uploaded_at
+            batch.append(row)
+        if len(batch) >= 1000:
+            CommissionReferenceImage.objects.bulk_create(batch)
+            batch = []
+    CommissionReferenceImage.objects.bulk_create(batch)
+
+
+def restore_reference_images(apps, schema_editor):
+    Commission = apps.get_model('commissions', 'Commission')
+    CommissionReferenceImage = apps.get_model('commissions', 'CommissionReferenceImage')
+    lists = {}
+    for row in CommissionReferenceImage.objects.order_by('created_at', 'pk').iterator():
+        lists.setdefault(row.commission_id, []).append({
+            'url': f'{settings.MEDIA_URL}{row.image}',
+            'filename': row.filename,
+            'uploaded_at': row.created_at.isoformat(),
+        })
+    for commission_id, images in lists.items():
+        Commission.objects.filter(pk=commission_id).update(reference_images=images)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('commissions', '0004_commission_revision_sequence'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CommissionReferenceImage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('image', models.FileField(max_length=255, upload_to=apps.commissions.models.reference_image_path)),
+                ('filename', models.CharField(blank=True, max_length=255)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('commission', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reference_images', to='commissions.commission')),
+            ],
+            options={
+                'verbose_name': 'Reference Image',
+                'verbose_name_plural': 'Reference Images',
+                'db_table': 'commission_reference_images',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['commission', 'created_at'], name='reference_commission_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_reference_images, restore_reference_images),
+        migrations.RemoveField(
+            model_name='commission',
+            name='reference_images',
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.9 on 2026-10-17 20:59
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('commissions', '0005_reference_image_table'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArtworkUpload',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('target', models.CharField(choices=[('final_artwork', 'Final Artwork'), ('revision', 'Revision')], max_length=20)),
+                ('filename', models.CharField(max_length=255)),
+                ('size', models.PositiveBigIntegerField()),
+                ('received', models.PositiveBigIntegerField(default=0)),
+                ('sha256', models.CharField(blank=True, max_length=64)),
+                ('notes', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('commission', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='artwork_uploads', to='commissions.commission')),
+                ('uploaded_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='artwork_uploads', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Artwork Upload',
+                'verbose_name_plural': 'Artwork Uploads',
+                'db_table': 'commission_artwork_uploads',
+                'indexes': [models.Index(fields=['updated_at'], name='artwork_upload_updated_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.9 on 2026-10-17 21:06
+
+from django.db import migrations, models
+
+OPEN_STATUSES = ('pending', 'accepted', 'in_progress', 'revision')
+
+
+def skip_finished_commissions(apps, schema_editor):
+    # Finished work needs no reminders; only open commissions are scanned.
+    Commission = apps.get_model('commissions', 'Commission')
+    Commission.objects.filter(deadline__isnull=False).exclude(
+        status__in=OPEN_STATUSES
+    ).update(deadline_reminder=2)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('commissions', '0006_artwork_upload'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='commission',
+            name='deadline_reminder',
+            field=models.PositiveSmallIntegerField(choices=[(0, 'None'), (1, 'Due Soon'), (2, 'Overdue')], default=0),
+        ),
+        migrations.AddIndex(
+            model_name='commission',
+            index=models.Index(fields=['deadline_reminder', 'deadline'], name='commission_deadline_idx'),
+        ),
+        migrations.RunPython(skip_finished_commissions, migrations.RunPython.noop),
+    ]
@@ -1,9 +1,13 @@
 """
-Commission models - Category, Commission, Revision (Tables 5-7)
+Commission models - Category, Commission, Revision (Tables 5-7),
+reference images and the denormalized per-client / per-artist commission stats.
 """
 
+import os
+import uuid
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 
 
 class CommissionCategory(models.Model):
@@ -46,6 +50,14 @@ class Commission(models.Model):
         HIGH = 'high', 'High'
         URGENT = 'urgent', 'Urgent'
     
+    # Statuses that count towards the artist's queue.
+    OPEN_STATUSES = (Status.PENDING, Status.ACCEPTED, Status.IN_PROGRESS, Status.REVISION)
+    
+    class DeadlineReminder(models.IntegerChoices):
+        NONE = 0, 'None'
+        DUE_SOON = 1, 'Due Soon'
+        OVERDUE = 2, 'Overdue'
+    
     client = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
@@ -64,17 +76,22 @@ class Commission(models.Model):
     )
     title = models.CharField(max_length=200)
     description = models.TextField()
-    reference_images = models.JSONField(default=list, blank=True)
     requirements = models.TextField(blank=True, null=True)
     status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
     priority = models.CharField(max_length=20, choices=Priority.choices, default=Priority.NORMAL)
     quoted_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
     final_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
     deadline = models.DateField(null=True, blank=True)
+    # Last deadline reminder sent, see deadlines.py; reset when the deadline moves.
+    deadline_reminder = models.PositiveSmallIntegerField(
+        choices=DeadlineReminder.choices, default=DeadlineReminder.NONE
+    )
     started_at = models.DateTimeField(null=True, blank=True)
     completed_at = models.DateTimeField(null=True, blank=True)
     revisions_allowed = models.PositiveIntegerField(default=2)
     revisions_used = models.PositiveIntegerField(default=0)
+    # Sequence for CommissionRevision.revision_number, see revisions.py.
+    last_revision_number = models.PositiveIntegerField(default=0)
     final_artwork = models.ImageField(upload_to='commissions/final/', null=True, blank=True)
     client_rating = models.PositiveIntegerField(null=True, blank=True)
     client_review = models.TextField(blank=True, null=True)
@@ -87,9 +104,30 @@ class Commission(models.Model):
         verbose_name = 'Commission'
         verbose_name_plural = 'Commissions'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['artist', 'status', 'created_at'], name='commission_artist_status_idx'),
+            models.Index(fields=['client', 'status'], name='commission_client_status_idx'),
+            models.Index(fields=['client', 'created_at'], name='commission_client_created_idx'),
+            models.Index(fields=['status', 'created_at'], name='commission_status_created_idx'),
+            models.Index(fields=['deadline_reminder', 'deadline'], name='commission_deadline_idx'),
+        ]
     
     def __str__(self):
         return f"{self.title} - {self.client.username} to {self.artist.display_name}"
+    
+    def save(self, *args, **kwargs):
+        # A moved deadline gets its reminders again (see deadlines.py), whichever
+        # path (API, admin, shell) moved it.
+        update_fields = kwargs.get('update_fields')
+        if not self._state.adding and (update_fields is None or 'deadline' in update_fields):
+            old_deadline = type(self)._base_manager.filter(pk=self.pk).values_list(
+                'deadline', flat=True
+            ).first()
+            if old_deadline != self.deadline:
+                self.deadline_reminder = self.DeadlineReminder.NONE
+                if update_fields is not None:
+                    kwargs['update_fields'] = {*update_fields, 'deadline_reminder'}
+        super().save(*args, **kwargs)
 
 
 class CommissionRevision(models.Model):
@@ -116,3 +154,139 @@ class CommissionRevision(models.Model):
     
     def __str__(self):
         return f"{self.commission.title} - Revision {self.revision_number}"
+
+
+def reference_image_path(instance, filename):
+    # One shared directory, so the content-addressed storage can store an
+    # image reused across commissions once.
+    ext = os.path.splitext(filename)[1]
+    return f"commissions/references/{uuid.uuid4()}{ext}"
+
+
+class CommissionReferenceImage(models.Model):
+    """Reference image attached to a commission by its client."""
+    
+    commission = models.ForeignKey(
+        Commission,
+        on_delete=models.CASCADE,
+        related_name='reference_images'
+    )
+    image = models.FileField(upload_to=reference_image_path, max_length=255)
+    filename = models.CharField(max_length=255, blank=True)
+    # Not auto_now_add so images backfilled from the old JSON list keep their date.
+    created_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        db_table = 'commission_reference_images'
+        verbose_name = 'Reference Image'
+        verbose_name_plural = 'Reference Images'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['commission', 'created_at'], name='reference_commission_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.commission_id} - {self.filename}"
+    
+    @property
+    def url(self):
+        # Relative URL for better compatibility with nginx proxy
+        return self.image.url
+
+
+class ArtworkUpload(models.Model):
+    """An in-progress chunked upload of final artwork or a revision, see uploads.py."""
+    
+    class Target(models.TextChoices):
+        FINAL_ARTWORK = 'final_artwork', 'Final Artwork'
+        REVISION = 'revision', 'Revision'
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    commission = models.ForeignKey(
+        Commission,
+        on_delete=models.CASCADE,
+        related_name='artwork_uploads'
+    )
+    uploaded_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='artwork_uploads'
+    )
+    target = models.CharField(max_length=20, choices=Target.choices)
+    filename = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    # Bytes written so far; chunks are accepted at exactly this offset.
+    received = models.PositiveBigIntegerField(default=0)
+    sha256 = models.CharField(max_length=64, blank=True)
+    notes = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'commission_artwork_uploads'
+        verbose_name = 'Artwork Upload'
+        verbose_name_plural = 'Artwork Uploads'
+        indexes = [
+            models.Index(fields=['updated_at'], name='artwork_upload_updated_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.commission_id} - {self.filename} ({self.received}/{self.size})"
+
+
+class CommissionStats(models.Model):
+    """Denormalized commission counters, maintained by apps.commissions.stats."""
+    
+    total = models.IntegerField(default=0)
+    pending = models.IntegerField(default=0)
+    accepted = models.IntegerField(default=0)
+    in_progress = models.IntegerField(default=0)
+    revision = models.IntegerField(default=0)
+    completed = models.IntegerField(default=0)
+    out_for_delivery = models.IntegerField(default=0)
+    delivered = models.IntegerField(default=0)
+    cancelled = models.IntegerField(default=0)
+    rejected = models.IntegerField(default=0)
+    delivered_revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        abstract = True
+
+
+class ClientCommissionStats(CommissionStats):
+    """Commission counters for a client, keyed by user."""
+    
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='client_commission_stats'
+    )
+    
+    class Meta:
+        db_table = 'client_commission_stats'
+        verbose_name = 'Client Commission Stats'
+        verbose_name_plural = 'Client Commission Stats'
+    
+    def __str__(self):
+        return f"Commission stats for client {self.user_id}"
+
+
+class ArtistCommissionStats(CommissionStats):
+    """Commission counters for an artist, keyed by artist profile."""
+    
+    artist = models.OneToOneField(
+        'artists.Artist',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='commission_stats'
+    )
+    
+    class Meta:
+        db_table = 'artist_commission_stats'
+        verbose_name = 'Artist Commission Stats'
+        verbose_name_plural = 'Artist Commission Stats'
+    
+    def __str__(self):
+        return f"Commission stats for artist {self.artist_id}"
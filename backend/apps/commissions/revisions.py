@@ -0,0 +1,89 @@
+"""
+Revision numbering.
+
+Each commission carries a `last_revision_number` sequence. A new revision
+increments it with an F() UPDATE, which also row-locks the commission until
+the transaction commits, so parallel uploads get distinct, gap-free numbers
+without counting the existing revisions. The artwork file is written to
+storage before the lock is taken to keep the locked section short.
+
+Detail payloads embed only the newest COMMISSION_RECENT_REVISIONS revisions;
+being gap-free, `last_revision_number` doubles as their total count.
+"""
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Prefetch
+from .models import Commission, CommissionRevision
+
+# Advanced only by allocate_revision_number(); saves of a loaded commission
+# must leave these columns out of update_fields.
+SEQUENCE_FIELDS = ('last_revision_number', 'revisions_used')
+
+
+def store_artwork(upload):
+    """Save an uploaded artwork file and return its storage name."""
+    field = CommissionRevision._meta.get_field('artwork')
+    return field.storage.save(field.generate_filename(None, upload.name), upload)
+
+
+def allocate_revision_number(commission):
+    """
+    Reserve the next revision number for `commission` and count it as used.
+    
+    Must be called inside the transaction that inserts the revision.
+    """
+    commissions = Commission.objects.filter(pk=commission.pk)
+    commissions.update(
+        last_revision_number=F('last_revision_number') + 1,
+        revisions_used=F('revisions_used') + 1,
+    )
+    number, used = commissions.values_list('last_revision_number', 'revisions_used').get()
+    commission.last_revision_number, commission.revisions_used = number, used
+    return number
+
+
+def attach_revision(commission, artwork, save):
+    """
+    Number and insert a revision for an already stored `artwork` file.
+    
+    `save(number)` inserts the row; if it fails the file is released again.
+    """
+    try:
+        with transaction.atomic():
+            return save(allocate_revision_number(commission))
+    except Exception:
+        CommissionRevision._meta.get_field('artwork').storage.delete(artwork)
+        raise
+
+
+def create_revision(commission, serializer):
+    """Save a validated CommissionRevisionSerializer as the next revision."""
+    artwork = store_artwork(serializer.validated_data['artwork'])
+    return attach_revision(commission, artwork, lambda number: serializer.save(
+        commission=commission, revision_number=number, artwork=artwork
+    ))
+
+
+RECENT_REVISIONS_ATTR = 'recent_revisions'
+
+
+def recent_revisions_prefetch():
+    """Prefetch of the newest revisions of each commission, newest first."""
+    return Prefetch(
+        'revisions',
+        queryset=CommissionRevision.objects.order_by('-revision_number')[
+            :settings.COMMISSION_RECENT_REVISIONS
+        ],
+        to_attr=RECENT_REVISIONS_ATTR,
+    )
+
+
+def recent_revisions(commission):
+    """The newest revisions of `commission`, from recent_revisions_prefetch() if loaded."""
+    prefetched = getattr(commission, RECENT_REVISIONS_ATTR, None)
+    if prefetched is not None:
+        return prefetched
+    return list(
+        commission.revisions.order_by('-revision_number')[:settings.COMMISSION_RECENT_REVISIONS]
+    )
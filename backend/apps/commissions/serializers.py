@@ -3,9 +3,21 @@ Commission serializers for API endpoints.
 """
 
 from rest_framework import serializers
-from .models import Commission, CommissionCategory, CommissionRevision
+from django.db import transaction
+from . import stats
+from .revisions import SEQUENCE_FIELDS, recent_revisions, recent_revisions_prefetch
+from .models import (
+    Commission, CommissionCategory, CommissionRevision, CommissionReferenceImage,
+    ArtworkUpload
+)
 from apps.users.serializers import UserSerializer
+from apps.artists import counters
 from apps.artists.serializers import ArtistListSerializer
+from apps.core.fieldsets import DynamicFieldsMixin
+from apps.media.serializers import (
+    ImageVariantsField, ImageVariantsListSerializer, ValidatedImageField
+)
+from apps.media.validation import ARTWORK_FORMATS
 
 
 class CommissionCategorySerializer(serializers.ModelSerializer):
@@ -19,31 +31,69 @@ class CommissionCategorySerializer(serializers.ModelSerializer):
 class CommissionRevisionSerializer(serializers.ModelSerializer):
     """Serializer for CommissionRevision model."""
     
+    artwork = ValidatedImageField(formats=ARTWORK_FORMATS)
+    artwork_variants = ImageVariantsField(source='artwork')
+    
     class Meta:
         model = CommissionRevision
-        fields = ['id', 'revision_number', 'artwork', 'notes', 
+        fields = ['id', 'revision_number', 'artwork', 'artwork_variants', 'notes', 
                   'client_feedback', 'is_approved', 'created_at']
         read_only_fields = ['id', 'revision_number', 'created_at']
+        list_serializer_class = ImageVariantsListSerializer
+
+
+class RecentRevisionsSerializer(ImageVariantsListSerializer):
+    """The newest revisions of a commission (see revisions.py)."""
+    
+    def get_attribute(self, instance):
+        return recent_revisions(instance)
 
 
-class CommissionSerializer(serializers.ModelSerializer):
+class CommissionReferenceImageSerializer(serializers.ModelSerializer):
+    """Serializer for CommissionReferenceImage model."""
+    
+    url = serializers.CharField(read_only=True)
+    uploaded_at = serializers.DateTimeField(source='created_at', read_only=True)
+    variants = ImageVariantsField(source='image')
+    
+    class Meta:
+        model = CommissionReferenceImage
+        fields = ['id', 'url', 'filename', 'variants', 'uploaded_at']
+        list_serializer_class = ImageVariantsListSerializer
+
+
+class CommissionSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer for Commission model."""
     
     client = UserSerializer(read_only=True)
     artist = ArtistListSerializer(read_only=True)
     category = CommissionCategorySerializer(read_only=True)
-    revisions = CommissionRevisionSerializer(many=True, read_only=True)
+    # Only the newest revisions; the full history is paged from the revisions endpoint.
+    revisions = RecentRevisionsSerializer(child=CommissionRevisionSerializer(), read_only=True)
+    revision_count = serializers.IntegerField(source='last_revision_number', read_only=True)
+    final_artwork_variants = ImageVariantsField(source='final_artwork')
     
     class Meta:
         model = Commission
         fields = ['id', 'client', 'artist', 'category', 'title', 'description',
-                  'reference_images', 'requirements', 'status', 'priority',
+                  'requirements', 'status', 'priority',
                   'quoted_price', 'final_price', 'deadline', 'started_at',
                   'completed_at', 'revisions_allowed', 'revisions_used',
-                  'final_artwork', 'client_rating', 'client_review', 'notes',
-                  'revisions', 'created_at', 'updated_at']
+                  'final_artwork', 'final_artwork_variants', 'client_rating',
+                  'client_review', 'notes', 'revisions', 'revision_count',
+                  'created_at', 'updated_at']
         read_only_fields = ['id', 'client', 'status', 'revisions_used',
                            'started_at', 'completed_at', 'created_at', 'updated_at']
+        select_related = {
+            'client': ['client__profile'], 'artist': ['artist__user'], 'category': ['category'],
+        }
+        prefetch_related = {'revisions': [recent_revisions_prefetch]}
+        expandable_fields = {
+            'reference_images': {
+                'serializer': CommissionReferenceImageSerializer, 'many': True,
+                'prefetch_related': ['reference_images'],
+            },
+        }
 
 
 class CommissionCreateSerializer(serializers.ModelSerializer):
@@ -55,7 +105,7 @@ class CommissionCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Commission
         fields = ['artist_id', 'category_id', 'title', 'description',
-                  'reference_images', 'requirements', 'priority', 'deadline']
+                  'requirements', 'priority', 'deadline']
     
     def create(self, validated_data):
         from apps.artists.models import Artist
@@ -68,25 +118,43 @@ class CommissionCreateSerializer(serializers.ModelSerializer):
         if category_id:
             category = CommissionCategory.objects.get(id=category_id)
         
-        commission = Commission.objects.create(
-            client=self.context['request'].user,
-            artist=artist,
-            category=category,
-            **validated_data
-        )
+        with transaction.atomic():
+            # Takes a place in the artist's queue, or fails if it is full.
+            if not counters.reserve_slot(artist.pk):
+                raise serializers.ValidationError(
+                    {'artist_id': 'This artist is not accepting commissions right now.'}
+                )
+            commission = Commission.objects.create(
+                client=self.context['request'].user,
+                artist=artist,
+                category=category,
+                **validated_data
+            )
+            stats.record_created(commission)
         return commission
 
 
 class CommissionUpdateSerializer(serializers.ModelSerializer):
     """Serializer for updating commissions."""
     
+    final_artwork = ValidatedImageField(formats=ARTWORK_FORMATS, required=False, allow_null=True)
+    
     class Meta:
         model = Commission
         fields = ['status', 'quoted_price', 'final_price', 'deadline',
                   'revisions_allowed', 'notes', 'final_artwork']
+    
+    def update(self, instance, validated_data):
+        # Save only the edited columns: status, counters and review fields are
+        # written elsewhere with conditional or F() updates.
+        fields = [name for name in validated_data if name not in SEQUENCE_FIELDS]
+        for attr in fields:
+            setattr(instance, attr, validated_data[attr])
+        instance.save(update_fields=[*fields, 'updated_at'])
+        return instance
 
 
-class CommissionListSerializer(serializers.ModelSerializer):
+class CommissionListSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Lightweight serializer for commission listings."""
     
     client_name = serializers.CharField(source='client.username', read_only=True)
@@ -97,6 +165,9 @@ class CommissionListSerializer(serializers.ModelSerializer):
         model = Commission
         fields = ['id', 'title', 'client_name', 'artist_name', 'category_name',
                   'status', 'priority', 'final_price', 'deadline', 'created_at']
+        select_related = {
+            'client_name': ['client'], 'artist_name': ['artist'], 'category_name': ['category'],
+        }
 
 
 class CommissionReviewSerializer(serializers.Serializer):
@@ -104,3 +175,36 @@ class CommissionReviewSerializer(serializers.Serializer):
     
     rating = serializers.IntegerField(min_value=1, max_value=5)
     review = serializers.CharField(required=False, allow_blank=True)
+
+
+class CommissionStatusChangeSerializer(serializers.Serializer):
+    """A single (commission, target status) pair."""
+    
+    id = serializers.IntegerField()
+    status = serializers.ChoiceField(choices=Commission.Status.choices)
+
+
+class CommissionBulkStatusSerializer(serializers.Serializer):
+    """Serializer for batch status transitions."""
+    
+    transitions = CommissionStatusChangeSerializer(
+        many=True, allow_empty=False, max_length=500
+    )
+
+
+class ArtworkUploadSerializer(serializers.ModelSerializer):
+    """Chunked artwork upload session; `received` is the offset to resume from."""
+    
+    sha256 = serializers.RegexField(r'^[0-9a-fA-F]{64}$', required=False, allow_blank=True)
+    
+    class Meta:
+        model = ArtworkUpload
+        fields = ['id', 'commission', 'target', 'filename', 'size', 'received',
+                  'sha256', 'notes', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'commission', 'received', 'created_at', 'updated_at']
+
+
+class ArtworkUploadCompleteSerializer(serializers.Serializer):
+    """Checksum of the whole file, unless it was given when the upload started."""
+    
+    sha256 = serializers.RegexField(r'^[0-9a-fA-F]{64}$', required=False, allow_blank=True)
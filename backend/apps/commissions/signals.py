@@ -0,0 +1,19 @@
+"""
+Commission signals: keep the denormalized stats and the artist's queue in
+step with commissions deleted outside the API (admin deletes, cascades from
+users and artists).
+"""
+
+from django.db.models.signals import post_delete
+from apps.artists import counters
+from . import stats
+from .models import Commission
+
+
+def commission_deleted(sender, instance, **kwargs):
+    stats.record_deleted(instance)
+    if instance.status in Commission.OPEN_STATUSES:
+        counters.record_queue_change(instance.artist_id, -1)
+
+
+post_delete.connect(commission_deleted, sender=Commission, dispatch_uid='commission-stats-delete')
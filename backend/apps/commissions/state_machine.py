@@ -0,0 +1,164 @@
+"""
+Commission status state machine.
+
+Every status change goes through `transition()`, which applies it as a single
+conditional `UPDATE ... WHERE id = ? AND status = ?`. If another request
+changed the status first, no row matches and TransitionConflict is raised
+instead of silently overwriting the other change. Side effects (stats
+counters, artist totals and queue) run in the same transaction.
+"""
+
+from collections import Counter, defaultdict
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from apps.artists import counters
+from . import stats
+from .models import Commission
+
+Status = Commission.Status
+
+VALID_TRANSITIONS = {
+    Status.PENDING: [Status.ACCEPTED, Status.REJECTED, Status.CANCELLED],
+    Status.ACCEPTED: [Status.IN_PROGRESS, Status.CANCELLED],
+    Status.IN_PROGRESS: [Status.REVISION, Status.COMPLETED],
+    Status.REVISION: [Status.IN_PROGRESS, Status.COMPLETED],
+    Status.COMPLETED: [Status.OUT_FOR_DELIVERY],
+    Status.OUT_FOR_DELIVERY: [Status.DELIVERED],
+}
+
+
+class TransitionError(Exception):
+    """Base class for rejected status transitions."""
+
+
+class InvalidTransition(TransitionError):
+    """The target status is not reachable from the current one."""
+
+
+class TransitionConflict(TransitionError):
+    """The commission changed status concurrently; the caller may retry."""
+
+
+def can_transition(from_status, to_status):
+    return to_status in VALID_TRANSITIONS.get(from_status, [])
+
+
+def leaves_queue(from_status, to_status):
+    """True if the transition takes the commission out of the artist's queue."""
+    return from_status in Commission.OPEN_STATUSES and to_status not in Commission.OPEN_STATUSES
+
+
+def transition_fields(to_status, now):
+    """Column updates (as expressions) for moving a commission to `to_status`."""
+    fields = {'status': to_status, 'updated_at': now}
+    if to_status == Status.IN_PROGRESS:
+        fields['started_at'] = Coalesce(F('started_at'), now)
+    elif to_status == Status.COMPLETED:
+        fields['completed_at'] = now
+    return fields
+
+
+def _invalidate_dashboard():
+    from apps.users.dashboard import invalidate_metrics
+    transaction.on_commit(invalidate_metrics)
+
+
+def transition(commission, to_status):
+    """
+    Move `commission` from the status it was loaded with to `to_status`.
+    
+    Returns the same instance updated in memory, without re-reading the row.
+    Raises InvalidTransition or TransitionConflict.
+    """
+    from_status = commission.status
+    if not can_transition(from_status, to_status):
+        raise InvalidTransition(f'Cannot move commission from {from_status} to {to_status}')
+    
+    now = timezone.now()
+    fields = transition_fields(to_status, now)
+    with transaction.atomic():
+        updated = Commission.objects.filter(
+            pk=commission.pk, status=from_status
+        ).update(**fields)
+        if not updated:
+            raise TransitionConflict(f'Commission {commission.pk} is no longer {from_status}')
+        
+        commission.status = to_status
+        commission.updated_at = now
+        if to_status == Status.IN_PROGRESS and commission.started_at is None:
+            commission.started_at = now
+        elif to_status == Status.COMPLETED:
+            commission.completed_at = now
+        
+        stats.record_changed(commission, from_status, commission.final_price)
+        with counters.coalesce():
+            if to_status == Status.COMPLETED:
+                counters.record_completions(commission.artist_id)
+            if leaves_queue(from_status, to_status):
+                counters.record_queue_change(commission.artist_id, -1)
+        _invalidate_dashboard()
+    return commission
+
+
+def bulk_transition(queryset, requested):
+    """
+    Apply many (commission id, target status) pairs in one transaction.
+    
+    `queryset` scopes which commissions the caller may touch. Rows are locked
+    with SELECT ... FOR UPDATE, then every (from, to) group is applied with a
+    single set-based UPDATE. Returns one result dict per requested pair, in
+    request order; invalid items are reported without affecting the others.
+    """
+    ids = [commission_id for commission_id, _ in requested]
+    seen = Counter(ids)
+    now = timezone.now()
+    results = []
+    groups = defaultdict(list)
+    
+    with transaction.atomic():
+        current = {
+            row['pk']: row
+            for row in queryset.select_for_update().filter(pk__in=ids).values(
+                'pk', 'status', 'client_id', 'artist_id', 'final_price'
+            )
+        }
+        for commission_id, to_status in requested:
+            result = {'id': commission_id, 'status': to_status}
+            row = current.get(commission_id)
+            if seen[commission_id] > 1:
+                result['error'] = 'Duplicate commission in request'
+            elif row is None:
+                result['error'] = 'Not found'
+            elif not can_transition(row['status'], to_status):
+                result['error'] = f"Cannot move commission from {row['status']} to {to_status}"
+            else:
+                result['previous_status'] = row['status']
+                groups[row['status'], to_status].append(row)
+            results.append(result)
+        
+        for (from_status, to_status), rows in groups.items():
+            Commission.objects.filter(
+                pk__in=[row['pk'] for row in rows], status=from_status
+            ).update(**transition_fields(to_status, now))
+        
+        changes = [
+            (row['client_id'], row['artist_id'], from_status, to_status, row['final_price'])
+            for (from_status, to_status), rows in groups.items()
+            for row in rows
+        ]
+        stats.record_status_changes(changes)
+        with counters.coalesce():
+            for (from_status, to_status), rows in groups.items():
+                for row in rows:
+                    if to_status == Status.COMPLETED:
+                        counters.record_completions(row['artist_id'])
+                    if leaves_queue(from_status, to_status):
+                        counters.record_queue_change(row['artist_id'], -1)
+        if changes:
+            _invalidate_dashboard()
+    
+    for result in results:
+        result['ok'] = 'error' not in result
+    return results
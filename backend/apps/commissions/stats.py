@@ -0,0 +1,177 @@
+"""
+Incrementally maintained commission statistics.
+
+Every commission is counted once in its client's ClientCommissionStats row and
+once in its artist's ArtistCommissionStats row. Rows are adjusted with F()
+expressions in the same transaction as the commission write, so reading the
+stats is a single primary-key lookup instead of a scan of the commission table.
+"""
+
+from collections import defaultdict
+from decimal import Decimal
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+from .models import Commission, ClientCommissionStats, ArtistCommissionStats
+
+STATUS_FIELDS = tuple(Commission.Status.values)
+
+# Stats model -> the Commission column that identifies the row owner.
+OWNER_FIELDS = {
+    ClientCommissionStats: 'client_id',
+    ArtistCommissionStats: 'artist_id',
+}
+
+
+def stats_aggregates():
+    """Aggregate expressions computing every stats column in one query."""
+    aggregates = {'total': Count('id')}
+    for status in STATUS_FIELDS:
+        aggregates[status] = Count('id', filter=Q(status=status))
+    aggregates['delivered_revenue'] = Sum(
+        'final_price', filter=Q(status=Commission.Status.DELIVERED)
+    )
+    return aggregates
+
+
+def normalize_stats(values):
+    """Fill in defaults for an aggregate result row."""
+    row = {field: values.get(field) or 0 for field in ('total',) + STATUS_FIELDS}
+    row['delivered_revenue'] = values.get('delivered_revenue') or Decimal('0')
+    return row
+
+
+def compute_stats(model, owner_id):
+    """Recompute a single stats row from the commissions table."""
+    commissions = Commission.objects.filter(**{OWNER_FIELDS[model]: owner_id})
+    return normalize_stats(commissions.aggregate(**stats_aggregates()))
+
+
+def _contribution(status, final_price, sign):
+    """Counter deltas for one commission in the given state."""
+    deltas = {'total': sign, status: sign}
+    if status == Commission.Status.DELIVERED and final_price:
+        deltas['delivered_revenue'] = sign * Decimal(final_price)
+    return deltas
+
+
+def _merge(*deltas):
+    merged = {}
+    for delta in deltas:
+        for field, value in delta.items():
+            merged[field] = merged.get(field, 0) + value
+    return {field: value for field, value in merged.items() if value}
+
+
+def _apply(model, owner_id, deltas):
+    """Apply counter deltas to a stats row, creating it if it does not exist yet."""
+    if not deltas:
+        return
+    updates = {field: F(field) + value for field, value in deltas.items()}
+    if model.objects.filter(pk=owner_id).update(updated_at=timezone.now(), **updates):
+        return
+    # The commission write is already visible inside this transaction, so a
+    # freshly computed row includes it and the deltas must not be re-applied.
+    try:
+        with transaction.atomic():
+            model.objects.create(pk=owner_id, **compute_stats(model, owner_id))
+    except IntegrityError:
+        # Another request created the row concurrently without our change.
+        model.objects.filter(pk=owner_id).update(updated_at=timezone.now(), **updates)
+
+
+def _apply_to_owners(commission, deltas):
+    _apply(ClientCommissionStats, commission.client_id, deltas)
+    _apply(ArtistCommissionStats, commission.artist_id, deltas)
+
+
+def record_created(commission):
+    """Count a newly created commission."""
+    _apply_to_owners(
+        commission, _contribution(commission.status, commission.final_price, 1)
+    )
+
+
+def record_changed(commission, old_status, old_final_price):
+    """Move a commission between counters after a status or price change."""
+    deltas = _merge(
+        _contribution(old_status, old_final_price, -1),
+        _contribution(commission.status, commission.final_price, 1),
+    )
+    _apply_to_owners(commission, deltas)
+
+
+def record_deleted(commission):
+    """
+    Uncount a deleted commission.
+    
+    Only existing rows are adjusted: a row built later is computed from the
+    remaining commissions, and the owner itself may be going away with it.
+    """
+    deltas = _contribution(commission.status, commission.final_price, -1)
+    updates = {field: F(field) + value for field, value in deltas.items()}
+    for model, owner_field in OWNER_FIELDS.items():
+        model.objects.filter(pk=getattr(commission, owner_field)).update(
+            updated_at=timezone.now(), **updates
+        )
+
+
+def record_status_changes(changes):
+    """
+    Apply many status changes with one UPDATE per affected stats row.
+    
+    `changes` yields (client_id, artist_id, old_status, new_status, final_price).
+    """
+    per_owner = defaultdict(list)
+    for client_id, artist_id, old_status, new_status, final_price in changes:
+        delta = _merge(
+            _contribution(old_status, final_price, -1),
+            _contribution(new_status, final_price, 1),
+        )
+        per_owner[ClientCommissionStats, client_id].append(delta)
+        per_owner[ArtistCommissionStats, artist_id].append(delta)
+    for (model, owner_id), deltas in per_owner.items():
+        _apply(model, owner_id, _merge(*deltas))
+
+
+def _get_or_build(model, owner_id):
+    stats = model.objects.filter(pk=owner_id).first()
+    if stats is None:
+        try:
+            with transaction.atomic():
+                stats = model.objects.create(pk=owner_id, **compute_stats(model, owner_id))
+        except IntegrityError:
+            stats = model.objects.get(pk=owner_id)
+    return stats
+
+
+def get_client_stats(user):
+    """Stats row for a client, built lazily on first access."""
+    return _get_or_build(ClientCommissionStats, user.pk)
+
+
+def get_artist_stats(artist):
+    """Stats row for an artist, built lazily on first access."""
+    return _get_or_build(ArtistCommissionStats, artist.pk)
+
+
+def get_user_stats(user):
+    """The artist stats row of an artist, the client stats row of anyone else."""
+    if user.role == 'artist' and hasattr(user, 'artist_profile'):
+        return get_artist_stats(user.artist_profile)
+    return get_client_stats(user)
+
+
+def stats_payload(stats):
+    """Shape a stats row as returned by the commission stats endpoint."""
+    revenue = float(stats.delivered_revenue)
+    return {
+        'total': stats.total,
+        'pending': stats.pending,
+        'in_progress': stats.in_progress,
+        'completed': stats.completed,
+        'delivered': stats.delivered,
+        'cancelled': stats.cancelled,
+        'total_spent': revenue,  # For clients - money spent
+        'total_earned': revenue,  # For artists - money earned
+    }
@@ -0,0 +1,234 @@
+"""
+Chunked, resumable artwork uploads.
+
+A client opens an ArtworkUpload with the file name, total size and
+(optionally) its SHA-256, then PUTs the bytes in chunks. Every chunk must
+start at the session's `received` offset, so after a dropped connection the
+client asks for the offset and resumes from there; a retried chunk that
+overlaps bytes already stored is trimmed. Chunks are copied from the request
+stream straight into a part file under MEDIA_ROOT, a small buffer at a time,
+so worker memory does not grow with the size of the artwork.
+
+Finalizing hashes the part file once, checks it against the expected
+checksum (on a mismatch the part file is emptied and the offset reset to 0,
+so the client can send the file again), validates the image header
+(apps.media.validation; an upload that is not a supported image is
+discarded) and hands it to the content-addressed storage, which renames it
+into place instead of copying it. The commission or revision row is then
+updated in one transaction; a failure removes the stored file again.
+"""
+
+import hashlib
+import os
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+from apps.media.validation import ARTWORK_FORMATS, InvalidImage, inspect
+from .models import ArtworkUpload, Commission, CommissionRevision
+from .revisions import attach_revision
+
+BUFFER_SIZE = 64 * 1024
+PARTS_DIR = '.incoming/artwork'
+
+
+class UploadError(Exception):
+    """The chunk or upload was rejected; the message is safe to show."""
+
+
+class OffsetMismatch(UploadError):
+    """The chunk does not start at (or before) the current offset."""
+    
+    def __init__(self, received):
+        super().__init__(f'Expected a chunk starting at byte {received}')
+        self.received = received
+
+
+class AssembledFile(File):
+    """A finished part file, already hashed, that storage can move into place."""
+    
+    def __init__(self, path, name, sha256):
+        super().__init__(open(path, 'rb'), name=name)
+        self.path = path
+        self.sha256 = sha256
+    
+    def temporary_file_path(self):
+        return self.path
+
+
+def part_path(upload):
+    return default_storage.path(f'{PARTS_DIR}/{upload.pk}.part')
+
+
+def claimed_path(upload):
+    """Where finish() moves the part file while it is being finalized."""
+    return f'{part_path(upload)}.done'
+
+
+def _restart(upload, path):
+    """Empty a claimed part file and put the session back at offset 0."""
+    open(path, 'wb').close()
+    os.rename(path, part_path(upload))
+    ArtworkUpload.objects.filter(pk=upload.pk).update(received=0, updated_at=timezone.now())
+    upload.received = 0
+
+
+def start(commission, user, target, filename, size, sha256='', notes=''):
+    """Open an upload session and create its (empty) part file."""
+    if size <= 0 or size > settings.ARTWORK_UPLOAD_MAX_SIZE:
+        raise UploadError(
+            f'Size must be between 1 and {settings.ARTWORK_UPLOAD_MAX_SIZE} bytes'
+        )
+    upload = ArtworkUpload.objects.create(
+        commission=commission, uploaded_by=user, target=target,
+        filename=os.path.basename(filename)[:255], size=size,
+        sha256=sha256.lower(), notes=notes,
+    )
+    path = part_path(upload)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(path, 'wb').close()
+    return upload
+
+
+def write_chunk(upload, offset, stream, length):
+    """
+    Append `length` bytes read from `stream` at `offset`; returns the new offset.
+    
+    Bytes before `upload.received` (a retried chunk) are read and dropped.
+    The offset is advanced with a conditional UPDATE, so of two concurrent
+    requests for the same range only one counts.
+    """
+    received = upload.received
+    if offset > received:
+        raise OffsetMismatch(received)
+    if length > settings.ARTWORK_UPLOAD_CHUNK_SIZE:
+        raise UploadError(
+            f'Chunks may be at most {settings.ARTWORK_UPLOAD_CHUNK_SIZE} bytes'
+        )
+    if offset + length > upload.size:
+        raise UploadError('Chunk extends past the declared size')
+    
+    skip = received - offset
+    written = 0
+    with open(part_path(upload), 'r+b') as part:
+        part.seek(received)
+        remaining = length
+        while remaining:
+            data = stream.read(min(BUFFER_SIZE, remaining))
+            if not data:
+                break
+            remaining -= len(data)
+            if skip:
+                dropped = min(skip, len(data))
+                data, skip = data[dropped:], skip - dropped
+            part.write(data)
+            written += len(data)
+    if remaining:
+        raise UploadError('Request body ended before the chunk was complete')
+    
+    if written:
+        updated = ArtworkUpload.objects.filter(pk=upload.pk, received=received).update(
+            received=received + written, updated_at=timezone.now()
+        )
+        if not updated:
+            raise OffsetMismatch(
+                ArtworkUpload.objects.values_list('received', flat=True).get(pk=upload.pk)
+            )
+        upload.received = received + written
+    return upload.received
+
+
+def _checksum(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as part:
+        for block in iter(lambda: part.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _attach_final_artwork(upload, name):
+    with transaction.atomic():
+        commission = Commission.objects.select_for_update().get(pk=upload.commission_id)
+        # The media signals release the artwork this replaces.
+        commission.final_artwork = name
+        commission.save(update_fields=['final_artwork', 'updated_at'])
+        upload.delete()
+    return commission
+
+
+def _attach_revision(upload, name):
+    def save(number):
+        upload.delete()
+        return CommissionRevision.objects.create(
+            commission=upload.commission, revision_number=number,
+            artwork=name, notes=upload.notes,
+        )
+    return attach_revision(upload.commission, name, save)
+
+
+def finish(upload, sha256=''):
+    """
+    Verify a complete upload and attach it to its commission or revision.
+    
+    Returns the updated Commission or the new CommissionRevision.
+    """
+    if upload.received != upload.size:
+        raise UploadError(f'Only {upload.received} of {upload.size} bytes were received')
+    expected = (sha256 or upload.sha256).lower()
+    if not expected:
+        raise UploadError('A sha256 checksum is required')
+    
+    # Claim the part file, so a repeated finalize request cannot attach it twice.
+    path = claimed_path(upload)
+    try:
+        os.rename(part_path(upload), path)
+    except FileNotFoundError:
+        raise UploadError('The upload is already being finalized')
+    actual = _checksum(path)
+    if actual != expected:
+        # Offsets cannot point at the bad bytes, so the whole file is sent again.
+        _restart(upload, path)
+        raise UploadError('Checksum mismatch; send the file again from byte 0')
+    try:
+        with open(path, 'rb') as part:
+            image_info = inspect(part, ARTWORK_FORMATS)
+    except InvalidImage as exc:
+        # A valid image is a different file, with its own size and checksum.
+        abort(upload)
+        raise UploadError(f'{exc}; start a new upload with a supported image')
+    
+    field = (
+        Commission._meta.get_field('final_artwork')
+        if upload.target == ArtworkUpload.Target.FINAL_ARTWORK
+        else CommissionRevision._meta.get_field('artwork')
+    )
+    assembled = AssembledFile(path, upload.filename, actual)
+    assembled.image_info = image_info
+    try:
+        name = field.storage.save(field.generate_filename(None, upload.filename), assembled)
+    finally:
+        assembled.close()
+        # Moved into place unless the content was already stored.
+        if os.path.exists(path):
+            os.unlink(path)
+    
+    try:
+        if upload.target == ArtworkUpload.Target.FINAL_ARTWORK:
+            return _attach_final_artwork(upload, name)
+        return _attach_revision(upload, name)
+    except Exception:
+        # attach_revision already released the file.
+        if upload.target == ArtworkUpload.Target.FINAL_ARTWORK:
+            field.storage.delete(name)
+        ArtworkUpload.objects.filter(pk=upload.pk).delete()
+        raise
+
+
+def abort(upload):
+    """Discard an upload session and its part file, claimed or not."""
+    paths = (part_path(upload), claimed_path(upload))
+    upload.delete()
+    for path in paths:
+        if os.path.exists(path):
+            os.unlink(path)
@@ -14,13 +14,22 @@ urlpatterns = [
     path('', views.CommissionListView.as_view(), name='commission-list'),
     path('create/', views.CommissionCreateView.as_view(), name='commission-create'),
     path('stats/', views.commission_stats, name='commission-stats'),
+    path('status/bulk/', views.CommissionBulkStatusUpdateView.as_view(), name='commission-status-bulk'),
     path('<int:pk>/', views.CommissionDetailView.as_view(), name='commission-detail'),
     path('<int:pk>/update/', views.CommissionUpdateView.as_view(), name='commission-update'),
     path('<int:pk>/status/', views.CommissionStatusUpdateView.as_view(), name='commission-status'),
     path('<int:pk>/review/', views.CommissionReviewView.as_view(), name='commission-review'),
     
     # Revisions
-    path('<int:commission_id>/revisions/', views.RevisionCreateView.as_view(), name='revision-create'),
+    path('<int:commission_id>/revisions/', views.RevisionListCreateView.as_view(), name='revision-create'),
+    
+    # Chunked artwork uploads
+    path('<int:pk>/uploads/', views.ArtworkUploadStartView.as_view(), name='artwork-upload-start'),
+    path('uploads/<uuid:upload_id>/', views.ArtworkUploadView.as_view(), name='artwork-upload'),
+    path(
+        'uploads/<uuid:upload_id>/complete/', views.ArtworkUploadCompleteView.as_view(),
+        name='artwork-upload-complete'
+    ),
     
     # Reference Images
     path('<int:pk>/reference-images/', views.ReferenceImageUploadView.as_view(), name='reference-images'),
@@ -2,22 +2,55 @@
 Commission views for API endpoints.
 """
 
-from rest_framework import generics, status, permissions
+from urllib.parse import unquote, urlsplit
+from rest_framework import generics, status, permissions, serializers
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.decorators import api_view, permission_classes
+from rest_framework.exceptions import PermissionDenied
+from django.conf import settings
 from django.shortcuts import get_object_or_404
-from django.utils import timezone
-from django.db.models import Q
-from .models import Commission, CommissionCategory, CommissionRevision
+from django.db import transaction
+from django.db.models import Count, Max, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from . import stats as stats_service
+from . import uploads
+from .revisions import create_revision
+from .state_machine import (
+    transition, bulk_transition, TransitionError, TransitionConflict
+)
+from .models import (
+    Commission, CommissionCategory, CommissionRevision, CommissionReferenceImage,
+    ArtworkUpload
+)
 from .serializers import (
     CommissionSerializer, CommissionCreateSerializer, CommissionUpdateSerializer,
     CommissionListSerializer, CommissionCategorySerializer, 
-    CommissionRevisionSerializer, CommissionReviewSerializer
+    CommissionRevisionSerializer, CommissionReviewSerializer,
+    CommissionBulkStatusSerializer, CommissionReferenceImageSerializer,
+    ArtworkUploadSerializer, ArtworkUploadCompleteSerializer
 )
+from apps.artists import counters
+from apps.core.conditional import ConditionalGetMixin
+from apps.core.fieldsets import EagerLoadingMixin
+from apps.core.pagination import KeysetPagination
+from apps.media.models import ImageDerivative
+from apps.media.validation import InvalidImage, inspect as inspect_image
 from apps.users.permissions import IsAdminUser
 
 
+def commission_detail_queryset():
+    """Commissions with every relation CommissionSerializer renders."""
+    return CommissionSerializer.eager_load(Commission.objects.all())
+
+
+def user_commissions(user):
+    """An artist's incoming commissions, or the commissions a client requested."""
+    if user.role == 'artist' and hasattr(user, 'artist_profile'):
+        return Commission.objects.filter(artist=user.artist_profile)
+    return Commission.objects.filter(client=user)
+
+
 class CommissionCategoryListView(generics.ListAPIView):
     """List all commission categories."""
     
@@ -41,37 +74,69 @@ class CommissionCreateView(generics.CreateAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
 
-class CommissionListView(generics.ListAPIView):
+class CommissionListView(EagerLoadingMixin, generics.ListAPIView):
     """List commissions for current user (client or artist)."""
     
     serializer_class = CommissionListSerializer
+    pagination_class = KeysetPagination
     permission_classes = [permissions.IsAuthenticated]
     filterset_fields = ['status', 'priority']
     search_fields = ['title', 'description']
+    fulltext_search = True
     ordering_fields = ['created_at', 'deadline', 'final_price']
     
     def get_queryset(self):
-        user = self.request.user
-        if user.role == 'artist' and hasattr(user, 'artist_profile'):
-            return Commission.objects.filter(artist=user.artist_profile)
-        return Commission.objects.filter(client=user)
+        return user_commissions(self.request.user)
 
 
-class CommissionDetailView(generics.RetrieveAPIView):
-    """Get commission details."""
+class CommissionDetailView(ConditionalGetMixin, EagerLoadingMixin, generics.RetrieveAPIView):
+    """Get commission details; conditional GETs are answered from one query."""
     
     serializer_class = CommissionSerializer
     permission_classes = [permissions.IsAuthenticated]
+    # Revisions are numbered from last_revision_number, and the embedded artist's
+    # counters are updated without touching its updated_at. Reference images
+    # (?expand=reference_images) are added and deleted without touching the
+    # commission, so their newest date and count are compared too.
+    validator_fields = (
+        'updated_at', 'last_revision_number', 'category_id',
+        'client__updated_at', 'client__profile__updated_at',
+        'artist__updated_at', 'artist__user__updated_at', 'artist__rating',
+        'artist__total_reviews', 'artist__is_accepting_commissions', 'variants_at',
+        'reference_images_at', 'reference_images_count',
+    )
+    
+    def get_validator_queryset(self):
+        # Image variants are generated after the upload that created the image.
+        revisions = CommissionRevision.objects.filter(commission=OuterRef(OuterRef('pk')))
+        images = CommissionReferenceImage.objects.filter(commission=OuterRef(OuterRef('pk')))
+        latest = ImageDerivative.objects.filter(
+            Q(source=OuterRef('final_artwork')) | Q(source=OuterRef('artist__user__avatar'))
+            | Q(source__in=revisions.values('artwork')) | Q(source__in=images.values('image'))
+        ).order_by('-created_at').values('created_at')[:1]
+        references = CommissionReferenceImage.objects.filter(
+            commission=OuterRef('pk')
+        ).order_by().values('commission')
+        return super().get_validator_queryset().annotate(
+            variants_at=Subquery(latest),
+            reference_images_at=Subquery(
+                references.annotate(latest=Max('created_at')).values('latest')
+            ),
+            reference_images_count=Coalesce(
+                Subquery(references.annotate(count=Count('id')).values('count')), 0
+            ),
+        )
     
     def get_queryset(self):
         user = self.request.user
+        queryset = Commission.objects.all()
         if user.role == 'admin':
-            return Commission.objects.all()
+            return queryset
         if user.role == 'artist' and hasattr(user, 'artist_profile'):
-            return Commission.objects.filter(
+            return queryset.filter(
                 Q(artist=user.artist_profile) | Q(client=user)
             )
-        return Commission.objects.filter(client=user)
+        return queryset.filter(client=user)
 
 
 class CommissionUpdateView(generics.UpdateAPIView):
@@ -83,25 +148,35 @@ class CommissionUpdateView(generics.UpdateAPIView):
     def get_queryset(self):
         user = self.request.user
         if user.role == 'admin':
-            return Commission.objects.all()
-        if user.role == 'artist' and hasattr(user, 'artist_profile'):
-            return Commission.objects.filter(artist=user.artist_profile)
-        return Commission.objects.none()
+            queryset = Commission.objects.all()
+        elif user.role == 'artist' and hasattr(user, 'artist_profile'):
+            queryset = Commission.objects.filter(artist=user.artist_profile)
+        else:
+            return Commission.objects.none()
+        # Locked until the update commits, so the old price and deadline
+        # compared against cannot change underneath it.
+        return queryset.select_for_update()
     
+    @transaction.atomic
+    def update(self, request, *args, **kwargs):
+        return super().update(request, *args, **kwargs)
+    
+    @transaction.atomic
     def perform_update(self, serializer):
         instance = serializer.instance
-        new_status = serializer.validated_data.get('status')
+        old_final_price = instance.final_price
+        new_status = serializer.validated_data.pop('status', None)
         
-        if new_status == 'in_progress' and instance.status == 'accepted':
-            serializer.save(started_at=timezone.now())
-        elif new_status == 'completed':
-            serializer.save(completed_at=timezone.now())
-            # Update artist stats
-            artist = instance.artist
-            artist.total_commissions += 1
-            artist.save()
-        else:
-            serializer.save()
+        # Status changes go through the state machine (timestamps, artist stats)
+        if new_status and new_status != instance.status:
+            try:
+                transition(instance, new_status)
+            except TransitionError as exc:
+                raise serializers.ValidationError({'status': str(exc)})
+        
+        serializer.save()
+        if instance.final_price != old_final_price:
+            stats_service.record_changed(instance, instance.status, old_final_price)
 
 
 class CommissionStatusUpdateView(APIView):
@@ -114,36 +189,58 @@ class CommissionStatusUpdateView(APIView):
         new_status = request.data.get('status')
         
         # Get commission based on user role
+        queryset = commission_detail_queryset()
         if user.role == 'admin':
-            commission = get_object_or_404(Commission, pk=pk)
+            commission = get_object_or_404(queryset, pk=pk)
         elif user.role == 'artist' and hasattr(user, 'artist_profile'):
-            commission = get_object_or_404(Commission, pk=pk, artist=user.artist_profile)
+            commission = get_object_or_404(queryset, pk=pk, artist=user.artist_profile)
         else:
-            commission = get_object_or_404(Commission, pk=pk, client=user)
+            commission = get_object_or_404(queryset, pk=pk, client=user)
         
-        valid_transitions = {
-            'pending': ['accepted', 'rejected', 'cancelled'],
-            'accepted': ['in_progress', 'cancelled'],
-            'in_progress': ['revision', 'completed'],
-            'revision': ['in_progress', 'completed'],
-            'completed': ['out_for_delivery'],
-            'out_for_delivery': ['delivered'],
-        }
+        try:
+            transition(commission, new_status)
+        except TransitionConflict:
+            return Response(
+                {"error": "Commission status changed concurrently, please retry"},
+                status=status.HTTP_409_CONFLICT
+            )
+        except TransitionError:
+            return Response(
+                {"error": "Invalid status transition"}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
-        if commission.status in valid_transitions:
-            if new_status in valid_transitions[commission.status]:
-                commission.status = new_status
-                if new_status == 'in_progress' and not commission.started_at:
-                    commission.started_at = timezone.now()
-                elif new_status == 'completed':
-                    commission.completed_at = timezone.now()
-                commission.save()
-                return Response(CommissionSerializer(commission).data)
+        return Response(CommissionSerializer(commission).data)
+
+
+class CommissionBulkStatusUpdateView(APIView):
+    """Apply many status transitions in one request."""
+    
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def post(self, request):
+        user = request.user
+        serializer = CommissionBulkStatusSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
         
-        return Response(
-            {"error": "Invalid status transition"}, 
-            status=status.HTTP_400_BAD_REQUEST
-        )
+        # Same visibility rules as the single status endpoint
+        if user.role == 'admin':
+            queryset = Commission.objects.all()
+        elif user.role == 'artist' and hasattr(user, 'artist_profile'):
+            queryset = Commission.objects.filter(artist=user.artist_profile)
+        else:
+            queryset = Commission.objects.filter(client=user)
+        
+        requested = [
+            (item['id'], item['status'])
+            for item in serializer.validated_data['transitions']
+        ]
+        results = bulk_transition(queryset, requested)
+        return Response({
+            "updated": sum(result['ok'] for result in results),
+            "failed": sum(not result['ok'] for result in results),
+            "results": results,
+        })
 
 
 class CommissionReviewView(APIView):
@@ -153,60 +250,161 @@ class CommissionReviewView(APIView):
     
     def post(self, request, pk):
         commission = get_object_or_404(
-            Commission, pk=pk, client=request.user, status='completed'
+            commission_detail_queryset(), pk=pk, client=request.user, status='completed'
         )
         
         serializer = CommissionReviewSerializer(data=request.data)
         if serializer.is_valid():
-            commission.client_rating = serializer.validated_data['rating']
-            commission.client_review = serializer.validated_data.get('review', '')
-            commission.save()
-            
-            # Update artist rating
-            artist = commission.artist
-            total_ratings = Commission.objects.filter(
-                artist=artist, client_rating__isnull=False
-            )
-            if total_ratings.exists():
-                from django.db.models import Avg
-                avg_rating = total_ratings.aggregate(avg=Avg('client_rating'))['avg']
-                artist.rating = round(avg_rating, 2)
-                artist.total_reviews = total_ratings.count()
-                artist.save()
+            rating = serializer.validated_data['rating']
+            with transaction.atomic():
+                # Lock the row so a concurrent resubmission cannot count twice.
+                previous_rating = Commission.objects.select_for_update().values_list(
+                    'client_rating', flat=True
+                ).get(pk=commission.pk)
+                commission.client_rating = rating
+                commission.client_review = serializer.validated_data.get('review', '')
+                commission.save(update_fields=['client_rating', 'client_review', 'updated_at'])
+                counters.record_review(commission.artist_id, rating, previous_rating)
+            counters.refresh(commission.artist)
             
             return Response(CommissionSerializer(commission).data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class RevisionCreateView(generics.CreateAPIView):
-    """Create a revision for a commission."""
+class RevisionListCreateView(generics.ListCreateAPIView):
+    """Page through a commission's revisions, newest first, or submit one."""
     
     serializer_class = CommissionRevisionSerializer
+    pagination_class = KeysetPagination
     permission_classes = [permissions.IsAuthenticated]
     
+    def get_queryset(self):
+        user = self.request.user
+        commissions = Commission.objects.all()
+        if user.role != 'admin':
+            access = Q(client=user)
+            if hasattr(user, 'artist_profile'):
+                access |= Q(artist=user.artist_profile)
+            commissions = commissions.filter(access)
+        commission = get_object_or_404(commissions, pk=self.kwargs['commission_id'])
+        return commission.revisions.order_by('-created_at', '-id')
+    
     def perform_create(self, serializer):
         commission_id = self.kwargs.get('commission_id')
         user = self.request.user
         
-        if user.role == 'artist' and hasattr(user, 'artist_profile'):
-            commission = get_object_or_404(
-                Commission, pk=commission_id, artist=user.artist_profile
-            )
+        if user.role != 'artist' or not hasattr(user, 'artist_profile'):
+            raise PermissionDenied('Only artists can submit revisions')
+        commission = get_object_or_404(
+            Commission, pk=commission_id, artist=user.artist_profile
+        )
+        create_revision(commission, serializer)
+
+
+class ArtworkUploadStartView(APIView):
+    """Open a chunked upload of final artwork or a revision (see uploads.py)."""
+    
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def post(self, request, pk):
+        serializer = ArtworkUploadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        user = request.user
+        
+        # Revisions come from the commission's artist; final artwork may
+        # also be set by an admin, like through CommissionUpdateView.
+        if user.role == 'admin' and data['target'] == ArtworkUpload.Target.FINAL_ARTWORK:
+            commission = get_object_or_404(Commission, pk=pk)
+        elif user.role == 'artist' and hasattr(user, 'artist_profile'):
+            commission = get_object_or_404(Commission, pk=pk, artist=user.artist_profile)
         else:
+            raise PermissionDenied('Only the commission artist can upload artwork')
+        
+        try:
+            upload = uploads.start(
+                commission, user, data['target'], data['filename'], data['size'],
+                sha256=data.get('sha256', ''), notes=data.get('notes', '')
+            )
+        except uploads.UploadError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(ArtworkUploadSerializer(upload).data, status=status.HTTP_201_CREATED)
+
+
+class ArtworkUploadView(APIView):
+    """
+    GET the offset to resume from, PUT the next chunk, DELETE to abort.
+    
+    A chunk is the raw request body, sent with `?offset=<first byte>`.
+    The body is streamed to disk and never parsed by DRF.
+    """
+    
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get_upload(self):
+        return get_object_or_404(
+            ArtworkUpload, pk=self.kwargs['upload_id'], uploaded_by=self.request.user
+        )
+    
+    def get(self, request, upload_id):
+        return Response(ArtworkUploadSerializer(self.get_upload()).data)
+    
+    def put(self, request, upload_id):
+        upload = self.get_upload()
+        try:
+            offset = int(request.query_params['offset'])
+            length = int(request.META.get('CONTENT_LENGTH') or 0)
+        except (KeyError, ValueError):
+            return Response(
+                {"error": "offset and Content-Length are required"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if offset < 0 or length <= 0:
+            return Response({"error": "Empty chunk"}, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            received = uploads.write_chunk(upload, offset, request.stream, length)
+        except uploads.OffsetMismatch as exc:
             return Response(
-                {"error": "Only artists can submit revisions"}, 
-                status=status.HTTP_403_FORBIDDEN
+                {"error": str(exc), "received": exc.received},
+                status=status.HTTP_409_CONFLICT
             )
+        except uploads.UploadError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({"received": received, "size": upload.size})
+    
+    def delete(self, request, upload_id):
+        uploads.abort(self.get_upload())
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class ArtworkUploadCompleteView(ArtworkUploadView):
+    """Verify the checksum and attach the assembled file."""
+    
+    http_method_names = ['post', 'options']
+    
+    def post(self, request, upload_id):
+        upload = self.get_upload()
+        serializer = ArtworkUploadCompleteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            result = uploads.finish(upload, serializer.validated_data.get('sha256', ''))
+        except uploads.UploadError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
         
-        revision_number = commission.revisions.count() + 1
-        serializer.save(commission=commission, revision_number=revision_number)
+        if isinstance(result, CommissionRevision):
+            return Response(
+                CommissionRevisionSerializer(result).data, status=status.HTTP_201_CREATED
+            )
+        return Response(CommissionSerializer(result).data)
 
 
-class CommissionAdminListView(generics.ListAPIView):
+class CommissionAdminListView(EagerLoadingMixin, generics.ListAPIView):
     """List all commissions (admin only)."""
     
     queryset = Commission.objects.all()
     serializer_class = CommissionListSerializer
+    pagination_class = KeysetPagination
     permission_classes = [permissions.IsAuthenticated, IsAdminUser]
     filterset_fields = ['status', 'priority', 'artist', 'client']
     search_fields = ['title', 'client__email', 'artist__display_name']
@@ -217,46 +415,34 @@ class CommissionAdminListView(generics.ListAPIView):
 @permission_classes([permissions.IsAuthenticated])
 def commission_stats(request):
     """Get commission statistics for current user."""
-    user = request.user
-    
-    if user.role == 'artist' and hasattr(user, 'artist_profile'):
-        commissions = Commission.objects.filter(artist=user.artist_profile)
-    else:
-        commissions = Commission.objects.filter(client=user)
-    
-    from django.db.models import Sum, Count
-    
-    # Calculate earnings from delivered orders
-    delivered_commissions = commissions.filter(status='delivered')
-    total_earnings = delivered_commissions.aggregate(total=Sum('final_price'))['total'] or 0
-    
-    stats = {
-        'total': commissions.count(),
-        'pending': commissions.filter(status='pending').count(),
-        'in_progress': commissions.filter(status='in_progress').count(),
-        'completed': commissions.filter(status='completed').count(),
-        'delivered': delivered_commissions.count(),
-        'cancelled': commissions.filter(status='cancelled').count(),
-        'total_spent': float(total_earnings),  # For clients - money spent
-        'total_earned': float(total_earnings),  # For artists - money earned
-    }
-    
-    return Response(stats)
+    # Counters are maintained incrementally, see apps.commissions.stats
+    stats = stats_service.get_user_stats(request.user)
+    return Response(stats_service.stats_payload(stats))
 
 
-class ReferenceImageUploadView(APIView):
-    """Upload reference images for a commission."""
+class ReferenceImageUploadView(generics.ListAPIView):
+    """List, upload and delete reference images for a commission."""
     
+    serializer_class = CommissionReferenceImageSerializer
+    pagination_class = KeysetPagination
     permission_classes = [permissions.IsAuthenticated]
     
-    def post(self, request, pk):
-        user = request.user
-        
-        # Get commission - client or admin can upload
+    def get_commission(self, editable=False):
+        """Client or admin may edit; the commission's artist may also view."""
+        user = self.request.user
+        pk = self.kwargs['pk']
         if user.role == 'admin':
-            commission = get_object_or_404(Commission, pk=pk)
-        else:
-            commission = get_object_or_404(Commission, pk=pk, client=user)
+            return get_object_or_404(Commission, pk=pk)
+        access = Q(client=user)
+        if not editable and hasattr(user, 'artist_profile'):
+            access |= Q(artist=user.artist_profile)
+        return get_object_or_404(Commission.objects.filter(access), pk=pk)
+    
+    def get_queryset(self):
+        return CommissionReferenceImage.objects.filter(commission=self.get_commission())
+    
+    def post(self, request, pk):
+        commission = self.get_commission(editable=True)
         
         # Get uploaded file
         image_file = request.FILES.get('image')
@@ -266,14 +452,6 @@ class ReferenceImageUploadView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Validate file type
-        allowed_types = ['image/jpeg', 'image/png', 'image/gif', 'image/webp']
-        if image_file.content_type not in allowed_types:
-            return Response(
-                {"error": "Invalid file type. Allowed: JPEG, PNG, GIF, WebP"}, 
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
         # Limit file size (5MB)
         if image_file.size > 5 * 1024 * 1024:
             return Response(
@@ -281,55 +459,40 @@ class ReferenceImageUploadView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Save file
-        import os
-        from django.conf import settings
-        from django.core.files.storage import default_storage
-        import uuid
-        
-        # Generate unique filename
-        ext = os.path.splitext(image_file.name)[1]
-        filename = f"commissions/references/{commission.id}/{uuid.uuid4()}{ext}"
-        
-        # Save file
-        saved_path = default_storage.save(filename, image_file)
-        # Use relative URL for better compatibility with nginx proxy
-        file_url = f"{settings.MEDIA_URL}{saved_path}"
+        # Validate the content itself, not the client's Content-Type
+        try:
+            image_file.image_info = inspect_image(image_file)
+        except InvalidImage as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
         
-        # Update reference_images JSON field
-        images = commission.reference_images or []
-        images.append({
-            'url': file_url,
-            'filename': image_file.name,
-            'uploaded_at': timezone.now().isoformat(),
-        })
-        commission.reference_images = images
-        commission.save()
+        # One INSERT per upload; concurrent uploads never touch each other's rows.
+        image = CommissionReferenceImage.objects.create(
+            commission=commission, image=image_file, filename=image_file.name[:255]
+        )
         
         return Response({
             "message": "Image uploaded successfully",
-            "image": images[-1],
-            "total_images": len(images),
+            "image": CommissionReferenceImageSerializer(image).data,
+            "total_images": commission.reference_images.count(),
         })
     
     def delete(self, request, pk):
-        """Delete a reference image."""
-        user = request.user
-        
-        if user.role == 'admin':
-            commission = get_object_or_404(Commission, pk=pk)
-        else:
-            commission = get_object_or_404(Commission, pk=pk, client=user)
+        """Delete a reference image by `id` (or by `url`, as older clients send)."""
+        commission = self.get_commission(editable=True)
         
+        images = commission.reference_images.all()
+        image_id = request.data.get('id')
         image_url = request.data.get('url')
-        if not image_url:
+        if image_id:
+            images = images.filter(pk=image_id)
+        elif image_url:
+            path = unquote(urlsplit(image_url).path)
+            images = images.filter(image=path.removeprefix(settings.MEDIA_URL))
+        else:
             return Response(
-                {"error": "Image URL is required"}, 
+                {"error": "Image id is required"}, 
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        images = commission.reference_images or []
-        commission.reference_images = [img for img in images if img.get('url') != image_url]
-        commission.save()
-        
+        images.delete()
         return Response({"message": "Image deleted successfully"})
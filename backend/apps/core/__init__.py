@@ -0,0 +1 @@
+# Shared API building blocks (pagination, filtering, caching)
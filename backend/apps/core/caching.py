@@ -0,0 +1,98 @@
+"""
+Response cache for public read endpoints.
+
+Views mixing in CachedResponseMixin keep the serialized data of successful
+GET responses in the default cache, under a key built from the request path,
+the normalized query string and the current token of each version the view
+depends on. Writers never look entries up to delete them: `bump()` replaces
+the version tokens, which makes every entry built on the old ones
+unreachable at once, and those age out with API_RESPONSE_CACHE_TTL.
+
+A hit costs two cache reads (the tokens, then the entry) and no queries
+beyond authentication.
+"""
+
+import hashlib
+import time
+import uuid
+from datetime import datetime, timezone
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework import status
+from rest_framework.response import Response
+
+VERSION_PREFIX = 'cache-version:'
+
+
+def _new_token():
+    # The creation time in milliseconds, so a token doubles as a Last-Modified date.
+    return f'{time.time_ns() // 1_000_000:x}.{uuid.uuid4().hex[:12]}'
+
+
+def token_time(token):
+    """When a version token was created, as an aware datetime."""
+    return datetime.fromtimestamp(int(token.split('.', 1)[0], 16) / 1000, tz=timezone.utc)
+
+
+def get_versions(names):
+    """Current token of each version name, creating missing ones."""
+    keys = [VERSION_PREFIX + name for name in names]
+    tokens = cache.get_many(keys)
+    missing = {key: _new_token() for key in keys if key not in tokens}
+    if missing:
+        cache.set_many(missing, None)
+        tokens.update(missing)
+    return [tokens[key] for key in keys]
+
+
+def bump(*names):
+    """Invalidate every entry that depends on one of the version names."""
+    if names:
+        cache.set_many({VERSION_PREFIX + name: _new_token() for name in names}, None)
+
+
+def bump_on_commit(*names):
+    """bump() once the current transaction commits, so readers cannot re-cache old rows."""
+    transaction.on_commit(lambda: bump(*names))
+
+
+def normalized_query(request):
+    """The query string with parameters (and repeated values) in a stable order."""
+    params = request.query_params
+    return '&'.join(
+        f'{key}={value}' for key in sorted(params) for value in sorted(params.getlist(key))
+    )
+
+
+class CachedResponseMixin:
+    """
+    Serve GET responses of a generic view from the response cache.
+    
+    Subclasses list the version names their output depends on in
+    `get_cache_versions()`.
+    """
+    
+    cache_timeout = None
+    
+    def get_cache_versions(self):
+        raise NotImplementedError
+    
+    def get_cache_key(self, request):
+        versions = ':'.join(get_versions(self.get_cache_versions()))
+        raw = f'{request.get_host()}{request.path}?{normalized_query(request)}'
+        digest = hashlib.sha1(raw.encode('utf-8')).hexdigest()
+        return f'response:{digest}:{versions}'
+    
+    def get(self, request, *args, **kwargs):
+        key = self.get_cache_key(request)
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+        response = super().get(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            timeout = self.cache_timeout
+            if timeout is None:
+                timeout = settings.API_RESPONSE_CACHE_TTL
+            cache.set(key, response.data, timeout)
+        return response
@@ -0,0 +1,67 @@
+"""
+Conditional GET for detail endpoints.
+
+Views mixing in ConditionalGetMixin answer `If-None-Match` and
+`If-Modified-Since` before the object is loaded. `get_validator_values()`
+returns the values the representation depends on: the `updated_at` columns
+of the row and of the related rows it embeds (or the embedded values
+themselves), fetched with one primary-key query. The ETag is a digest of
+those values and of the query string, which selects the representation.
+Last-Modified is the newest datetime among them.
+
+A matching request gets a 304 without serializing anything. Any other request
+is served as usual, with both validators attached.
+"""
+
+import hashlib
+from datetime import datetime
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from rest_framework import status
+from .caching import normalized_query
+
+
+def validators(values, request):
+    """(weak ETag, Last-Modified timestamp or None) for `values`."""
+    raw = f'{values!r}?{normalized_query(request)}'
+    etag = f'W/"{hashlib.sha1(raw.encode("utf-8")).hexdigest()}"'
+    dates = [value for value in values if isinstance(value, datetime)]
+    return etag, (int(max(dates).timestamp()) if dates else None)
+
+
+class ConditionalGetMixin:
+    """
+    Answer conditional GETs of a retrieve view with 304 Not Modified.
+    
+    Subclasses name the columns to compare in `validator_fields`, as
+    `values_list()` lookups on the view's queryset, or override
+    `get_validator_values()`.
+    """
+    
+    validator_fields = ('updated_at',)
+    
+    def get_validator_queryset(self):
+        return self.filter_queryset(self.get_queryset()).prefetch_related(None)
+    
+    def get_validator_values(self):
+        """The values the response depends on, or None if the object is not visible."""
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        return self.get_validator_queryset().filter(
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        ).values_list(*self.validator_fields).first()
+    
+    def get(self, request, *args, **kwargs):
+        values = self.get_validator_values()
+        if values is None:
+            return super().get(request, *args, **kwargs)
+        etag, last_modified = validators(values, request)
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+            # Clients may keep the body but must revalidate before using it.
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
@@ -0,0 +1,132 @@
+"""
+Keyset (cursor) pagination for high-volume feeds.
+"""
+
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+from datetime import datetime
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(PageNumberPagination):
+    """
+    Paginate on (created_at, id) instead of OFFSET.
+    
+    Each page is a range scan starting after the last row of the previous
+    page, so page N costs the same as page 1. Cursors are opaque tokens in
+    `next` / `previous`. The total `count` is included unless the client
+    passes `?count=false`.
+    
+    Requests that use `?page=` or order on anything other than created_at
+    fall back to regular page-number pagination.
+    """
+    
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    invalid_cursor_message = 'Invalid cursor'
+    keyset_field = 'created_at'
+    
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = False
+        descending = self._keyset_direction(queryset)
+        if descending is None or self.page_query_param in request.query_params:
+            return super().paginate_queryset(queryset, request, view)
+        
+        self.keyset = True
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.count = queryset.count() if self._include_count(request) else None
+        
+        position, reverse = self._decode_cursor(request)
+        # Walking backwards scans in the opposite order and flips the page.
+        scan_descending = descending != reverse
+        field = self.keyset_field
+        ordering = [f'-{field}', '-id'] if scan_descending else [field, 'id']
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            value, pk = position
+            lookup = 'lt' if scan_descending else 'gt'
+            queryset = queryset.filter(
+                Q(**{f'{field}__{lookup}': value})
+                | Q(**{field: value, f'id__{lookup}': pk})
+            )
+        
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+            self.has_next = position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+        self.rows = rows
+        return rows
+    
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+        payload = OrderedDict()
+        if self.count is not None:
+            payload['count'] = self.count
+        payload['next'] = self.get_next_link()
+        payload['previous'] = self.get_previous_link()
+        payload['results'] = data
+        return Response(payload)
+    
+    def get_next_link(self):
+        if not self.keyset:
+            return super().get_next_link()
+        if not self.has_next or not self.rows:
+            return None
+        return self._cursor_url(self.rows[-1], reverse=False)
+    
+    def get_previous_link(self):
+        if not self.keyset:
+            return super().get_previous_link()
+        if not self.has_previous or not self.rows:
+            return None
+        return self._cursor_url(self.rows[0], reverse=True)
+    
+    def _keyset_direction(self, queryset):
+        """True/False for a descending/ascending created_at order, None otherwise."""
+        ordering = list(queryset.query.order_by or queryset.model._meta.ordering)
+        field = self.keyset_field
+        if ordering in ([f'-{field}'], [f'-{field}', '-id'], [f'-{field}', '-pk']):
+            return True
+        if ordering in ([field], [field, 'id'], [field, 'pk']):
+            return False
+        return None
+    
+    def _include_count(self, request):
+        value = request.query_params.get(self.count_query_param, 'true')
+        return value.lower() not in ('0', 'false', 'no')
+    
+    def _decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            padded = encoded + '=' * (-len(encoded) % 4)
+            token = json.loads(urlsafe_b64decode(padded.encode('ascii')))
+            position = (datetime.fromisoformat(token['v']), int(token['i']))
+            return position, bool(token.get('r'))
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+    
+    def _cursor_url(self, row, reverse):
+        token = {'v': getattr(row, self.keyset_field).isoformat(), 'i': row.pk}
+        if reverse:
+            token['r'] = 1
+        encoded = urlsafe_b64encode(
+            json.dumps(token, separators=(',', ':')).encode('ascii')
+        ).decode('ascii').rstrip('=')
+        url = remove_query_param(self.base_url, self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, encoded)
@@ -0,0 +1,259 @@
+"""
+Pluggable full-text search for list endpoints.
+
+Views opt in with `fulltext_search = True`; their `search_fields` must then
+be plain text columns of the model. On MySQL the search runs as a ranked
+MATCH ... AGAINST over a FULLTEXT index covering exactly those columns (see
+the fulltext migrations). Other databases fall back to ranked substring
+matching in SQL, which is slower but always consistent across workers.
+
+The backend can be forced with the SEARCH_BACKEND setting (dotted path).
+InvertedIndexBackend is only used when named there: its index lives in one
+process and is only kept in sync with writes made by that process, so it
+suits single-process development servers and tests, not gunicorn workers.
+"""
+
+import heapq
+import math
+import re
+import threading
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from functools import reduce
+from operator import add, and_, or_
+from django.conf import settings
+from django.db import connections
+from django.db.models import Case, FloatField, Q, Value, When
+from django.db.models.expressions import RawSQL
+from django.db.models.signals import post_delete, post_save
+from django.utils.module_loading import import_string
+from rest_framework.filters import SearchFilter
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def tokenize(text):
+    return TOKEN_RE.findall((text or '').lower())
+
+
+class BaseSearchBackend:
+    """Filters a queryset to matching rows annotated with `search_rank`."""
+    
+    def search(self, queryset, fields, terms):
+        raise NotImplementedError
+
+
+class MySQLFullTextBackend(BaseSearchBackend):
+    """MATCH ... AGAINST in boolean mode; every term is required, as a prefix."""
+    
+    def search(self, queryset, fields, terms):
+        words = [word for term in terms for word in tokenize(term)]
+        if not words:
+            return queryset.none()
+        connection = connections[queryset.db]
+        opts = queryset.model._meta
+        table = connection.ops.quote_name(opts.db_table)
+        columns = ', '.join(
+            f'{table}.{connection.ops.quote_name(opts.get_field(field).column)}'
+            for field in fields
+        )
+        against = ' '.join(f'+{word}*' for word in words)
+        rank = RawSQL(
+            f'MATCH ({columns}) AGAINST (%s IN BOOLEAN MODE)', (against,),
+            output_field=FloatField()
+        )
+        return queryset.annotate(search_rank=rank).filter(
+            search_rank__gt=0
+        ).order_by('-search_rank', '-pk')
+
+
+class SubstringBackend(BaseSearchBackend):
+    """
+    Portable fallback: every term must occur in one of the fields.
+    
+    Rows are ranked by how many (term, field) pairs match; everything runs in
+    the database, so every worker sees the same, current rows.
+    """
+    
+    def search(self, queryset, fields, terms):
+        words = [word for term in terms for word in tokenize(term)]
+        if not words:
+            return queryset.none()
+        matches = [
+            [Q(**{f'{field}__icontains': word}) for field in fields] for word in words
+        ]
+        rank = reduce(add, [
+            Case(When(match, then=Value(1.0)), default=Value(0.0), output_field=FloatField())
+            for word_matches in matches for match in word_matches
+        ])
+        return queryset.filter(
+            reduce(and_, [reduce(or_, word_matches) for word_matches in matches])
+        ).annotate(search_rank=rank).order_by('-search_rank', '-pk')
+
+
+class _InvertedIndex:
+    """Token -> {pk: term frequency} postings for one model/field set."""
+    
+    def __init__(self, model, fields):
+        self.model = model
+        self.fields = fields
+        self.postings = defaultdict(dict)
+        self.documents = {}
+        self.vocabulary = []
+        self.lock = threading.Lock()
+        self._dirty = True
+        with self.lock:
+            rows = model._default_manager.values_list('pk', *fields)
+            for pk, *values in rows.iterator(chunk_size=2000):
+                self._add(pk, values)
+    
+    def _add(self, pk, values):
+        counts = Counter(token for value in values for token in tokenize(value))
+        self.documents[pk] = counts
+        for token, count in counts.items():
+            self.postings[token][pk] = count
+        self._dirty = True
+    
+    def _remove(self, pk):
+        for token in self.documents.pop(pk, {}):
+            postings = self.postings.get(token)
+            if postings is not None:
+                postings.pop(pk, None)
+                if not postings:
+                    del self.postings[token]
+        self._dirty = True
+    
+    def update(self, instance):
+        with self.lock:
+            self._remove(instance.pk)
+            self._add(instance.pk, [getattr(instance, field) for field in self.fields])
+    
+    def delete(self, instance):
+        with self.lock:
+            self._remove(instance.pk)
+    
+    def _matching_tokens(self, word):
+        if self._dirty:
+            self.vocabulary = sorted(self.postings)
+            self._dirty = False
+        start = bisect_left(self.vocabulary, word)
+        for token in self.vocabulary[start:]:
+            if not token.startswith(word):
+                break
+            yield token
+    
+    def search(self, words):
+        """Return {pk: score} for documents containing every word (as a prefix)."""
+        with self.lock:
+            total = len(self.documents) or 1
+            scores = None
+            for word in words:
+                word_scores = defaultdict(float)
+                for token in self._matching_tokens(word):
+                    postings = self.postings[token]
+                    idf = math.log(1 + total / len(postings))
+                    for pk, count in postings.items():
+                        word_scores[pk] += count * idf
+                if scores is None:
+                    scores = dict(word_scores)
+                else:
+                    scores = {
+                        pk: score + word_scores[pk]
+                        for pk, score in scores.items() if pk in word_scores
+                    }
+                if not scores:
+                    return {}
+            return scores or {}
+
+
+class InvertedIndexBackend(BaseSearchBackend):
+    """
+    Pure-Python index kept in sync through this process's model signals.
+    
+    Only the `max_candidates` best-scoring rows are returned, which keeps the
+    pk list and rank expression within SQLite's bound-parameter limit.
+    """
+    
+    max_candidates = 250
+    
+    def __init__(self):
+        self._indexes = {}
+        self._lock = threading.Lock()
+    
+    def get_index(self, model, fields):
+        key = (model._meta.label, tuple(fields))
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is None:
+                index = self._indexes[key] = _InvertedIndex(model, tuple(fields))
+                uid = f'search-index-{key}'
+                post_save.connect(
+                    lambda instance, **kwargs: index.update(instance),
+                    sender=model, weak=False, dispatch_uid=f'{uid}-save'
+                )
+                post_delete.connect(
+                    lambda instance, **kwargs: index.delete(instance),
+                    sender=model, weak=False, dispatch_uid=f'{uid}-delete'
+                )
+            return index
+    
+    def reset(self):
+        """Drop all indexes so they are rebuilt from the database on next use."""
+        with self._lock:
+            for key in self._indexes:
+                uid = f'search-index-{key}'
+                post_save.disconnect(dispatch_uid=f'{uid}-save')
+                post_delete.disconnect(dispatch_uid=f'{uid}-delete')
+            self._indexes.clear()
+    
+    def search(self, queryset, fields, terms):
+        words = [word for term in terms for word in tokenize(term)]
+        if not words:
+            return queryset.none()
+        scores = self.get_index(queryset.model, fields).search(words)
+        if not scores:
+            return queryset.none()
+        if len(scores) > self.max_candidates:
+            scores = dict(heapq.nlargest(
+                self.max_candidates, scores.items(), key=lambda item: (item[1], item[0])
+            ))
+        rank = Case(
+            *[When(pk=pk, then=Value(score)) for pk, score in scores.items()],
+            default=Value(0.0), output_field=FloatField()
+        )
+        return queryset.filter(pk__in=list(scores)).annotate(
+            search_rank=rank
+        ).order_by('-search_rank', '-pk')
+
+
+_backends = {}
+
+
+def get_search_backend(using='default'):
+    """Configured backend, or the one for the database vendor."""
+    if using not in _backends:
+        path = getattr(settings, 'SEARCH_BACKEND', None)
+        if path:
+            backend = import_string(path)()
+        elif connections[using].vendor == 'mysql':
+            backend = MySQLFullTextBackend()
+        else:
+            backend = SubstringBackend()
+        _backends[using] = backend
+    return _backends[using]
+
+
+class FullTextSearchFilter(SearchFilter):
+    """
+    SearchFilter that hands `?search=` to the search backend for views with
+    `fulltext_search = True`, and behaves like DRF's SearchFilter otherwise.
+    """
+    
+    def filter_queryset(self, request, queryset, view):
+        if not getattr(view, 'fulltext_search', False):
+            return super().filter_queryset(request, queryset, view)
+        search_fields = self.get_search_fields(view, request)
+        search_terms = self.get_search_terms(request)
+        if not search_fields or not search_terms:
+            return queryset
+        return get_search_backend(queryset.db).search(queryset, search_fields, search_terms)
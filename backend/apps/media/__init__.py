@@ -0,0 +1 @@
+# Media app
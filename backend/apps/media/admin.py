@@ -0,0 +1,14 @@
+"""
+Admin configuration for media app.
+"""
+
+from django.contrib import admin
+from .models import ImageDerivative
+
+
+@admin.register(ImageDerivative)
+class ImageDerivativeAdmin(admin.ModelAdmin):
+    list_display = ('source', 'variant', 'width', 'height', 'format', 'size', 'created_at')
+    list_filter = ('variant', 'format')
+    search_fields = ('source',)
+    ordering = ('-created_at',)
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class MediaConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.media'
+    verbose_name = 'Media'
+    
+    def ready(self):
+        import apps.media.signals  # noqa
@@ -0,0 +1,179 @@
+"""
+Background generation of image derivatives.
+
+Every image field listed in IMAGE_FIELDS gets the variants configured in
+settings.IMAGE_VARIANTS (sized thumbnails, WebP copies). Rendering happens
+in a process pool after the upload's transaction commits, so requests only
+pay for storing the original. Results are recorded as ImageDerivative rows
+keyed by the original's storage name, which serializers look up in bulk.
+
+With MEDIA_DERIVATIVES_ASYNC = False the variants are rendered inline,
+which is what the test suite and small development setups use.
+"""
+
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, close_old_connections, transaction
+from django.dispatch import Signal
+from .imaging import render_variants
+from .models import ImageDerivative, MediaBlob
+
+logger = logging.getLogger(__name__)
+
+# (app_label.Model, field name) of every uploaded image in the project.
+IMAGE_FIELDS = (
+    ('users.User', 'avatar'),
+    ('artists.ArtistPortfolio', 'image'),
+    ('commissions.Commission', 'final_artwork'),
+    ('commissions.CommissionRevision', 'artwork'),
+    ('commissions.CommissionReferenceImage', 'image'),
+)
+
+EXTENSIONS = {'JPEG': 'jpg', 'WEBP': 'webp', 'PNG': 'png'}
+
+# Sent with `source` once the variants of an original are recorded, so
+# apps that cache serialized variants can drop their copies.
+variants_stored = Signal()
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def variant_specs():
+    """[(variant, max edge, format)] from settings.IMAGE_VARIANTS."""
+    return [
+        (variant, spec['size'], spec['format'].upper())
+        for variant, spec in settings.IMAGE_VARIANTS.items()
+    ]
+
+
+def derivative_name(source, variant, image_format):
+    stem = os.path.splitext(source)[0]
+    return f"derivatives/{variant}/{stem}.{EXTENSIONS.get(image_format, image_format.lower())}"
+
+
+def read_source(name, storage=default_storage):
+    """A path the worker can open directly, or the file's bytes for remote storages."""
+    try:
+        return storage.path(name)
+    except NotImplementedError:
+        with storage.open(name, 'rb') as handle:
+            return handle.read()
+
+
+def missing(names):
+    """The subset of `names` that has no derivatives yet."""
+    names = set(filter(None, names))
+    if not names:
+        return set()
+    done = ImageDerivative.objects.filter(source__in=names).values_list('source', flat=True)
+    return names - set(done)
+
+
+def store(source, rendered, storage=default_storage):
+    """Save rendered variants to storage and record them."""
+    rows = []
+    for variant, width, height, image_format, content in rendered:
+        name = storage.save(derivative_name(source, variant, image_format), ContentFile(content))
+        rows.append(ImageDerivative(
+            source=source, variant=variant, file=name, width=width, height=height,
+            format=image_format, size=len(content),
+        ))
+    try:
+        with transaction.atomic():
+            ImageDerivative.objects.bulk_create(rows)
+    except IntegrityError:
+        # Another worker recorded this source first; drop our copies.
+        for row in rows:
+            storage.delete(row.file.name)
+        return
+    variants_stored.send(sender=ImageDerivative, source=source)
+
+
+def generate(name, storage=default_storage):
+    """Render and store the variants of one original, synchronously."""
+    try:
+        rendered = render_variants(read_source(name, storage), variant_specs())
+    except Exception:
+        logger.warning('Could not render image variants for %s', name, exc_info=True)
+        return False
+    store(name, rendered, storage)
+    return True
+
+
+def get_executor():
+    """The shared process pool; spawned workers never inherit DB connections."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.MEDIA_DERIVATIVE_WORKERS,
+                mp_context=multiprocessing.get_context('spawn'),
+            )
+        return _executor
+
+
+def _finished(name, future):
+    # Runs on the executor's management thread in this process.
+    close_old_connections()
+    try:
+        store(name, future.result())
+    except Exception:
+        logger.warning('Could not render image variants for %s', name, exc_info=True)
+    finally:
+        close_old_connections()
+
+
+def _submit(names):
+    specs = variant_specs()
+    for name in missing(names):
+        future = get_executor().submit(render_variants, read_source(name), specs)
+        future.add_done_callback(lambda future, name=name: _finished(name, future))
+
+
+def schedule(*names):
+    """Queue derivative generation for the given originals once the transaction commits."""
+    names = [name for name in names if name]
+    if not names:
+        return
+    if settings.MEDIA_DERIVATIVES_ASYNC:
+        transaction.on_commit(lambda: _submit(names))
+    else:
+        for name in missing(names):
+            generate(name)
+
+
+def variants_for(names):
+    """
+    {original name: {variant: {url, width, height, format}}} in two queries.
+    
+    The 'original' entry carries the dimensions, format and byte size
+    recorded when the original was uploaded (no url: that is the field's own).
+    """
+    variants = {name: {} for name in names if name}
+    if not variants:
+        return variants
+    originals = MediaBlob.objects.filter(
+        name__in=list(variants), width__isnull=False
+    ).values_list('name', 'width', 'height', 'format', 'size')
+    for name, width, height, image_format, size in originals:
+        variants[name]['original'] = {
+            'width': width,
+            'height': height,
+            'format': image_format.lower(),
+            'size': size,
+        }
+    for row in ImageDerivative.objects.filter(source__in=list(variants)):
+        variants[row.source][row.variant] = {
+            'url': row.file.url,
+            'width': row.width,
+            'height': row.height,
+            'format': row.format.lower(),
+        }
+    return variants
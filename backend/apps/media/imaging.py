@@ -0,0 +1,57 @@
+"""
+Pillow rendering of image variants.
+
+This module must not import Django models: `render_variants` runs inside
+worker processes of a spawn-based pool, which do not set up Django.
+"""
+
+from io import BytesIO
+from PIL import Image, ImageOps
+
+# Pillow save() arguments per output format.
+SAVE_OPTIONS = {
+    'JPEG': {'quality': 82, 'optimize': True, 'progressive': True},
+    'WEBP': {'quality': 80, 'method': 4},
+    'PNG': {'optimize': True},
+}
+
+
+def _prepare(image, image_format):
+    if image_format == 'JPEG' and image.mode != 'RGB':
+        if image.mode in ('RGBA', 'LA', 'P'):
+            image = image.convert('RGBA')
+            background = Image.new('RGB', image.size, (255, 255, 255))
+            background.paste(image, mask=image.getchannel('A'))
+            return background
+        return image.convert('RGB')
+    if image.mode not in ('RGB', 'RGBA'):
+        return image.convert('RGBA' if 'A' in image.getbands() or image.mode == 'P' else 'RGB')
+    return image
+
+
+def render_variants(source, specs):
+    """
+    Render every variant of one image.
+    
+    `source` is a filesystem path or the raw bytes of the original; `specs`
+    is a list of (variant, max_edge, format). Returns a list of
+    (variant, width, height, format, encoded bytes). Images are never
+    upscaled.
+    """
+    largest = max(max_edge for _, max_edge, _ in specs)
+    with Image.open(source if isinstance(source, str) else BytesIO(source)) as original:
+        # JPEG decoders can downscale by 1/2..1/8 while decoding, which is far
+        # cheaper than decoding the full image and resizing afterwards.
+        original.draft('RGB', (largest, largest))
+        base = ImageOps.exif_transpose(original)
+        base.load()
+    
+    rendered = []
+    for variant, max_edge, image_format in specs:
+        image = base.copy()
+        image.thumbnail((max_edge, max_edge), Image.LANCZOS)
+        image = _prepare(image, image_format)
+        buffer = BytesIO()
+        image.save(buffer, image_format, **SAVE_OPTIONS.get(image_format, {}))
+        rendered.append((variant, image.width, image.height, image_format, buffer.getvalue()))
+    return rendered
@@ -0,0 +1,137 @@
+"""
+Django management command to move existing media to content-addressed names.
+"""
+
+import hashlib
+import os
+import posixpath
+from collections import Counter
+from django.apps import apps
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from apps.media.derivatives import IMAGE_FIELDS
+from apps.media.models import ImageDerivative, MediaBlob
+from apps.media.storage import content_name, is_content_addressed_name
+from apps.media.signals import release_file
+from apps.media.validation import ARTWORK_FORMATS, InvalidImage, inspect
+
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for chunk in iter(lambda: handle.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def image_metadata(path):
+    """MediaBlob image columns for a stored file; empty if it is not a valid image."""
+    try:
+        with open(path, 'rb') as handle:
+            info = inspect(handle, ARTWORK_FORMATS)
+    except InvalidImage:
+        return {}
+    return {'width': info.width, 'height': info.height, 'format': info.format}
+
+
+class Command(BaseCommand):
+    help = 'Renames stored media to content hashes, merges duplicates and rebuilds reference counts'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Only report what would be merged'
+        )
+        parser.add_argument(
+            '--prune', action='store_true',
+            help='Also delete content-addressed files no model references any more'
+        )
+    
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        moved = merged = missing = reclaimed = 0
+        
+        for label, field_name in IMAGE_FIELDS:
+            model = apps.get_model(label)
+            field = model._meta.get_field(field_name)
+            directory = posixpath.dirname(field.generate_filename(None, 'file'))
+            names = (
+                model.objects.exclude(**{field_name: ''}).exclude(**{f'{field_name}__isnull': True})
+                .order_by(field_name).values_list(field_name, flat=True).distinct()
+            )
+            for name in names.iterator(chunk_size=2000):
+                if is_content_addressed_name(name):
+                    continue
+                path = default_storage.path(name)
+                if not os.path.exists(path):
+                    missing += 1
+                    self.stdout.write(self.style.WARNING(f'{label}.{field_name}: missing {name}'))
+                    continue
+                target = content_name(directory, file_sha256(path), posixpath.splitext(name)[1])
+                target_path = default_storage.path(target)
+                duplicate = os.path.exists(target_path)
+                if duplicate:
+                    merged += 1
+                    reclaimed += os.path.getsize(path)
+                else:
+                    moved += 1
+                if dry_run:
+                    continue
+                with transaction.atomic():
+                    model.objects.filter(**{field_name: name}).update(**{field_name: target})
+                    derivatives = ImageDerivative.objects.filter(source=name)
+                    if ImageDerivative.objects.filter(source=target).exists():
+                        for derivative in derivatives:
+                            derivative.delete()
+                    else:
+                        derivatives.update(source=target)
+                if duplicate:
+                    os.unlink(path)
+                else:
+                    os.makedirs(os.path.dirname(target_path), exist_ok=True)
+                    os.replace(path, target_path)
+        
+        self.stdout.write(
+            f'{moved} file(s) renamed, {merged} duplicate(s) merged '
+            f'({reclaimed / 1024 / 1024:.1f} MB reclaimed), {missing} missing'
+        )
+        if not dry_run:
+            self._rebuild_refcounts(options['prune'])
+        self.stdout.write(self.style.SUCCESS('Media deduplicated' if not dry_run else 'Dry run complete'))
+    
+    def _rebuild_refcounts(self, prune):
+        """Set every MediaBlob.refcount to the number of fields that reference it."""
+        references = Counter()
+        for label, field_name in IMAGE_FIELDS:
+            model = apps.get_model(label)
+            names = model.objects.exclude(**{field_name: ''}).values_list(field_name, flat=True)
+            references.update(
+                name for name in names.iterator(chunk_size=2000)
+                if name and is_content_addressed_name(name)
+            )
+        
+        for name, count in references.items():
+            path = default_storage.path(name)
+            if not os.path.exists(path):
+                continue
+            updated = MediaBlob.objects.filter(name=name).update(refcount=count)
+            if not updated:
+                MediaBlob.objects.create(
+                    name=name, sha256=posixpath.splitext(posixpath.basename(name))[0],
+                    size=os.path.getsize(path), refcount=count, **image_metadata(path)
+                )
+            elif MediaBlob.objects.filter(name=name, format='').exists():
+                MediaBlob.objects.filter(name=name).update(**image_metadata(path))
+        
+        orphans = [
+            name for name in MediaBlob.objects.values_list('name', flat=True).iterator()
+            if name not in references
+        ]
+        self.stdout.write(f'{len(references)} blob(s) referenced, {len(orphans)} unreferenced')
+        for name in orphans:
+            if prune:
+                MediaBlob.objects.filter(name=name).update(refcount=1)
+                release_file(name)
+            else:
+                MediaBlob.objects.filter(name=name).update(refcount=0)
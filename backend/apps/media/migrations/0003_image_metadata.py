@@ -0,0 +1,28 @@
+# Generated by Django 4.2.9 on 2026-10-17 21:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('media', '0002_media_blob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mediablob',
+            name='format',
+            field=models.CharField(blank=True, max_length=10),
+        ),
+        migrations.AddField(
+            model_name='mediablob',
+            name='height',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='mediablob',
+            name='width',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
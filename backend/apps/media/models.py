@@ -0,0 +1,52 @@
+"""
+Media models - derived image variants (thumbnails, WebP) and the reference
+counts of content-addressed files.
+"""
+
+from django.db import models
+
+
+class ImageDerivative(models.Model):
+    """A resized/re-encoded copy of an uploaded image, keyed by the original's storage name."""
+    
+    source = models.CharField(max_length=255)
+    variant = models.CharField(max_length=50)
+    file = models.FileField(max_length=255)
+    width = models.PositiveIntegerField()
+    height = models.PositiveIntegerField()
+    format = models.CharField(max_length=10)
+    size = models.PositiveIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'image_derivatives'
+        verbose_name = 'Image Derivative'
+        verbose_name_plural = 'Image Derivatives'
+        constraints = [
+            models.UniqueConstraint(fields=['source', 'variant'], name='image_derivative_unique'),
+        ]
+    
+    def __str__(self):
+        return f"{self.source} [{self.variant}]"
+
+
+class MediaBlob(models.Model):
+    """One stored file of the content-addressed storage and how many fields point at it."""
+    
+    name = models.CharField(max_length=255, unique=True)
+    sha256 = models.CharField(max_length=64, db_index=True)
+    size = models.PositiveBigIntegerField()
+    refcount = models.PositiveIntegerField(default=0)
+    # Image metadata recorded at upload (see validation.py); empty for other files.
+    width = models.PositiveIntegerField(null=True, blank=True)
+    height = models.PositiveIntegerField(null=True, blank=True)
+    format = models.CharField(max_length=10, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'media_blobs'
+        verbose_name = 'Media Blob'
+        verbose_name_plural = 'Media Blobs'
+    
+    def __str__(self):
+        return f"{self.name} ({self.refcount})"
@@ -0,0 +1,71 @@
+"""
+Serializer fields for uploaded images: validation on the way in, derived
+variants on the way out.
+"""
+
+from rest_framework import serializers
+from .derivatives import variants_for
+from .validation import WEB_FORMATS, InvalidImage, inspect
+
+CONTEXT_KEY = '_image_variants'
+
+
+class ValidatedImageField(serializers.FileField):
+    """
+    Image upload checked by magic bytes and a header-only parse.
+    
+    Replaces DRF's ImageField, which trusts Pillow's verify() to read the
+    whole file. The ImageInfo is attached to the upload as `image_info`.
+    """
+    
+    def __init__(self, *args, formats=WEB_FORMATS, **kwargs):
+        self.formats = formats
+        super().__init__(*args, **kwargs)
+    
+    def to_internal_value(self, data):
+        file = super().to_internal_value(data)
+        try:
+            file.image_info = inspect(file, self.formats)
+        except InvalidImage as exc:
+            raise serializers.ValidationError(str(exc))
+        return file
+
+
+class ImageVariantsField(serializers.ReadOnlyField):
+    """
+    Variants of the image at `source`, as {variant: {url, width, height, format}}.
+    
+    Lookups are cached in the serializer context. List serializers using
+    ImageVariantsListSerializer prefetch the whole page in one query.
+    """
+    
+    def to_representation(self, value):
+        name = getattr(value, 'name', None)
+        if not name:
+            return {}
+        cache = self.context.setdefault(CONTEXT_KEY, {})
+        if name not in cache:
+            cache.update(variants_for([name]))
+        return cache[name]
+
+
+class ImageVariantsListSerializer(serializers.ListSerializer):
+    """Prefetches the variants of every ImageVariantsField for the whole list."""
+    
+    def to_representation(self, data):
+        items = list(data.all() if hasattr(data, 'all') else data)
+        fields = [
+            field for field in self.child.fields.values()
+            if isinstance(field, ImageVariantsField)
+        ]
+        names = []
+        for item in items:
+            for field in fields:
+                try:
+                    value = field.get_attribute(item)
+                except (AttributeError, KeyError):
+                    continue
+                names.append(getattr(value, 'name', None))
+        cache = self.context.setdefault(CONTEXT_KEY, {})
+        cache.update(variants_for([name for name in names if name and name not in cache]))
+        return super().to_representation(items)
@@ -0,0 +1,81 @@
+"""
+Media signals: queue image derivatives whenever an image field is saved, and
+release stored files (and their derivatives) when their rows are deleted or
+the field is pointed at another file.
+"""
+
+from django.apps import apps
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from .derivatives import IMAGE_FIELDS, schedule
+from .models import ImageDerivative
+
+
+def release_file(name):
+    """Drop one reference to a stored original; remove its derivatives with the last one."""
+    default_storage.delete(name)
+    if not default_storage.exists(name):
+        for derivative in ImageDerivative.objects.filter(source=name):
+            derivative.delete()
+
+
+def _previous_attr(field_name):
+    return f'_previous_{field_name}'
+
+
+def _image_saving_handler(field_name):
+    def handler(sender, instance, update_fields=None, raw=False, **kwargs):
+        if raw or instance._state.adding or (
+            update_fields is not None and field_name not in update_fields
+        ):
+            return
+        previous = sender._base_manager.filter(pk=instance.pk).values_list(
+            field_name, flat=True
+        ).first()
+        setattr(instance, _previous_attr(field_name), previous)
+    return handler
+
+
+def _image_saved_handler(field_name):
+    def handler(sender, instance, update_fields=None, raw=False, **kwargs):
+        if raw or (update_fields is not None and field_name not in update_fields):
+            return
+        name = getattr(instance, field_name).name
+        previous = instance.__dict__.pop(_previous_attr(field_name), None)
+        if previous and previous != name:
+            # The replaced file goes once the new name is committed.
+            transaction.on_commit(lambda: release_file(previous))
+        schedule(name)
+    return handler
+
+
+def _image_deleted_handler(field_name):
+    def handler(sender, instance, **kwargs):
+        name = getattr(instance, field_name).name
+        if name:
+            transaction.on_commit(lambda: release_file(name))
+    return handler
+
+
+def derivative_deleted(sender, instance, **kwargs):
+    name = instance.file.name
+    transaction.on_commit(lambda: default_storage.delete(name))
+
+
+for label, field_name in IMAGE_FIELDS:
+    model = apps.get_model(label)
+    pre_save.connect(
+        _image_saving_handler(field_name), sender=model,
+        weak=False, dispatch_uid=f'image-previous-{label}-{field_name}'
+    )
+    post_save.connect(
+        _image_saved_handler(field_name), sender=model,
+        weak=False, dispatch_uid=f'image-derivatives-{label}-{field_name}'
+    )
+    post_delete.connect(
+        _image_deleted_handler(field_name), sender=model,
+        weak=False, dispatch_uid=f'image-release-{label}-{field_name}'
+    )
+
+post_delete.connect(derivative_deleted, sender=ImageDerivative, dispatch_uid='derivative-release')
@@ -0,0 +1,192 @@
+"""
+Media storage: signed URLs for private files and content-addressed uploads.
+
+Files under settings.MEDIA_PRIVATE_PREFIXES (commission references, revisions
+and final artwork, plus their derivatives) get URLs carrying an expiry and an
+HMAC, which the media view checks before handing the file to nginx. Expiries
+are rounded up to a MEDIA_URL_TTL boundary, so a URL stays identical, and
+cacheable by the browser, for a whole window.
+
+ContentAddressedStorage names every upload `<upload dir>/<aa>/<sha256><ext>`.
+Identical content uploaded to the same kind of field is stored once, and a
+MediaBlob row counts how many model fields point at it; the file is only
+removed when the last reference is released.
+"""
+
+import hashlib
+import os
+import posixpath
+import re
+import tempfile
+import time
+from urllib.parse import urlencode
+from django.conf import settings
+from django.core.files.move import file_move_safe
+from django.core.files.storage import FileSystemStorage
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils.crypto import constant_time_compare, salted_hmac
+
+SIGNATURE_SALT = 'apps.media.storage'
+DERIVATIVES_PREFIX = 'derivatives/'
+
+
+def original_name(name):
+    """Storage name of the original a derivative was rendered from."""
+    if name.startswith(DERIVATIVES_PREFIX):
+        parts = name.split('/', 2)
+        if len(parts) == 3:
+            return parts[2]
+    return name
+
+
+def is_private(name):
+    return original_name(name).startswith(tuple(settings.MEDIA_PRIVATE_PREFIXES))
+
+
+def sign(name, expires):
+    return salted_hmac(SIGNATURE_SALT, f'{name}:{expires}').hexdigest()[:32]
+
+
+def signature_params(name, now=None):
+    ttl = settings.MEDIA_URL_TTL
+    now = int(now if now is not None else time.time())
+    # Valid for at least one full window, at most two.
+    expires = (now // ttl + 2) * ttl
+    return {'e': expires, 's': sign(name, expires)}
+
+
+def check_signature(name, params, now=None):
+    try:
+        expires = int(params.get('e', ''))
+    except ValueError:
+        return False
+    now = now if now is not None else time.time()
+    return expires >= now and constant_time_compare(params.get('s', ''), sign(name, expires))
+
+
+class MediaStorage(FileSystemStorage):
+    """FileSystemStorage whose URLs for private files are signed."""
+    
+    def url(self, name):
+        url = super().url(name)
+        if name and is_private(name):
+            url = f'{url}?{urlencode(signature_params(name))}'
+        return url
+
+
+CONTENT_NAME_RE = re.compile(r'(?:^|/)([0-9a-f]{2})/(\1[0-9a-f]{62})(?:\.\w+)?$')
+
+
+def is_content_addressed_name(name):
+    return bool(CONTENT_NAME_RE.search(name))
+
+
+def content_name(directory, sha256, ext):
+    return posixpath.join(directory, sha256[:2], f'{sha256}{ext.lower()}')
+
+
+def acquire(name, sha256, size, image_info=None):
+    """Count one more reference to a blob; True if the blob is new."""
+    from .models import MediaBlob
+    if MediaBlob.objects.filter(name=name).update(refcount=F('refcount') + 1):
+        return False
+    metadata = {}
+    if image_info is not None:
+        metadata = {
+            'width': image_info.width, 'height': image_info.height,
+            'format': image_info.format,
+        }
+    try:
+        with transaction.atomic():
+            MediaBlob.objects.create(
+                name=name, sha256=sha256, size=size, refcount=1, **metadata
+            )
+        return True
+    except IntegrityError:
+        MediaBlob.objects.filter(name=name).update(refcount=F('refcount') + 1)
+        return False
+
+
+def release(name):
+    """Drop one reference to a blob; True if it was the last (or untracked)."""
+    from .models import MediaBlob
+    with transaction.atomic():
+        blob = MediaBlob.objects.select_for_update().filter(name=name).first()
+        if blob is None:
+            return True
+        if blob.refcount > 1:
+            MediaBlob.objects.filter(pk=blob.pk).update(refcount=F('refcount') - 1)
+            return False
+        blob.delete()
+        return True
+
+
+class ContentAddressedStorage(MediaStorage):
+    """
+    Deduplicating storage for uploads; derivatives keep their derived names.
+    
+    The hash is taken from `content.sha256` when the upload handlers already
+    computed it while receiving the file (see uploadhandlers.py), otherwise
+    it is computed while the content is spooled to a temporary file. Image
+    metadata found by validation (`content.image_info`) is kept on the blob.
+    """
+    
+    incoming_dir = '.incoming'
+    
+    def is_content_addressed(self, name):
+        return not name.startswith(DERIVATIVES_PREFIX)
+    
+    def _save(self, name, content):
+        if not self.is_content_addressed(name):
+            return super()._save(name, content)
+        
+        sha256 = getattr(content, 'sha256', None)
+        spooled = None
+        try:
+            if sha256 and hasattr(content, 'temporary_file_path'):
+                source = content.temporary_file_path()
+            else:
+                spooled, sha256 = self._spool(content)
+                source = spooled
+            directory, ext = posixpath.dirname(name), posixpath.splitext(name)[1]
+            final = content_name(directory, sha256, ext)
+            created = acquire(
+                final, sha256, os.path.getsize(source), getattr(content, 'image_info', None)
+            )
+            full_path = self.path(final)
+            if created or not os.path.exists(full_path):
+                self._place(source, full_path)
+        finally:
+            if spooled and os.path.exists(spooled):
+                os.unlink(spooled)
+        return final
+    
+    def _spool(self, content):
+        """Copy `content` to a temporary file, hashing it on the way."""
+        incoming = self.path(self.incoming_dir)
+        os.makedirs(incoming, exist_ok=True)
+        digest = hashlib.sha256()
+        fd, path = tempfile.mkstemp(dir=incoming)
+        try:
+            with os.fdopen(fd, 'wb') as spool:
+                for chunk in content.chunks():
+                    if isinstance(chunk, str):
+                        chunk = chunk.encode()
+                    digest.update(chunk)
+                    spool.write(chunk)
+        except BaseException:
+            os.unlink(path)
+            raise
+        return path, digest.hexdigest()
+    
+    def _place(self, source, full_path):
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        file_move_safe(source, full_path, allow_overwrite=True)
+        if self.file_permissions_mode is not None:
+            os.chmod(full_path, self.file_permissions_mode)
+    
+    def delete(self, name):
+        if name and self.is_content_addressed(name) and not release(name):
+            return
+        super().delete(name)
@@ -0,0 +1,44 @@
+"""
+Upload handlers that hash files while Django receives them.
+
+The SHA-256 of each upload is computed chunk by chunk as it is written to
+memory or to the temporary file, and attached as `file.sha256`, so the
+content-addressed storage can name and place it without reading it again.
+"""
+
+import hashlib
+from django.core.files.uploadhandler import (
+    MemoryFileUploadHandler, TemporaryFileUploadHandler
+)
+
+
+class HashingMixin:
+    def new_file(self, *args, **kwargs):
+        self.digest = hashlib.sha256()
+        return super().new_file(*args, **kwargs)
+    
+    def receive_data_chunk(self, raw_data, start):
+        if self.digest is not None:
+            self.digest.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+    
+    def file_complete(self, file_size):
+        uploaded = super().file_complete(file_size)
+        if uploaded is not None:
+            uploaded.sha256 = self.digest.hexdigest()
+        return uploaded
+
+
+class HashingMemoryFileUploadHandler(HashingMixin, MemoryFileUploadHandler):
+    """Keeps small uploads in memory, like Django's default handler."""
+    
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        # The memory handler only takes the file if it is activated; otherwise
+        # the chunks pass through to the temporary file handler, which hashes them.
+        if not self.activated:
+            self.digest = None
+
+
+class HashingTemporaryFileUploadHandler(HashingMixin, TemporaryFileUploadHandler):
+    """Streams large uploads to a temporary file, like Django's default handler."""
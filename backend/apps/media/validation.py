@@ -0,0 +1,118 @@
+"""
+Upload-time image validation.
+
+The file type is taken from the leading magic bytes, never from the
+client's Content-Type or file name. Pillow then parses only the header
+(Image.open is lazy, no pixel data is decoded), reading at most
+HEADER_READ_LIMIT bytes, which is enough to learn the format and
+dimensions. Images whose pixel count exceeds settings.IMAGE_MAX_PIXELS are
+rejected at this point, before anything tries to decode them.
+
+The resulting ImageInfo is attached to the upload as `file.image_info`,
+and the content-addressed storage records it on the file's MediaBlob.
+"""
+
+import os
+from collections import namedtuple
+from django.conf import settings
+from PIL import Image
+
+ImageInfo = namedtuple('ImageInfo', ['format', 'width', 'height', 'size'])
+
+# Pillow format -> predicate over the first bytes of the file.
+SIGNATURES = {
+    'JPEG': lambda head: head.startswith(b'\xff\xd8\xff'),
+    'PNG': lambda head: head.startswith(b'\x89PNG\r\n\x1a\n'),
+    'GIF': lambda head: head[:6] in (b'GIF87a', b'GIF89a'),
+    'WEBP': lambda head: head[:4] == b'RIFF' and head[8:12] == b'WEBP',
+    'PSD': lambda head: head.startswith(b'8BPS'),
+}
+
+WEB_FORMATS = ('JPEG', 'PNG', 'GIF', 'WEBP')
+# Deliverables may also be layered Photoshop files.
+ARTWORK_FORMATS = WEB_FORMATS + ('PSD',)
+
+HEADER_READ_LIMIT = 8 * 1024 * 1024
+
+
+class InvalidImage(Exception):
+    """The upload is not an acceptable image; the message is safe to show."""
+
+
+class _BoundedReader:
+    """File wrapper that refuses to hand Pillow more than `limit` bytes."""
+    
+    def __init__(self, file, limit):
+        self.file = file
+        self.remaining = limit
+    
+    def read(self, size=-1):
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining + 1
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        if self.remaining < 0:
+            raise InvalidImage('Image header is too large')
+        return data
+    
+    def seek(self, offset, whence=os.SEEK_SET):
+        return self.file.seek(offset, whence)
+    
+    def tell(self):
+        return self.file.tell()
+
+
+def sniff(head, formats=WEB_FORMATS):
+    """The format whose signature matches `head`, or None."""
+    for image_format in formats:
+        if SIGNATURES[image_format](head):
+            return image_format
+    return None
+
+
+def _file_size(file):
+    size = getattr(file, 'size', None)
+    if size is None:
+        position = file.tell()
+        size = file.seek(0, os.SEEK_END)
+        file.seek(position)
+    return size
+
+
+def inspect(file, formats=WEB_FORMATS):
+    """
+    Validate an uploaded image and return its ImageInfo.
+    
+    `file` is any seekable binary file (an UploadedFile, a Django File or
+    an open file). Raises InvalidImage.
+    """
+    file.seek(0)
+    image_format = sniff(file.read(16), formats)
+    if image_format is None:
+        raise InvalidImage(
+            'Unsupported image type. Allowed: ' + ', '.join(formats)
+        )
+    
+    file.seek(0)
+    try:
+        reader = _BoundedReader(file, HEADER_READ_LIMIT)
+        with Image.open(reader, formats=[image_format]) as image:
+            width, height = image.size
+    except Image.DecompressionBombError:
+        raise InvalidImage('Image dimensions are too large')
+    except InvalidImage:
+        raise
+    except Exception:
+        # Pillow plugins raise a variety of errors on malformed headers.
+        raise InvalidImage('The file is not a valid image')
+    finally:
+        file.seek(0)
+    
+    if width < 1 or height < 1:
+        raise InvalidImage('The file is not a valid image')
+    if width * height > settings.IMAGE_MAX_PIXELS:
+        raise InvalidImage(
+            f'Image dimensions are too large ({width}x{height}); '
+            f'at most {settings.IMAGE_MAX_PIXELS} pixels are allowed'
+        )
+    return ImageInfo(image_format, width, height, _file_size(file))
@@ -0,0 +1,75 @@
+"""
+Media views: authorize in Django, transfer bytes in nginx.
+"""
+
+import mimetypes
+import os
+import posixpath
+import time
+from urllib.parse import quote
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseForbidden
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from .storage import check_signature, is_private
+
+# Public media never changes in place: uploads get a fresh name instead.
+PUBLIC_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+
+def _clean(path):
+    name = posixpath.normpath(path).lstrip('/')
+    # Dot-directories hold unfinished uploads (.incoming) and are never served.
+    if name in ('', '.') or '\x00' in name or any(
+        part.startswith('.') for part in name.split('/')
+    ):
+        raise Http404('Invalid media path')
+    return name
+
+
+def serve_media(request, path):
+    """
+    Serve an uploaded file.
+    
+    Private files need a valid signed URL (see storage.MediaStorage). With
+    MEDIA_ACCEL_REDIRECT_PREFIX set, the response is an empty
+    X-Accel-Redirect telling nginx which file to send, so the worker is
+    released as soon as the headers are written; otherwise the file is
+    streamed by Django, which is only meant for development.
+    """
+    name = _clean(path)
+    private = is_private(name)
+    if private and not check_signature(name, request.GET):
+        return HttpResponseForbidden('Invalid or expired media link')
+    
+    try:
+        stat = os.stat(default_storage.path(name))
+    except (FileNotFoundError, NotADirectoryError):
+        raise Http404('File not found')
+    etag = f'"{stat.st_size:x}-{int(stat.st_mtime):x}"'
+    if private:
+        max_age = max(int(request.GET['e']) - int(time.time()), 0)
+        cache_control = f'private, max-age={max_age}'
+    else:
+        cache_control = PUBLIC_CACHE_CONTROL
+    
+    not_modified = get_conditional_response(request, etag=etag, last_modified=stat.st_mtime)
+    if not_modified is not None:
+        not_modified['Cache-Control'] = cache_control
+        return not_modified
+    
+    accel_prefix = settings.MEDIA_ACCEL_REDIRECT_PREFIX
+    if accel_prefix:
+        response = HttpResponse()
+        response['X-Accel-Redirect'] = f'{accel_prefix.rstrip("/")}/{quote(name)}'
+        content_type, encoding = mimetypes.guess_type(name)
+        response['Content-Type'] = content_type or 'application/octet-stream'
+        if encoding:
+            response['Content-Encoding'] = encoding
+    else:
+        response = FileResponse(default_storage.open(name, 'rb'))
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    response['Cache-Control'] = cache_control
+    return response
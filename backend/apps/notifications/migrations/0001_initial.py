@@ -0,0 +1,38 @@
+# Generated by Django 4.2.9 on 2026-10-17 20:29
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Notification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('type', models.CharField(choices=[('commission_request', 'New Commission Request'), ('commission_accepted', 'Commission Accepted'), ('commission_rejected', 'Commission Rejected'), ('commission_update', 'Commission Update'), ('commission_completed', 'Commission Completed'), ('revision_submitted', 'Revision Submitted'), ('payment_received', 'Payment Received'), ('payment_sent', 'Payment Sent'), ('review_received', 'Review Received'), ('system', 'System Notification')], max_length=30)),
+                ('title', models.CharField(max_length=200)),
+                ('message', models.TextField()),
+                ('link', models.CharField(blank=True, max_length=500, null=True)),
+                ('data', models.JSONField(blank=True, default=dict)),
+                ('is_read', models.BooleanField(default=False)),
+                ('read_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notifications', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Notification',
+                'verbose_name_plural': 'Notifications',
+                'db_table': 'notifications',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
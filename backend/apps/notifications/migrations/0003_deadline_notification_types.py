@@ -0,0 +1,18 @@
+# Generated by Django 4.2.9 on 2026-10-17 21:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0002_hot_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='notification',
+            name='type',
+            field=models.CharField(choices=[('commission_request', 'New Commission Request'), ('commission_accepted', 'Commission Accepted'), ('commission_rejected', 'Commission Rejected'), ('commission_update', 'Commission Update'), ('commission_completed', 'Commission Completed'), ('revision_submitted', 'Revision Submitted'), ('payment_received', 'Payment Received'), ('payment_sent', 'Payment Sent'), ('review_received', 'Review Received'), ('deadline_approaching', 'Deadline Approaching'), ('deadline_missed', 'Deadline Missed'), ('system', 'System Notification')], max_length=30),
+        ),
+    ]
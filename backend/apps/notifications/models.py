@@ -19,6 +19,8 @@ class Notification(models.Model):
         PAYMENT_RECEIVED = 'payment_received', 'Payment Received'
         PAYMENT_SENT = 'payment_sent', 'Payment Sent'
         REVIEW_RECEIVED = 'review_received', 'Review Received'
+        DEADLINE_APPROACHING = 'deadline_approaching', 'Deadline Approaching'
+        DEADLINE_MISSED = 'deadline_missed', 'Deadline Missed'
         SYSTEM = 'system', 'System Notification'
     
     user = models.ForeignKey(
@@ -40,6 +42,10 @@ class Notification(models.Model):
         verbose_name = 'Notification'
         verbose_name_plural = 'Notifications'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', 'is_read', 'created_at'], name='notification_user_read_idx'),
+            models.Index(fields=['user', 'created_at'], name='notification_user_created_idx'),
+        ]
     
     def __str__(self):
         return f"{self.user.email} - {self.title}"
@@ -55,3 +61,8 @@ class Notification(models.Model):
             link=link,
             data=data or {}
         )
+    
+    @classmethod
+    def unread_count(cls, user):
+        """Number of unread notifications of `user` (an index-only count)."""
+        return cls.objects.filter(user=user, is_read=False).count()
@@ -9,12 +9,14 @@ from rest_framework.decorators import api_view, permission_classes
 from django.utils import timezone
 from .models import Notification
 from .serializers import NotificationSerializer
+from apps.core.pagination import KeysetPagination
 
 
 class NotificationListView(generics.ListAPIView):
     """List notifications for current user."""
     
     serializer_class = NotificationSerializer
+    pagination_class = KeysetPagination
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
@@ -66,5 +68,4 @@ class MarkAllNotificationsReadView(APIView):
 @permission_classes([permissions.IsAuthenticated])
 def unread_count(request):
     """Get unread notification count."""
-    count = Notification.objects.filter(user=request.user, is_read=False).count()
-    return Response({"unread_count": count})
+    return Response({"unread_count": Notification.unread_count(request.user)})
@@ -99,6 +99,11 @@ class Payment(models.Model):
         verbose_name = 'Payment'
         verbose_name_plural = 'Payments'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['payer', 'status'], name='payment_payer_status_idx'),
+            models.Index(fields=['payee', 'status'], name='payment_payee_status_idx'),
+            models.Index(fields=['status', 'paid_at'], name='payment_status_paid_idx'),
+        ]
     
     def __str__(self):
         return f"Payment #{self.id} - {self.amount} {self.currency}"
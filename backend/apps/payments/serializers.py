@@ -4,6 +4,9 @@ Payment serializers for API endpoints.
 
 from rest_framework import serializers
 from .models import Payment, PaymentMethod
+from apps.commissions.serializers import CommissionListSerializer
+from apps.core.fieldsets import DynamicFieldsMixin
+from apps.users.serializers import UserSerializer
 
 
 class PaymentMethodSerializer(serializers.ModelSerializer):
@@ -19,7 +22,7 @@ class PaymentMethodSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class PaymentSerializer(serializers.ModelSerializer):
+class PaymentSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer for Payment model."""
     
     payer_email = serializers.EmailField(source='payer.email', read_only=True)
@@ -34,6 +37,24 @@ class PaymentSerializer(serializers.ModelSerializer):
                   'notes', 'paid_at', 'created_at']
         read_only_fields = ['id', 'payer', 'payee', 'net_amount', 'transaction_id',
                            'paid_at', 'created_at']
+        select_related = {
+            'commission_title': ['commission'], 'payer_email': ['payer'], 'payee_email': ['payee'],
+        }
+        expandable_fields = {
+            'commission': {
+                'serializer': CommissionListSerializer,
+                'select_related': ['commission__client', 'commission__artist',
+                                   'commission__category'],
+            },
+            'payer': {
+                'serializer': UserSerializer,
+                'select_related': ['payer__profile'],
+            },
+            'payee': {
+                'serializer': UserSerializer,
+                'select_related': ['payee__profile'],
+            },
+        }
 
 
 class PaymentCreateSerializer(serializers.ModelSerializer):
@@ -78,7 +99,7 @@ class PaymentCreateSerializer(serializers.ModelSerializer):
         return payment
 
 
-class PaymentListSerializer(serializers.ModelSerializer):
+class PaymentListSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Lightweight serializer for payment listings."""
     
     commission_title = serializers.CharField(source='commission.title', read_only=True)
@@ -87,3 +108,4 @@ class PaymentListSerializer(serializers.ModelSerializer):
         model = Payment
         fields = ['id', 'commission_title', 'amount', 'currency', 
                   'type', 'status', 'created_at']
+        select_related = {'commission_title': ['commission']}
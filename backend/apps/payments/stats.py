@@ -0,0 +1,27 @@
+"""
+Payment statistics for a user.
+
+Spending and earnings come from one conditional-aggregate query over the
+payments the user made or received, instead of one query per figure.
+"""
+
+from django.db.models import Count, Q, Sum
+from .models import Payment
+
+
+def get_user_stats(user):
+    """Totals shown by the payment stats endpoint for `user`."""
+    made, received = Q(payer=user), Q(payee=user)
+    completed = Q(status=Payment.Status.COMPLETED)
+    totals = Payment.objects.filter(made | received).aggregate(
+        total_spent=Sum('amount', filter=made & completed),
+        total_earned=Sum('net_amount', filter=received & completed),
+        pending_payments=Count('id', filter=made & Q(status=Payment.Status.PENDING)),
+        completed_payments=Count('id', filter=made & completed),
+    )
+    return {
+        'total_spent': totals['total_spent'] or 0,
+        'total_earned': totals['total_earned'] or 0,
+        'pending_payments': totals['pending_payments'],
+        'completed_payments': totals['completed_payments'],
+    }
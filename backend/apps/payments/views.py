@@ -8,13 +8,19 @@ from rest_framework.views import APIView
 from rest_framework.decorators import api_view, permission_classes
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
+from django.db import transaction
 from django.db.models import Q, Sum
+from . import stats as stats_service
 from .models import Payment, PaymentMethod
 from .serializers import (
     PaymentSerializer, PaymentCreateSerializer, PaymentListSerializer,
     PaymentMethodSerializer
 )
+from apps.core.conditional import ConditionalGetMixin
+from apps.core.fieldsets import EagerLoadingMixin
+from apps.core.pagination import KeysetPagination
 from apps.users.permissions import IsAdminUser
+from apps.commissions.state_machine import transition, TransitionConflict
 
 
 class PaymentMethodListCreateView(generics.ListCreateAPIView):
@@ -48,10 +54,11 @@ class PaymentCreateView(generics.CreateAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
 
-class PaymentListView(generics.ListAPIView):
+class PaymentListView(EagerLoadingMixin, generics.ListAPIView):
     """List payments for current user."""
     
     serializer_class = PaymentListSerializer
+    pagination_class = KeysetPagination
     permission_classes = [permissions.IsAuthenticated]
     filterset_fields = ['status', 'type']
     ordering_fields = ['created_at', 'amount']
@@ -61,17 +68,27 @@ class PaymentListView(generics.ListAPIView):
         return Payment.objects.filter(Q(payer=user) | Q(payee=user))
 
 
-class PaymentDetailView(generics.RetrieveAPIView):
-    """Get payment details."""
+class PaymentDetailView(ConditionalGetMixin, EagerLoadingMixin, generics.RetrieveAPIView):
+    """Get payment details; conditional GETs are answered from one query."""
     
     serializer_class = PaymentSerializer
     permission_classes = [permissions.IsAuthenticated]
+    # Also covers the rows ?expand=commission|payer|payee embeds: the commission
+    # with the client, artist and category names it shows, and both users with
+    # their profiles.
+    validator_fields = (
+        'updated_at', 'commission__updated_at', 'commission__client__updated_at',
+        'commission__artist__updated_at', 'commission__category__name',
+        'payer__updated_at', 'payer__profile__updated_at',
+        'payee__updated_at', 'payee__profile__updated_at',
+    )
     
     def get_queryset(self):
         user = self.request.user
+        queryset = Payment.objects.all()
         if user.role == 'admin':
-            return Payment.objects.all()
-        return Payment.objects.filter(Q(payer=user) | Q(payee=user))
+            return queryset
+        return queryset.filter(Q(payer=user) | Q(payee=user))
 
 
 class PaymentProcessView(APIView):
@@ -80,34 +97,42 @@ class PaymentProcessView(APIView):
     permission_classes = [permissions.IsAuthenticated]
     
     def post(self, request, pk):
-        payment = get_object_or_404(Payment, pk=pk, payer=request.user)
+        payment = get_object_or_404(
+            Payment.objects.select_related('commission', 'payer', 'payee'),
+            pk=pk, payer=request.user
+        )
         
-        if payment.status != 'pending':
-            return Response(
-                {"error": "Payment is not in pending status"},
-                status=status.HTTP_400_BAD_REQUEST
+        with transaction.atomic():
+            # Simulate payment processing; the status guard makes it idempotent
+            now = timezone.now()
+            processed = Payment.objects.filter(pk=payment.pk, status='pending').update(
+                status='completed', paid_at=now, updated_at=now
             )
-        
-        # Simulate payment processing
-        payment.status = 'completed'
-        payment.paid_at = timezone.now()
-        payment.save()
-        
-        # Update commission status if needed
-        commission = payment.commission
-        if commission.status == 'accepted':
-            commission.status = 'in_progress'
-            commission.started_at = timezone.now()
-            commission.save()
+            if not processed:
+                return Response(
+                    {"error": "Payment is not in pending status"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            payment.status = 'completed'
+            payment.paid_at = payment.updated_at = now
+            
+            # Start work on the commission if it was waiting for payment
+            commission = payment.commission
+            if commission.status == 'accepted':
+                try:
+                    transition(commission, 'in_progress')
+                except TransitionConflict:
+                    pass  # Already moved on by the artist or client
         
         return Response(PaymentSerializer(payment).data)
 
 
-class PaymentAdminListView(generics.ListAPIView):
+class PaymentAdminListView(EagerLoadingMixin, generics.ListAPIView):
     """List all payments (admin only)."""
     
     queryset = Payment.objects.all()
     serializer_class = PaymentSerializer
+    pagination_class = KeysetPagination
     permission_classes = [permissions.IsAuthenticated, IsAdminUser]
     filterset_fields = ['status', 'type']
     search_fields = ['payer__email', 'payee__email', 'transaction_id']
@@ -118,21 +143,7 @@ class PaymentAdminListView(generics.ListAPIView):
 @permission_classes([permissions.IsAuthenticated])
 def payment_stats(request):
     """Get payment statistics for current user."""
-    user = request.user
-    
-    payments_made = Payment.objects.filter(payer=user)
-    payments_received = Payment.objects.filter(payee=user)
-    
-    stats = {
-        'total_spent': payments_made.filter(status='completed').aggregate(
-            total=Sum('amount'))['total'] or 0,
-        'total_earned': payments_received.filter(status='completed').aggregate(
-            total=Sum('net_amount'))['total'] or 0,
-        'pending_payments': payments_made.filter(status='pending').count(),
-        'completed_payments': payments_made.filter(status='completed').count(),
-    }
-    
-    return Response(stats)
+    return Response(stats_service.get_user_stats(request.user))
 
 
 @api_view(['GET'])
@@ -0,0 +1,42 @@
+"""
+Dashboard bootstrap payload.
+
+The user dashboard's first paint needs the profile, commission and payment
+stats, the unread notification count and the first page of commissions.
+`build_payload()` gathers them in one request from the already authenticated
+user (and its cached artist profile), each part shaped exactly like the
+response of its own endpoint, which clients keep using to refresh a part.
+"""
+
+from django.urls import reverse
+from .serializers import UserSerializer
+
+
+def first_commission_page(request):
+    """The commission list endpoint's first page, with links back to that endpoint."""
+    from apps.commissions.serializers import CommissionListSerializer
+    from apps.commissions.views import user_commissions
+    from apps.core.pagination import KeysetPagination
+    
+    paginator = KeysetPagination()
+    queryset = CommissionListSerializer.eager_load(user_commissions(request.user), request)
+    page = paginator.paginate_queryset(queryset, request)
+    paginator.base_url = request.build_absolute_uri(reverse('commission-list'))
+    data = CommissionListSerializer(page, many=True, context={'request': request}).data
+    return paginator.get_paginated_response(data).data
+
+
+def build_payload(request):
+    """The dashboard bootstrap response for the requesting user."""
+    from apps.commissions import stats as commission_stats
+    from apps.notifications.models import Notification
+    from apps.payments import stats as payment_stats
+    
+    user = request.user
+    return {
+        'profile': UserSerializer(user, context={'request': request}).data,
+        'commission_stats': commission_stats.stats_payload(commission_stats.get_user_stats(user)),
+        'payment_stats': payment_stats.get_user_stats(user),
+        'unread_notifications': Notification.unread_count(user),
+        'commissions': first_commission_page(request),
+    }
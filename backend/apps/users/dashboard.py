@@ -0,0 +1,118 @@
+"""
+Admin dashboard metrics engine.
+
+Metrics are computed with one conditional-aggregate query per table and kept
+as a cached snapshot. A short-lived "fresh" marker sits next to the snapshot:
+once it expires (or is invalidated by a write) the next reader still gets the
+previous snapshot immediately while a background thread recomputes it, so
+dashboard latency does not depend on table size.
+"""
+
+import logging
+import threading
+from datetime import timedelta
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_KEY = 'dashboard:metrics:snapshot'
+FRESH_KEY = 'dashboard:metrics:fresh'
+REFRESH_LOCK_KEY = 'dashboard:metrics:refreshing'
+
+
+def _snapshot_ttl():
+    return getattr(settings, 'DASHBOARD_METRICS_TTL', 300)
+
+
+def _refresh_after():
+    return getattr(settings, 'DASHBOARD_METRICS_REFRESH_AFTER', 30)
+
+
+def compute_metrics():
+    """Compute all dashboard metrics with one aggregate query per table."""
+    from apps.artists.models import Artist
+    from apps.commissions.models import Commission
+    
+    User = get_user_model()
+    thirty_days_ago = timezone.now() - timedelta(days=30)
+    delivered = Q(status=Commission.Status.DELIVERED)
+    
+    users = User.objects.aggregate(
+        total_clients=Count('id', filter=Q(role=User.Role.CLIENT)),
+        new_clients_monthly=Count(
+            'id', filter=Q(role=User.Role.CLIENT, created_at__gte=thirty_days_ago)
+        ),
+    )
+    artists = Artist.objects.aggregate(total_artists=Count('id'))
+    commissions = Commission.objects.aggregate(
+        total_commissions=Count('id'),
+        pending_commissions=Count('id', filter=Q(status=Commission.Status.PENDING)),
+        active_commissions=Count('id', filter=Q(status=Commission.Status.IN_PROGRESS)),
+        completed_commissions=Count('id', filter=Q(status=Commission.Status.COMPLETED)),
+        delivered_commissions=Count('id', filter=delivered),
+        # Calculate revenue from delivered commissions
+        total_revenue=Sum('final_price', filter=delivered),
+        monthly_revenue=Sum(
+            'final_price', filter=delivered & Q(updated_at__gte=thirty_days_ago)
+        ),
+    )
+    
+    return {
+        'total_clients': users['total_clients'],
+        'total_artists': artists['total_artists'],
+        'total_commissions': commissions['total_commissions'],
+        'pending_commissions': commissions['pending_commissions'],
+        'active_commissions': commissions['active_commissions'],
+        'completed_commissions': commissions['completed_commissions'],
+        'delivered_commissions': commissions['delivered_commissions'],
+        'total_revenue': float(commissions['total_revenue'] or 0),
+        'monthly_revenue': float(commissions['monthly_revenue'] or 0),
+        'new_clients_monthly': users['new_clients_monthly'],
+    }
+
+
+def refresh_metrics():
+    """Recompute the snapshot and mark it fresh."""
+    metrics = compute_metrics()
+    cache.set(SNAPSHOT_KEY, metrics, _snapshot_ttl())
+    cache.set(FRESH_KEY, True, _refresh_after())
+    return metrics
+
+
+def _background_refresh():
+    try:
+        refresh_metrics()
+    except Exception:
+        logger.exception('Dashboard metrics refresh failed')
+    finally:
+        cache.delete(REFRESH_LOCK_KEY)
+        connection.close()
+
+
+def _schedule_refresh():
+    # cache.add is atomic, so only one worker recomputes a stale snapshot.
+    if cache.add(REFRESH_LOCK_KEY, True, timeout=_refresh_after()):
+        threading.Thread(target=_background_refresh, daemon=True).start()
+
+
+def get_metrics():
+    """Return the dashboard metrics, serving a stale snapshot while it refreshes."""
+    cached = cache.get_many([SNAPSHOT_KEY, FRESH_KEY])
+    metrics = cached.get(SNAPSHOT_KEY)
+    if metrics is None:
+        return refresh_metrics()
+    if not cached.get(FRESH_KEY):
+        if not getattr(settings, 'DASHBOARD_METRICS_BACKGROUND_REFRESH', True):
+            return refresh_metrics()
+        _schedule_refresh()
+    return metrics
+
+
+def invalidate_metrics(**kwargs):
+    """Mark the snapshot stale; usable directly as a signal receiver."""
+    cache.delete(FRESH_KEY)
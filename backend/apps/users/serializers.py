@@ -4,6 +4,8 @@ User serializers for API endpoints.
 
 from rest_framework import serializers
 from django.contrib.auth.password_validation import validate_password
+from apps.core.fieldsets import DynamicFieldsMixin
+from apps.media.serializers import ValidatedImageField
 from .models import User, UserProfile
 
 
@@ -16,7 +18,7 @@ class UserProfileSerializer(serializers.ModelSerializer):
                   'address', 'city', 'country', 'timezone']
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer for User model."""
     
     profile = UserProfileSerializer(read_only=True)
@@ -27,6 +29,7 @@ class UserSerializer(serializers.ModelSerializer):
                   'role', 'phone', 'avatar', 'is_verified', 'profile',
                   'created_at', 'updated_at']
         read_only_fields = ['id', 'is_verified', 'created_at', 'updated_at']
+        select_related = {'profile': ['profile']}
 
 
 class UserRegistrationSerializer(serializers.ModelSerializer):
@@ -69,6 +72,7 @@ class UserUpdateSerializer(serializers.ModelSerializer):
     """Serializer for updating user information."""
     
     profile = UserProfileSerializer()
+    avatar = ValidatedImageField(required=False, allow_null=True)
     
     class Meta:
         model = User
@@ -1,9 +1,11 @@
 """
-User signals for automatic profile creation.
+User signals for automatic profile creation and dashboard invalidation.
 """
 
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
+from .dashboard import invalidate_metrics
 from .models import User, UserProfile
 
 
@@ -19,3 +21,14 @@ def save_user_profile(sender, instance, **kwargs):
     """Save the UserProfile when the User is saved."""
     if hasattr(instance, 'profile'):
         instance.profile.save()
+
+
+def metrics_changed(**kwargs):
+    # A refresh before the commit would snapshot the old counts again.
+    transaction.on_commit(invalidate_metrics)
+
+
+# Admin dashboard metrics go stale whenever users, artists or commissions change
+for sender in (User, 'artists.Artist', 'commissions.Commission'):
+    post_save.connect(metrics_changed, sender=sender, dispatch_uid=f'dashboard-save-{sender}')
+    post_delete.connect(metrics_changed, sender=sender, dispatch_uid=f'dashboard-delete-{sender}')
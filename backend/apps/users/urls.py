@@ -12,4 +12,5 @@ urlpatterns = [
     path('', views.UserListView.as_view(), name='user-list'),
     path('<int:pk>/', views.UserDetailView.as_view(), name='user-detail'),
     path('dashboard/stats/', views.dashboard_stats, name='dashboard-stats'),
+    path('dashboard/bootstrap/', views.dashboard_bootstrap, name='dashboard-bootstrap'),
 ]
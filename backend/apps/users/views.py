@@ -11,7 +11,12 @@ from .serializers import (
     UserSerializer, UserRegistrationSerializer, 
     UserUpdateSerializer, PasswordChangeSerializer
 )
+from .models import UserProfile
 from .permissions import IsAdminUser, IsOwnerOrAdmin
+from .bootstrap import build_payload
+from .dashboard import get_metrics
+from apps.core.conditional import ConditionalGetMixin
+from apps.core.fieldsets import EagerLoadingMixin
 
 User = get_user_model()
 
@@ -24,7 +29,7 @@ class UserRegistrationView(generics.CreateAPIView):
     permission_classes = [permissions.AllowAny]
 
 
-class UserProfileView(generics.RetrieveUpdateAPIView):
+class UserProfileView(ConditionalGetMixin, generics.RetrieveUpdateAPIView):
     """Get and update current user's profile."""
     
     serializer_class = UserSerializer
@@ -33,13 +38,21 @@ class UserProfileView(generics.RetrieveUpdateAPIView):
     def get_object(self):
         return self.request.user
     
+    def get_validator_values(self):
+        # The user row was already loaded by authentication.
+        user = self.request.user
+        profile_updated_at = UserProfile.objects.filter(user=user).values_list(
+            'updated_at', flat=True
+        ).first()
+        return user.updated_at, profile_updated_at
+    
     def get_serializer_class(self):
         if self.request.method in ['PUT', 'PATCH']:
             return UserUpdateSerializer
         return UserSerializer
 
 
-class UserListView(generics.ListAPIView):
+class UserListView(EagerLoadingMixin, generics.ListAPIView):
     """List all users (admin only)."""
     
     queryset = User.objects.all()
@@ -50,7 +63,7 @@ class UserListView(generics.ListAPIView):
     ordering_fields = ['created_at', 'email']
 
 
-class UserDetailView(generics.RetrieveUpdateDestroyAPIView):
+class UserDetailView(EagerLoadingMixin, generics.RetrieveUpdateDestroyAPIView):
     """Get, update, or delete a specific user (admin only)."""
     
     queryset = User.objects.all()
@@ -81,34 +94,11 @@ class PasswordChangeView(APIView):
 @permission_classes([permissions.IsAuthenticated, IsAdminUser])
 def dashboard_stats(request):
     """Get dashboard statistics for admin."""
-    from apps.commissions.models import Commission
-    from apps.artists.models import Artist
-    from apps.payments.models import Payment
-    from django.db.models import Sum, Count
-    from django.utils import timezone
-    from datetime import timedelta
-    
-    thirty_days_ago = timezone.now() - timedelta(days=30)
-    
-    # Calculate revenue from delivered commissions
-    delivered_commissions = Commission.objects.filter(status='delivered')
-    total_revenue = delivered_commissions.aggregate(total=Sum('final_price'))['total'] or 0
-    monthly_revenue = delivered_commissions.filter(
-        updated_at__gte=thirty_days_ago
-    ).aggregate(total=Sum('final_price'))['total'] or 0
-    
-    stats = {
-        'total_clients': User.objects.filter(role='client').count(),
-        'total_artists': Artist.objects.count(),
-        'total_commissions': Commission.objects.count(),
-        'pending_commissions': Commission.objects.filter(status='pending').count(),
-        'active_commissions': Commission.objects.filter(status='in_progress').count(),
-        'completed_commissions': Commission.objects.filter(status='completed').count(),
-        'delivered_commissions': delivered_commissions.count(),
-        'total_revenue': float(total_revenue),
-        'monthly_revenue': float(monthly_revenue),
-        'new_clients_monthly': User.objects.filter(role='client', created_at__gte=thirty_days_ago).count(),
-    }
-    
-    return Response(stats)
+    return Response(get_metrics())
+
 
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def dashboard_bootstrap(request):
+    """Everything the user dashboard shows on first load, in one response."""
+    return Response(build_payload(request))
@@ -3,6 +3,7 @@ Django settings for Artist Commission Dashboard.
 """
 
 import os
+import tempfile
 from pathlib import Path
 from datetime import timedelta
 from dotenv import load_dotenv
@@ -37,6 +38,7 @@ INSTALLED_APPS = [
     'apps.commissions',
     'apps.payments',
     'apps.notifications',
+    'apps.media',
 ]
 
 MIDDLEWARE = [
@@ -111,7 +113,7 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 20,
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
-        'rest_framework.filters.SearchFilter',
+        'apps.core.search.FullTextSearchFilter',
         'rest_framework.filters.OrderingFilter',
     ],
 }
@@ -146,6 +148,86 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+STORAGES = {
+    'default': {'BACKEND': 'apps.media.storage.ContentAddressedStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+
+# Uploads are hashed while they are received (apps.media.uploadhandlers)
+FILE_UPLOAD_HANDLERS = [
+    'apps.media.uploadhandlers.HashingMemoryFileUploadHandler',
+    'apps.media.uploadhandlers.HashingTemporaryFileUploadHandler',
+]
+
+# Chunked artwork uploads (apps.commissions.uploads); nginx's
+# client_max_body_size must allow a whole chunk
+ARTWORK_UPLOAD_CHUNK_SIZE = int(os.getenv('ARTWORK_UPLOAD_CHUNK_SIZE', str(8 * 1024 * 1024)))
+ARTWORK_UPLOAD_MAX_SIZE = int(os.getenv('ARTWORK_UPLOAD_MAX_SIZE', str(500 * 1024 * 1024)))
+
+# Newest revisions embedded in a commission's detail payload; the rest are
+# paged from /api/commissions/<id>/revisions/ (apps.commissions.revisions)
+COMMISSION_RECENT_REVISIONS = int(os.getenv('COMMISSION_RECENT_REVISIONS', '5'))
+
+# Media delivery (apps.media.views): when set, Django only authorizes and
+# nginx sends the file from this internal location via X-Accel-Redirect
+MEDIA_ACCEL_REDIRECT_PREFIX = os.getenv('MEDIA_ACCEL_REDIRECT_PREFIX', '')
+# Files under these prefixes (and their derivatives) need signed URLs
+MEDIA_PRIVATE_PREFIXES = ['commissions/']
+MEDIA_URL_TTL = int(os.getenv('MEDIA_URL_TTL', '21600'))
+
+# Uploaded images above this many pixels are rejected before decoding
+# (apps.media.validation)
+IMAGE_MAX_PIXELS = int(os.getenv('IMAGE_MAX_PIXELS', str(80_000_000)))
+
+# Image derivatives (apps.media): variant name -> longest edge in px and format
+IMAGE_VARIANTS = {
+    'thumb': {'size': 320, 'format': 'JPEG'},
+    'thumb_webp': {'size': 320, 'format': 'WEBP'},
+    'medium': {'size': 1280, 'format': 'JPEG'},
+    'medium_webp': {'size': 1280, 'format': 'WEBP'},
+}
+MEDIA_DERIVATIVE_WORKERS = int(os.getenv('MEDIA_DERIVATIVE_WORKERS', '2'))
+MEDIA_DERIVATIVES_ASYNC = os.getenv('MEDIA_DERIVATIVES_ASYNC', 'True').lower() == 'true'
+
+# Default limit on an artist's open commissions before they stop accepting
+# new ones (apps.artists.capacity); 0 for no limit
+ARTIST_MAX_QUEUE_DEPTH = int(os.getenv('ARTIST_MAX_QUEUE_DEPTH', '20')) or None
+
+# Upper bound (seconds) on how long cached artist tag facet counts are served;
+# artist changes invalidate them sooner (apps.artists.tags)
+ARTIST_TAG_FACETS_TTL = int(os.getenv('ARTIST_TAG_FACETS_TTL', '3600'))
+
+# Deadline reminders (apps.commissions.deadlines): days ahead to warn artists
+DEADLINE_REMINDER_DAYS = int(os.getenv('DEADLINE_REMINDER_DAYS', '2'))
+
+# Full-text search backend; defaults to MySQL FULLTEXT, or substring matching
+# on other databases. apps.core.search.InvertedIndexBackend is per process and
+# only suitable for single-process development servers and tests.
+SEARCH_BACKEND = os.getenv('SEARCH_BACKEND') or None
+
+# Shared cache for the dashboard snapshot, tag facets and public API responses.
+# The file-based default is shared by all workers in the container and never
+# touches MySQL; point CACHE_BACKEND/CACHE_LOCATION at Redis or memcached when
+# running several containers.
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'django.core.cache.backends.filebased.FileBasedCache')
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKEND,
+        'LOCATION': os.getenv('CACHE_LOCATION', os.path.join(tempfile.gettempdir(), 'commission_cache')),
+    }
+}
+if CACHE_BACKEND.endswith(('FileBasedCache', 'LocMemCache')):
+    CACHES['default']['OPTIONS'] = {'MAX_ENTRIES': int(os.getenv('CACHE_MAX_ENTRIES', '10000'))}
+
+# Lifetime (seconds) of cached public API responses (apps.core.caching);
+# writes invalidate them sooner
+API_RESPONSE_CACHE_TTL = int(os.getenv('API_RESPONSE_CACHE_TTL', '300'))
+
+# Admin dashboard metrics snapshot (seconds)
+DASHBOARD_METRICS_TTL = int(os.getenv('DASHBOARD_METRICS_TTL', '300'))
+DASHBOARD_METRICS_REFRESH_AFTER = int(os.getenv('DASHBOARD_METRICS_REFRESH_AFTER', '30'))
+DASHBOARD_METRICS_BACKGROUND_REFRESH = os.getenv('DASHBOARD_METRICS_BACKGROUND_REFRESH', 'True').lower() == 'true'
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -6,8 +6,8 @@ from django.contrib import admin
 from django.urls import path, include, re_path
 from django.conf import settings
 from django.conf.urls.static import static
-from django.views.static import serve
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+from apps.media.views import serve_media
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -26,8 +26,8 @@ urlpatterns = [
     # Prometheus metrics
     path('', include('django_prometheus.urls')),
     
-    # Serve media files (works with gunicorn in production)
-    re_path(r'^media/(?P<path>.*)$', serve, {'document_root': settings.MEDIA_ROOT}),
+    # Media files: authorized here, sent by nginx via X-Accel-Redirect in production
+    re_path(r'^media/(?P<path>.*)$', serve_media, name='media'),
 ]
 
 if settings.DEBUG:
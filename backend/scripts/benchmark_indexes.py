@@ -0,0 +1,204 @@
+#!/usr/bin/env python
+"""
+Benchmark the hot-filter indexes added in the 0002_hot_filter_indexes migrations.
+
+Generates a synthetic dataset, then records the query plan and timings of
+the filters the API actually runs, first with those indexes dropped and
+then with them re-created. Only the indexes under test are touched; every
+other migration stays applied.
+
+WARNING: this drops and re-creates indexes and inserts a lot of rows.
+Point it at a scratch database, never at production.
+
+Run with: python scripts/benchmark_indexes.py --commissions 200000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+from django.db import connection, transaction  # noqa: E402
+from django.db.models import Q  # noqa: E402
+from apps.users.models import User  # noqa: E402
+from apps.artists.models import Artist  # noqa: E402
+from apps.commissions.models import Commission  # noqa: E402
+from apps.payments.models import Payment  # noqa: E402
+from apps.notifications.models import Notification  # noqa: E402
+
+# Model -> names of its Meta.indexes entries added by 0002_hot_filter_indexes
+INDEXES_UNDER_TEST = {
+    Artist: ['artist_status_rating_idx'],
+    Commission: [
+        'commission_artist_status_idx', 'commission_client_status_idx',
+        'commission_client_created_idx', 'commission_status_created_idx',
+    ],
+    Payment: ['payment_payer_status_idx', 'payment_payee_status_idx', 'payment_status_paid_idx'],
+    Notification: ['notification_user_read_idx', 'notification_user_created_idx'],
+}
+
+STATUSES = Commission.Status.values
+
+
+def generate(commissions, users, artists, batch_size=5000):
+    """Bulk insert a synthetic dataset tagged with a 'bench-' prefix."""
+    print(f'Generating {users} clients, {artists} artists, {commissions} commissions...')
+    with transaction.atomic():
+        clients = User.objects.bulk_create([
+            User(username=f'bench-client-{i}', email=f'bench-client-{i}@example.com')
+            for i in range(users)
+        ], batch_size=batch_size)
+        artist_users = User.objects.bulk_create([
+            User(username=f'bench-artist-{i}', email=f'bench-artist-{i}@example.com', role='artist')
+            for i in range(artists)
+        ], batch_size=batch_size)
+        artist_rows = Artist.objects.bulk_create([
+            Artist(
+                user=user, display_name=user.username, specialty='Benchmark',
+                status=random.choice(Artist.Status.values),
+                rating=round(random.uniform(0, 5), 2),
+            )
+            for user in artist_users
+        ], batch_size=batch_size)
+
+    for start in range(0, commissions, batch_size):
+        with transaction.atomic():
+            rows = Commission.objects.bulk_create([
+                Commission(
+                    client=random.choice(clients), artist=random.choice(artist_rows),
+                    title=f'bench-{start + i}', description='Benchmark commission',
+                    status=random.choice(STATUSES), final_price=random.randint(10, 500),
+                )
+                for i in range(min(batch_size, commissions - start))
+            ])
+            Payment.objects.bulk_create([
+                Payment(
+                    commission=row, payer=row.client, payee=row.artist.user,
+                    amount=row.final_price, net_amount=row.final_price,
+                    status=random.choice(Payment.Status.values),
+                )
+                for row in rows
+            ])
+            Notification.objects.bulk_create([
+                Notification(
+                    user=row.client, type=Notification.Type.SYSTEM, title=row.title,
+                    message='Benchmark', is_read=random.random() < 0.7,
+                )
+                for row in rows
+            ])
+
+
+# name -> (queryset factory taking (client, artist), how the endpoint evaluates it)
+HOT_QUERIES = {
+    'artist commissions by status': (lambda c, a: Commission.objects.filter(
+        artist=a, status='pending').order_by('-created_at')[:20], list),
+    'client commissions by status': (lambda c, a: Commission.objects.filter(
+        client=c, status='delivered'), len),
+    'client commission feed': (lambda c, a: Commission.objects.filter(
+        client=c).order_by('-created_at', '-id')[:20], list),
+    'payments made by status': (lambda c, a: Payment.objects.filter(
+        payer=c, status='completed'), len),
+    'payments received by status': (lambda c, a: Payment.objects.filter(
+        payee=a.user, status='completed'), len),
+    'payment feed': (lambda c, a: Payment.objects.filter(
+        Q(payer=c) | Q(payee=c)).order_by('-created_at')[:20], list),
+    'unread notifications': (lambda c, a: Notification.objects.filter(
+        user=c, is_read=False), len),
+    'notification feed': (lambda c, a: Notification.objects.filter(
+        user=c).order_by('-created_at')[:20], list),
+    'approved artists by rating': (lambda c, a: Artist.objects.filter(
+        status='approved').order_by('-rating')[:20], list),
+}
+
+
+def evaluate(queryset, how):
+    # Counting endpoints issue COUNT(*), feeds fetch the page.
+    return queryset.count() if how is len else list(queryset)
+
+
+def measure(label, repeat):
+    print(f'\n=== {label} ===')
+    client = User.objects.filter(username__startswith='bench-client-').order_by('pk').first()
+    artist = Artist.objects.filter(user__username__startswith='bench-artist-').order_by('pk').first()
+    results = {}
+    for name, (factory, how) in HOT_QUERIES.items():
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            evaluate(factory(client, artist), how)
+            timings.append((time.perf_counter() - started) * 1000)
+        results[name] = statistics.median(timings)
+        print(f'{name:32s} median {results[name]:9.2f} ms')
+        for line in factory(client, artist).explain().splitlines():
+            print(f'    {line}')
+    return results
+
+
+def indexes_under_test():
+    """(model, Index) pairs for INDEXES_UNDER_TEST, as currently declared in Meta.indexes."""
+    pairs = []
+    for model, names in INDEXES_UNDER_TEST.items():
+        declared = {index.name: index for index in model._meta.indexes}
+        missing = set(names) - set(declared)
+        if missing:
+            raise SystemExit(f'{model.__name__} no longer declares {sorted(missing)}')
+        pairs.extend((model, declared[name]) for name in names)
+    return pairs
+
+
+def set_indexes(enabled):
+    """Create or drop only the indexes under test, skipping those already in that state."""
+    with connection.cursor() as cursor:
+        existing = {
+            model: set(connection.introspection.get_constraints(cursor, model._meta.db_table))
+            for model in INDEXES_UNDER_TEST
+        }
+    with connection.schema_editor() as editor:
+        for model, index in indexes_under_test():
+            if enabled and index.name not in existing[model]:
+                editor.add_index(model, index)
+            elif not enabled and index.name in existing[model]:
+                editor.remove_index(model, index)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--commissions', type=int, default=100000)
+    parser.add_argument('--users', type=int, default=5000)
+    parser.add_argument('--artists', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--skip-generate', action='store_true',
+                        help='Reuse a dataset created by a previous run')
+    args = parser.parse_args()
+
+    call_command('migrate', verbosity=0)
+    if not args.skip_generate:
+        generate(args.commissions, args.users, args.artists)
+
+    print(f'Database vendor: {connection.vendor}')
+    try:
+        set_indexes(False)
+        before = measure('without hot filter indexes', args.repeat)
+    finally:
+        # Never leave the schema without its indexes, even if measuring failed.
+        set_indexes(True)
+    after = measure('with hot filter indexes', args.repeat)
+
+    print('\n=== summary (median ms) ===')
+    for name in before:
+        speedup = before[name] / after[name] if after[name] else float('inf')
+        print(f'{name:32s} {before[name]:9.2f} -> {after[name]:9.2f}  ({speedup:5.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,12 @@
+"""
+Shared fixtures.
+"""
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Start every test with an empty cache, so cached responses never leak between tests."""
+    from django.core.cache import cache
+    cache.clear()
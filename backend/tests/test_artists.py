@@ -0,0 +1,425 @@
+"""
+Tests for artists app.
+"""
+
+import pytest
+from io import StringIO
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from apps.users.models import User
+from apps.artists.models import Artist
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def create_artist():
+    def _create_artist(username, status='approved', **fields):
+        user = User.objects.create_user(
+            username=username,
+            email=f'{username}@example.com',
+            password='testpass123',
+            role='artist'
+        )
+        fields.setdefault('display_name', username.title())
+        fields.setdefault('specialty', 'Digital Art')
+        return Artist.objects.create(user=user, status=status, **fields)
+    return _create_artist
+
+
+@pytest.mark.django_db
+class TestArtistSearch:
+    @pytest.fixture(autouse=True, params=[None, 'apps.core.search.InvertedIndexBackend'])
+    def _search_backend(self, request, settings):
+        # The vendor default, then the in-process index, which is opt-in.
+        from apps.core import search
+        settings.SEARCH_BACKEND = request.param
+        search._backends.clear()
+        yield
+        backend = search.get_search_backend()
+        if hasattr(backend, 'reset'):
+            backend.reset()
+        search._backends.clear()
+    
+    def test_search_matches_specialty_and_description(self, api_client, create_artist):
+        painter = create_artist('painter', specialty='Watercolor', description='Soft landscapes')
+        create_artist('sculptor', specialty='Clay')
+        response = api_client.get(reverse('artist-list'), {'search': 'watercolour landscapes'})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['results'] == []
+        response = api_client.get(reverse('artist-list'), {'search': 'watercolor landscapes'})
+        assert [row['id'] for row in response.data['results']] == [painter.id]
+    
+    def test_search_excludes_unapproved_artists(self, api_client, create_artist):
+        create_artist('pending', status='pending', specialty='Watercolor')
+        response = api_client.get(reverse('artist-list'), {'search': 'watercolor'})
+        assert response.data['results'] == []
+
+
+@pytest.mark.django_db
+class TestReconcileArtistRatings:
+    def test_reconcile_recomputes_from_reviews(self, create_artist):
+        from django.core.management import call_command
+        from django.core.management.base import CommandError
+        from apps.commissions.models import Commission
+        artist = create_artist('rated')
+        unrated = create_artist('unrated', rating_sum=7, total_reviews=2, rating='3.50')
+        client = User.objects.create_user(username='reviewer', email='reviewer@example.com')
+        Commission.objects.bulk_create([
+            Commission(client=client, artist=artist, title=f'C{i}', description='x',
+                       status='delivered', client_rating=rating)
+            for i, rating in enumerate([5, 4, 3, 5])
+        ] + [Commission(client=client, artist=artist, title='Unrated', description='x')])
+        
+        with pytest.raises(CommandError):
+            call_command('reconcile_artist_ratings', '--check', stdout=StringIO())
+        call_command('reconcile_artist_ratings', '--batch-size', '1', stdout=StringIO())
+        call_command('reconcile_artist_ratings', '--check', stdout=StringIO())
+        
+        artist.refresh_from_db()
+        unrated.refresh_from_db()
+        assert (artist.rating_sum, artist.total_reviews, str(artist.rating)) == (17, 4, '4.25')
+        assert (unrated.rating_sum, unrated.total_reviews, str(unrated.rating)) == (0, 0, '0.00')
+
+
+@pytest.mark.django_db
+class TestArtistCounters:
+    def test_coalesce_flushes_one_update_per_artist(self, create_artist, django_assert_num_queries):
+        from apps.artists import counters
+        first = create_artist('first')
+        second = create_artist('second')
+        with django_assert_num_queries(2):
+            with counters.coalesce():
+                for _ in range(50):
+                    counters.record_completions(first.pk)
+                counters.record_completions(second.pk, count=3)
+        assert counters.refresh(first).total_commissions == 50
+        assert counters.refresh(second).total_commissions == 3
+    
+    def test_coalesce_discards_increments_on_error(self, create_artist):
+        from apps.artists import counters
+        artist = create_artist('failing')
+        with pytest.raises(RuntimeError):
+            with counters.coalesce():
+                counters.record_completions(artist.pk)
+                raise RuntimeError
+        assert counters.refresh(artist).total_commissions == 0
+    
+    def test_unknown_counter_is_rejected(self, create_artist):
+        from apps.artists import counters
+        with pytest.raises(ValueError):
+            counters.increment(create_artist('typo').pk, total_comissions=1)
+    
+    def test_profile_update_keeps_counters(self, create_artist):
+        from apps.artists import counters
+        from apps.artists.serializers import ArtistSerializer
+        artist = create_artist('editor')
+        stale = Artist.objects.get(pk=artist.pk)
+        counters.record_completions(artist.pk, count=4)
+        serializer = ArtistSerializer(stale, data={'specialty': 'Ink'}, partial=True)
+        assert serializer.is_valid()
+        serializer.save()
+        artist.refresh_from_db()
+        assert (artist.specialty, artist.total_commissions) == ('Ink', 4)
+
+
+
+@pytest.mark.django_db
+class TestArtistCapacity:
+    @pytest.fixture
+    def client_user(self):
+        return User.objects.create_user(
+            username='patron', email='patron@example.com', password='testpass123'
+        )
+    
+    def _request(self, api_client, artist, title='Job'):
+        return api_client.post(reverse('commission-create'), {
+            'artist_id': artist.pk, 'title': title, 'description': 'x',
+        })
+    
+    def test_full_queue_stops_accepting_until_work_is_finished(
+        self, api_client, client_user, create_artist
+    ):
+        from apps.commissions.models import Commission
+        from apps.commissions.state_machine import transition
+        artist = create_artist('popular', max_queue_depth=2)
+        api_client.force_authenticate(user=client_user)
+        
+        assert self._request(api_client, artist, 'One').status_code == status.HTTP_201_CREATED
+        artist.refresh_from_db()
+        assert (artist.open_commissions, artist.is_accepting_commissions) == (1, True)
+        assert self._request(api_client, artist, 'Two').status_code == status.HTTP_201_CREATED
+        artist.refresh_from_db()
+        assert (artist.open_commissions, artist.is_accepting_commissions) == (2, False)
+        
+        response = self._request(api_client, artist, 'Three')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'artist_id' in response.data
+        assert Commission.objects.filter(artist=artist).count() == 2
+        
+        transition(Commission.objects.get(title='One'), 'rejected')
+        artist.refresh_from_db()
+        assert (artist.open_commissions, artist.is_accepting_commissions) == (1, True)
+        assert self._request(api_client, artist, 'Three').status_code == status.HTTP_201_CREATED
+    
+    def test_moving_within_the_queue_keeps_the_count(self, client_user, create_artist):
+        from apps.commissions.models import Commission
+        from apps.commissions.state_machine import transition
+        artist = create_artist('steady', open_commissions=1)
+        commission = Commission.objects.create(
+            client=client_user, artist=artist, title='Job', description='x'
+        )
+        transition(commission, 'accepted')
+        transition(commission, 'in_progress')
+        artist.refresh_from_db()
+        assert artist.open_commissions == 1
+        transition(commission, 'completed')
+        artist.refresh_from_db()
+        assert (artist.open_commissions, artist.total_commissions) == (0, 1)
+    
+    def test_deleting_an_open_commission_frees_its_slot(
+        self, api_client, client_user, create_artist
+    ):
+        from apps.commissions.models import Commission
+        artist = create_artist('freed', max_queue_depth=1)
+        api_client.force_authenticate(user=client_user)
+        assert self._request(api_client, artist, 'One').status_code == status.HTTP_201_CREATED
+        artist.refresh_from_db()
+        assert artist.is_accepting_commissions is False
+        
+        Commission.objects.get(title='One').delete()
+        artist.refresh_from_db()
+        assert (artist.open_commissions, artist.is_accepting_commissions) == (0, True)
+        assert self._request(api_client, artist, 'Two').status_code == status.HTTP_201_CREATED
+    
+    def test_switch_and_limit_are_respected(self, api_client, client_user, create_artist):
+        from apps.artists.serializers import ArtistOwnerSerializer
+        artist = create_artist('away', open_commissions=3)
+        serializer = ArtistOwnerSerializer(artist, data={'accepting_enabled': False}, partial=True)
+        assert serializer.is_valid()
+        assert serializer.save().is_accepting_commissions is False
+        
+        api_client.force_authenticate(user=client_user)
+        assert self._request(api_client, artist).status_code == status.HTTP_400_BAD_REQUEST
+        
+        serializer = ArtistOwnerSerializer(
+            artist, data={'accepting_enabled': True, 'max_queue_depth': 3}, partial=True
+        )
+        assert serializer.is_valid()
+        assert serializer.save().is_accepting_commissions is False
+        serializer = ArtistOwnerSerializer(artist, data={'max_queue_depth': 4}, partial=True)
+        assert serializer.is_valid()
+        assert serializer.save().is_accepting_commissions is True
+    
+    def test_queue_settings_are_private(self, api_client, create_artist):
+        artist = create_artist('private', open_commissions=2, max_queue_depth=5)
+        private = {'accepting_enabled', 'open_commissions', 'max_queue_depth'}
+        public = api_client.get(reverse('artist-detail', args=[artist.pk])).data
+        assert public['is_accepting_commissions'] is True
+        assert not private & set(public)
+        
+        api_client.force_authenticate(user=artist.user)
+        own = api_client.get(reverse('artist-me')).data
+        assert (own['open_commissions'], own['max_queue_depth']) == (2, 5)
+        response = api_client.patch(reverse('artist-me'), {'open_commissions': 0})
+        assert response.data['open_commissions'] == 2
+    
+    def test_legacy_accepting_write_toggles_the_switch(self, api_client, create_artist):
+        artist = create_artist('legacy', open_commissions=1)
+        api_client.force_authenticate(user=artist.user)
+        response = api_client.patch(reverse('artist-me'), {'is_accepting_commissions': False})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['accepting_enabled'] is False
+        assert response.data['is_accepting_commissions'] is False
+        
+        response = api_client.patch(
+            reverse('artist-me'), {'is_accepting_commissions': True}, format='json'
+        )
+        assert response.data['is_accepting_commissions'] is True
+    
+    def test_default_limit_applies_without_an_artist_limit(self, settings, create_artist):
+        from apps.artists import counters
+        settings.ARTIST_MAX_QUEUE_DEPTH = 1
+        artist = create_artist('default')
+        assert counters.reserve_slot(artist.pk)
+        assert not counters.reserve_slot(artist.pk)
+        settings.ARTIST_MAX_QUEUE_DEPTH = None
+        counters.refresh_accepting(artist.pk)
+        assert counters.reserve_slot(artist.pk)
+    
+    def test_reconcile_recounts_open_commissions(self, client_user, create_artist):
+        from django.core.management import call_command
+        from apps.commissions.models import Commission
+        artist = create_artist('drifted', open_commissions=7, max_queue_depth=5)
+        Commission.objects.create(client=client_user, artist=artist, title='A', description='x')
+        Commission.objects.create(
+            client=client_user, artist=artist, title='B', description='x', status='delivered'
+        )
+        
+        out = StringIO()
+        call_command('reconcile_artist_queues', stdout=out)
+        artist.refresh_from_db()
+        assert (artist.open_commissions, artist.is_accepting_commissions) == (1, True)
+        call_command('reconcile_artist_queues', '--check', stdout=StringIO())
+
+
+@pytest.mark.django_db
+class TestArtistFields:
+    def test_list_expand_portfolio(self, api_client, create_artist):
+        from apps.artists.models import ArtistPortfolio
+        artist = create_artist('expanded')
+        ArtistPortfolio.objects.create(artist=artist, title='Piece', image='portfolio/x.png')
+        url = reverse('artist-list')
+        assert 'portfolio_items' not in api_client.get(url).data['results'][0]
+        response = api_client.get(url, {'fields': 'id,portfolio_items', 'expand': 'portfolio_items'})
+        item = response.data['results'][0]
+        assert set(item) == {'id', 'portfolio_items'}
+        assert item['portfolio_items'][0]['title'] == 'Piece'
+
+
+@pytest.mark.django_db
+class TestArtistTags:
+    def _ids(self, response):
+        return sorted(artist['id'] for artist in response.data['results'])
+    
+    def test_index_follows_saved_tags(self, create_artist):
+        from apps.artists.models import ArtistTag
+        artist = create_artist('tagged', tags=['Anime', ' anime ', 'Pixel  Art', 3])
+        links = ArtistTag.objects.filter(artist=artist).order_by('tag__name')
+        assert list(links.values_list('tag__name', flat=True)) == ['anime', 'pixel art']
+        artist.tags = ['Pixel Art', 'Chibi']
+        artist.save(update_fields=['tags', 'updated_at'])
+        assert list(links.values_list('tag__name', flat=True)) == ['chibi', 'pixel art']
+    
+    def test_filter_any_and_all(self, api_client, create_artist):
+        both = create_artist('both', tags=['Anime', 'Chibi'])
+        anime = create_artist('anime', tags=['anime'])
+        create_artist('other', tags=['Realism'])
+        url = reverse('artist-list')
+        
+        response = api_client.get(url, {'tags': 'anime,CHIBI'})
+        assert self._ids(response) == sorted([both.pk, anime.pk])
+        response = api_client.get(url, {'tags': 'anime,chibi', 'tags_match': 'all'})
+        assert self._ids(response) == [both.pk]
+        response = api_client.get(url, {'tags': ['anime', 'chibi'], 'tags_match': 'all'})
+        assert self._ids(response) == [both.pk]
+    
+    def test_facets_count_approved_accepting_artists(
+        self, api_client, create_artist, django_assert_num_queries,
+        django_capture_on_commit_callbacks
+    ):
+        from apps.artists import counters
+        create_artist('one', tags=['Anime', 'Chibi'])
+        busy = create_artist('two', tags=['anime'])
+        create_artist('hidden', status='pending', tags=['anime'])
+        url = reverse('artist-tag-facets')
+        
+        response = api_client.get(url)
+        assert response.data == [{'name': 'anime', 'count': 2}, {'name': 'chibi', 'count': 1}]
+        with django_assert_num_queries(0):
+            api_client.get(url)
+        
+        with django_capture_on_commit_callbacks(execute=True):
+            busy.accepting_enabled = False
+            busy.save(update_fields=['accepting_enabled', 'updated_at'])
+            counters.refresh_accepting(busy.pk)
+        response = api_client.get(url)
+        assert response.data == [{'name': 'anime', 'count': 1}, {'name': 'chibi', 'count': 1}]
+
+
+@pytest.mark.django_db
+class TestArtistResponseCache:
+    def test_list_pages_are_served_from_cache(
+        self, api_client, create_artist, django_assert_num_queries
+    ):
+        create_artist('cached', tags=['ink'])
+        url = reverse('artist-list')
+        first = api_client.get(url + '?ordering=-rating&tags=ink')
+        with django_assert_num_queries(0):
+            second = api_client.get(url + '?tags=ink&ordering=-rating')
+        assert second.status_code == status.HTTP_200_OK
+        assert second.data == first.data
+    
+    def test_artist_changes_invalidate_after_commit(
+        self, api_client, create_artist, django_capture_on_commit_callbacks
+    ):
+        artist = create_artist('renamed')
+        list_url, detail_url = reverse('artist-list'), reverse('artist-detail', args=[artist.pk])
+        api_client.get(list_url)
+        api_client.get(detail_url)
+        
+        with django_capture_on_commit_callbacks(execute=True):
+            artist.display_name = 'New Name'
+            artist.save(update_fields=['display_name', 'updated_at'])
+        assert api_client.get(list_url).data['results'][0]['display_name'] == 'New Name'
+        assert api_client.get(detail_url).data['display_name'] == 'New Name'
+    
+    def test_portfolio_and_counters_invalidate_the_detail(
+        self, api_client, create_artist, django_assert_num_queries,
+        django_capture_on_commit_callbacks
+    ):
+        from apps.artists import counters
+        from apps.artists.models import ArtistPortfolio
+        artist = create_artist('painter')
+        list_url, detail_url = reverse('artist-list'), reverse('artist-detail', args=[artist.pk])
+        api_client.get(list_url)
+        api_client.get(detail_url)
+        
+        with django_capture_on_commit_callbacks(execute=True):
+            ArtistPortfolio.objects.create(artist=artist, title='Piece', image='portfolio/x.png')
+            counters.record_completions(artist.pk)
+        response = api_client.get(detail_url)
+        assert len(response.data['portfolio_items']) == 1
+        assert response.data['total_commissions'] == 1
+        with django_assert_num_queries(0):
+            api_client.get(list_url)
+    
+    def test_detail_conditional_get_runs_no_queries(
+        self, api_client, create_artist, django_assert_num_queries,
+        django_capture_on_commit_callbacks
+    ):
+        from apps.artists import counters
+        artist = create_artist('polled')
+        url = reverse('artist-detail', args=[artist.pk])
+        etag = api_client.get(url)['ETag']
+        with django_assert_num_queries(0):
+            response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        
+        with django_capture_on_commit_callbacks(execute=True):
+            counters.record_completions(artist.pk)
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['total_commissions'] == 1
+
+@pytest.mark.django_db(transaction=True)
+def test_parallel_completions_are_counted_exactly(create_artist):
+    from concurrent.futures import ThreadPoolExecutor
+    from django.db import connection
+    from apps.commissions.models import Commission
+    from apps.commissions.state_machine import transition
+    
+    artist = create_artist('busy')
+    client = User.objects.create_user(username='buyer', email='buyer@example.com')
+    commissions = Commission.objects.bulk_create([
+        Commission(client=client, artist=artist, title=f'Job {i}', description='x',
+                   status='in_progress')
+        for i in range(200)
+    ])
+    
+    def complete(commission):
+        try:
+            transition(Commission.objects.get(pk=commission.pk), 'completed')
+        finally:
+            connection.close()
+    
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        list(pool.map(complete, commissions))
+    
+    artist.refresh_from_db()
+    assert artist.total_commissions == 200
+    assert Commission.objects.filter(artist=artist, status='completed').count() == 200
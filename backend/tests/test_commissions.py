@@ -105,3 +105,994 @@ class TestCommissionList:
         response = api_client.get(url)
         assert response.status_code == status.HTTP_200_OK
         assert len(response.data['results']) == 1
+
+
+@pytest.mark.django_db
+class TestCommissionStats:
+    def _create(self, api_client, client_user, artist_user):
+        api_client.force_authenticate(user=client_user)
+        response = api_client.post(reverse('commission-create'), {
+            'artist_id': artist_user.artist_profile.id,
+            'title': 'Stats Commission',
+            'description': 'Counted commission',
+        })
+        assert response.status_code == status.HTTP_201_CREATED
+        return Commission.objects.get(title='Stats Commission')
+    
+    def test_stats_follow_create_and_status_change(self, api_client, client_user, artist_user):
+        commission = self._create(api_client, client_user, artist_user)
+        
+        response = api_client.get(reverse('commission-stats'))
+        assert response.data['total'] == 1
+        assert response.data['pending'] == 1
+        
+        api_client.force_authenticate(user=artist_user)
+        api_client.post(reverse('commission-status', args=[commission.id]), {'status': 'accepted'})
+        api_client.post(reverse('commission-status', args=[commission.id]), {'status': 'in_progress'})
+        
+        response = api_client.get(reverse('commission-stats'))
+        assert response.data['total'] == 1
+        assert response.data['pending'] == 0
+        assert response.data['in_progress'] == 1
+    
+    def test_deleted_commissions_are_uncounted(self, api_client, client_user, artist_user):
+        from apps.commissions.stats import get_artist_stats
+        self._create(api_client, client_user, artist_user).delete()
+        assert get_artist_stats(artist_user.artist_profile).total == 0
+        
+        other = User.objects.create_user(username='leaving', email='leaving@example.com')
+        self._create(api_client, other, artist_user)
+        assert get_artist_stats(artist_user.artist_profile).pending == 1
+        other.delete()
+        stats = get_artist_stats(artist_user.artist_profile)
+        assert (stats.total, stats.pending) == (0, 0)
+    
+    def test_stats_endpoint_is_single_read(self, api_client, client_user, artist_user,
+                                           django_assert_num_queries):
+        self._create(api_client, client_user, artist_user)
+        api_client.force_authenticate(user=client_user)
+        with django_assert_num_queries(1):
+            api_client.get(reverse('commission-stats'))
+    
+    def test_rebuild_and_check_command(self, api_client, client_user, artist_user):
+        from django.core.management import call_command
+        from django.core.management.base import CommandError
+        from apps.commissions.models import ClientCommissionStats
+        
+        self._create(api_client, client_user, artist_user)
+        ClientCommissionStats.objects.filter(pk=client_user.pk).update(total=5)
+        with pytest.raises(CommandError):
+            call_command('rebuild_commission_stats', '--check')
+        
+        call_command('rebuild_commission_stats', '--batch-size', '1')
+        call_command('rebuild_commission_stats', '--check')
+        assert ClientCommissionStats.objects.get(pk=client_user.pk).total == 1
+
+
+@pytest.mark.django_db
+class TestCommissionKeysetPagination:
+    @pytest.fixture
+    def commissions(self, client_user, artist_user):
+        return [
+            Commission.objects.create(
+                client=client_user,
+                artist=artist_user.artist_profile,
+                title=f'Commission {i}',
+                description='Paged commission'
+            )
+            for i in range(45)
+        ]
+    
+    def test_walk_forward_and_back(self, api_client, client_user, commissions):
+        api_client.force_authenticate(user=client_user)
+        response = api_client.get(reverse('commission-list'))
+        assert response.data['count'] == 45
+        assert response.data['previous'] is None
+        
+        seen = [row['id'] for row in response.data['results']]
+        next_url = response.data['next']
+        while next_url:
+            response = api_client.get(next_url)
+            seen.extend(row['id'] for row in response.data['results'])
+            next_url = response.data['next']
+        expected = [c.id for c in sorted(commissions, key=lambda c: (c.created_at, c.id), reverse=True)]
+        assert seen == expected
+        
+        response = api_client.get(response.data['previous'])
+        assert [row['id'] for row in response.data['results']] == expected[20:40]
+    
+    def test_skip_count(self, api_client, client_user, commissions):
+        api_client.force_authenticate(user=client_user)
+        response = api_client.get(reverse('commission-list'), {'count': 'false'})
+        assert 'count' not in response.data
+        assert len(response.data['results']) == 20
+    
+    def test_invalid_cursor(self, api_client, client_user, commissions):
+        api_client.force_authenticate(user=client_user)
+        response = api_client.get(reverse('commission-list'), {'cursor': 'garbage'})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+    
+    def test_page_number_fallback(self, api_client, client_user, commissions):
+        api_client.force_authenticate(user=client_user)
+        response = api_client.get(reverse('commission-list'), {'page': 3})
+        assert response.data['count'] == 45
+        assert len(response.data['results']) == 5
+
+
+@pytest.mark.django_db
+class TestCommissionSearch:
+    @pytest.fixture(autouse=True, params=[None, 'apps.core.search.InvertedIndexBackend'])
+    def _search_backend(self, request, settings):
+        # The vendor default, then the in-process index, which is opt-in.
+        from apps.core import search
+        settings.SEARCH_BACKEND = request.param
+        search._backends.clear()
+        yield
+        backend = search.get_search_backend()
+        if hasattr(backend, 'reset'):
+            backend.reset()
+        search._backends.clear()
+    
+    def test_search_ranks_and_filters(self, api_client, client_user, artist_user):
+        artist = artist_user.artist_profile
+        weak = Commission.objects.create(
+            client=client_user, artist=artist,
+            title='Portrait', description='A dragon in the background'
+        )
+        strong = Commission.objects.create(
+            client=client_user, artist=artist,
+            title='Dragon dragon', description='Red dragon sketch'
+        )
+        Commission.objects.create(
+            client=client_user, artist=artist,
+            title='Landscape', description='Mountains'
+        )
+        api_client.force_authenticate(user=client_user)
+        response = api_client.get(reverse('commission-list'), {'search': 'drag'})
+        assert [row['id'] for row in response.data['results']] == [strong.id, weak.id]
+    
+    def test_search_requires_every_term(self, api_client, client_user, artist_user):
+        artist = artist_user.artist_profile
+        Commission.objects.create(
+            client=client_user, artist=artist, title='Red dragon', description='Sketch'
+        )
+        match = Commission.objects.create(
+            client=client_user, artist=artist, title='Blue dragon', description='Sketch'
+        )
+        api_client.force_authenticate(user=client_user)
+        response = api_client.get(reverse('commission-list'), {'search': 'dragon blue'})
+        assert [row['id'] for row in response.data['results']] == [match.id]
+    
+    def test_search_only_returns_own_commissions(self, api_client, client_user, artist_user):
+        other = User.objects.create_user(
+            username='other', email='other@example.com', password='testpass123'
+        )
+        Commission.objects.create(
+            client=other, artist=artist_user.artist_profile,
+            title='Dragon', description='Not yours'
+        )
+        api_client.force_authenticate(user=client_user)
+        response = api_client.get(reverse('commission-list'), {'search': 'dragon'})
+        assert response.data['results'] == []
+
+
+@pytest.mark.django_db
+def test_inverted_index_caps_candidates(monkeypatch, client_user, artist_user):
+    from apps.core.search import InvertedIndexBackend
+    Commission.objects.bulk_create([
+        Commission(
+            client=client_user, artist=artist_user.artist_profile,
+            title='Dragon ' * (i + 1), description='Sketch'
+        )
+        for i in range(10)
+    ])
+    backend = InvertedIndexBackend()
+    monkeypatch.setattr(backend, 'max_candidates', 3)
+    try:
+        results = backend.search(Commission.objects.all(), ['title'], ['dragon'])
+        assert [row.title.count('Dragon') for row in results] == [10, 9, 8]
+    finally:
+        backend.reset()
+
+@pytest.mark.django_db
+class TestCommissionStateMachine:
+    @pytest.fixture
+    def commission(self, client_user, artist_user):
+        return Commission.objects.create(
+            client=client_user,
+            artist=artist_user.artist_profile,
+            title='State Commission',
+            description='Transitions'
+        )
+    
+    def test_invalid_transition_rejected(self, api_client, artist_user, commission):
+        api_client.force_authenticate(user=artist_user)
+        url = reverse('commission-status', args=[commission.id])
+        response = api_client.post(url, {'status': 'delivered'})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        commission.refresh_from_db()
+        assert commission.status == 'pending'
+    
+    def test_stale_transition_conflicts(self, commission):
+        from apps.commissions.state_machine import transition, TransitionConflict
+        stale = Commission.objects.get(pk=commission.pk)
+        transition(commission, 'accepted')
+        with pytest.raises(TransitionConflict):
+            transition(stale, 'cancelled')
+        commission.refresh_from_db()
+        assert commission.status == 'accepted'
+    
+    def test_completion_counts_once(self, api_client, artist_user, commission):
+        from apps.commissions.state_machine import transition
+        for target in ('accepted', 'in_progress', 'completed'):
+            transition(commission, target)
+        artist = artist_user.artist_profile
+        artist.refresh_from_db()
+        assert artist.total_commissions == 1
+        assert commission.started_at is not None
+        assert commission.completed_at is not None
+    
+    def test_update_view_routes_status_through_state_machine(self, api_client, artist_user,
+                                                             commission):
+        api_client.force_authenticate(user=artist_user)
+        url = reverse('commission-update', args=[commission.id])
+        response = api_client.patch(url, {'status': 'completed'})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        response = api_client.patch(url, {'status': 'accepted', 'final_price': '50.00'})
+        assert response.status_code == status.HTTP_200_OK
+        commission.refresh_from_db()
+        assert commission.status == 'accepted'
+    
+    def test_patch_does_not_undo_concurrent_transition(self, monkeypatch, api_client,
+                                                      artist_user, commission):
+        from apps.commissions.serializers import CommissionUpdateSerializer
+        from apps.commissions.state_machine import transition
+        from apps.commissions.stats import get_artist_stats
+        save = CommissionUpdateSerializer.update
+        
+        def interleaved(serializer, instance, validated_data):
+            # Another request accepts the commission after this one loaded it.
+            transition(Commission.objects.get(pk=instance.pk), 'accepted')
+            return save(serializer, instance, validated_data)
+        
+        monkeypatch.setattr(CommissionUpdateSerializer, 'update', interleaved)
+        api_client.force_authenticate(user=artist_user)
+        response = api_client.patch(
+            reverse('commission-update', args=[commission.id]), {'notes': 'Sketch first'}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        commission.refresh_from_db()
+        assert (commission.status, commission.notes) == ('accepted', 'Sketch first')
+        stats = get_artist_stats(artist_user.artist_profile)
+        assert (stats.pending, stats.accepted) == (0, 1)
+
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+    @pytest.fixture
+    def commission(self, client_user, artist_user):
+        return Commission.objects.create(
+            client=client_user, artist=artist_user.artist_profile,
+            title='Polled', description='Conditional GET'
+        )
+    
+    def test_unchanged_commission_is_not_modified(
+        self, api_client, client_user, commission, django_assert_num_queries
+    ):
+        api_client.force_authenticate(user=client_user)
+        url = reverse('commission-detail', args=[commission.id])
+        response = api_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        etag = response['ETag']
+        
+        with django_assert_num_queries(1):
+            response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.content == b''
+        assert response['ETag'] == etag
+        
+        response = api_client.get(url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        response = api_client.get(url + '?format=json', HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+    
+    def test_changes_produce_a_new_etag(self, api_client, client_user, commission):
+        from apps.artists import counters
+        from apps.commissions.state_machine import transition
+        api_client.force_authenticate(user=client_user)
+        url = reverse('commission-detail', args=[commission.id])
+        etags = [api_client.get(url)['ETag']]
+        transition(commission, 'accepted')
+        etags.append(api_client.get(url, HTTP_IF_NONE_MATCH=etags[-1])['ETag'])
+        counters.record_review(commission.artist_id, 5)
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etags[-1])
+        assert response.status_code == status.HTTP_200_OK
+        assert len({*etags, response['ETag']}) == 3
+    
+    def test_invisible_commission_is_not_found(self, api_client, commission):
+        other = User.objects.create_user(username='other', email='other@example.com')
+        api_client.force_authenticate(user=other)
+        response = api_client.get(
+            reverse('commission-detail', args=[commission.id]), HTTP_IF_NONE_MATCH='*'
+        )
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+    
+    def test_reference_image_changes_produce_a_new_etag(self, api_client, client_user,
+                                                        commission):
+        from apps.commissions.models import CommissionReferenceImage
+        api_client.force_authenticate(user=client_user)
+        url = reverse('commission-detail', args=[commission.id]) + '?expand=reference_images'
+        etag = api_client.get(url)['ETag']
+        
+        image = CommissionReferenceImage.objects.create(
+            commission=commission, image='commissions/references/x.png', filename='x.png'
+        )
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert [i['id'] for i in response.data['reference_images']] == [image.id]
+        
+        etag = response['ETag']
+        image.delete()
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['reference_images'] == []
+
+
+@pytest.mark.django_db
+class TestSparseFields:
+    @pytest.fixture
+    def commission(self, client_user, artist_user, category):
+        return Commission.objects.create(
+            client=client_user, artist=artist_user.artist_profile, category=category,
+            title='Sparse', description='Fields'
+        )
+    
+    def _count(self, api_client, url):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        with CaptureQueriesContext(connection) as context:
+            response = api_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        return response, len(context.captured_queries)
+    
+    def test_fields_trim_payload_and_queries(self, api_client, client_user, commission):
+        api_client.force_authenticate(user=client_user)
+        url = reverse('commission-detail', args=[commission.id])
+        full, full_queries = self._count(api_client, url)
+        trimmed, trimmed_queries = self._count(api_client, url + '?fields=id,title,status')
+        assert set(trimmed.data) == {'id', 'title', 'status'}
+        assert trimmed.data['title'] == full.data['title']
+        assert trimmed_queries < full_queries
+    
+    def test_expand_adds_opt_in_fields(self, api_client, client_user, commission):
+        from apps.commissions.models import CommissionReferenceImage
+        CommissionReferenceImage.objects.create(
+            commission=commission, image='commissions/references/x.png', filename='x.png'
+        )
+        api_client.force_authenticate(user=client_user)
+        url = reverse('commission-detail', args=[commission.id])
+        assert 'reference_images' not in api_client.get(url).data
+        response = api_client.get(url, {'fields': 'id,reference_images', 'expand': 'reference_images'})
+        assert set(response.data) == {'id', 'reference_images'}
+        assert response.data['reference_images'][0]['filename'] == 'x.png'
+    
+    def test_list_fields_and_writes_are_unaffected(self, api_client, client_user, artist_user,
+                                                  commission):
+        api_client.force_authenticate(user=client_user)
+        response = api_client.get(reverse('commission-list'), {'fields': 'id,status'})
+        assert response.data['results'] == [{'id': commission.id, 'status': 'pending'}]
+        
+        api_client.force_authenticate(user=artist_user)
+        response = api_client.patch(
+            reverse('commission-update', args=[commission.id]) + '?fields=id',
+            {'quoted_price': '25.00'}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        commission.refresh_from_db()
+        assert str(commission.quoted_price) == '25.00'
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_transitions_have_single_winner(client_user, artist_user):
+    import threading
+    from django.db import connection
+    from apps.commissions.state_machine import transition, TransitionError
+    from apps.commissions.stats import get_client_stats
+    
+    commission = Commission.objects.create(
+        client=client_user,
+        artist=artist_user.artist_profile,
+        title='Contended',
+        description='Accept vs cancel'
+    )
+    targets = ['accepted', 'cancelled'] * 4
+    barrier = threading.Barrier(len(targets))
+    outcomes = []
+    
+    def worker(target):
+        snapshot = Commission.objects.get(pk=commission.pk)
+        barrier.wait()
+        try:
+            transition(snapshot, target)
+            outcomes.append(target)
+        except TransitionError:
+            outcomes.append(None)
+        finally:
+            connection.close()
+    
+    threads = [threading.Thread(target=worker, args=(t,)) for t in targets]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    winners = [o for o in outcomes if o]
+    assert len(winners) == 1
+    commission.refresh_from_db()
+    assert commission.status == winners[0]
+    stats = get_client_stats(client_user)
+    assert stats.total == 1
+    assert stats.pending == 0
+    assert getattr(stats, winners[0]) == 1
+
+
+@pytest.mark.django_db
+class TestCommissionBulkStatus:
+    def test_bulk_transitions_report_per_item(self, api_client, client_user, artist_user):
+        from apps.commissions.stats import get_artist_stats
+        artist = artist_user.artist_profile
+        pending = [
+            Commission.objects.create(
+                client=client_user, artist=artist, title=f'Bulk {i}', description='Bulk'
+            )
+            for i in range(3)
+        ]
+        delivered = Commission.objects.create(
+            client=client_user, artist=artist, title='Done', description='Bulk', status='delivered'
+        )
+        api_client.force_authenticate(user=artist_user)
+        response = api_client.post(reverse('commission-status-bulk'), {'transitions': [
+            {'id': pending[0].id, 'status': 'accepted'},
+            {'id': pending[1].id, 'status': 'accepted'},
+            {'id': pending[2].id, 'status': 'rejected'},
+            {'id': delivered.id, 'status': 'accepted'},
+            {'id': 999999, 'status': 'accepted'},
+        ]}, format='json')
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['updated'] == 3
+        assert [r['ok'] for r in response.data['results']] == [True, True, True, False, False]
+        assert set(
+            Commission.objects.filter(pk__in=[c.id for c in pending]).values_list('status', flat=True)
+        ) == {'accepted', 'rejected'}
+        stats = get_artist_stats(artist)
+        assert (stats.pending, stats.accepted, stats.rejected) == (0, 2, 1)
+    
+    def test_bulk_transitions_scoped_to_user(self, api_client, client_user, artist_user):
+        other = User.objects.create_user(
+            username='other', email='other@example.com', password='testpass123'
+        )
+        commission = Commission.objects.create(
+            client=other, artist=artist_user.artist_profile, title='Other', description='Bulk'
+        )
+        api_client.force_authenticate(user=client_user)
+        response = api_client.post(reverse('commission-status-bulk'), {'transitions': [
+            {'id': commission.id, 'status': 'cancelled'},
+        ]}, format='json')
+        assert response.data['results'][0]['error'] == 'Not found'
+        commission.refresh_from_db()
+        assert commission.status == 'pending'
+    
+    def test_bulk_transition_query_count_is_flat(self, api_client, client_user, artist_user,
+                                                 django_assert_max_num_queries):
+        from apps.commissions.stats import get_artist_stats, get_client_stats
+        artist = artist_user.artist_profile
+        commissions = [
+            Commission.objects.create(
+                client=client_user, artist=artist, title=f'Bulk {i}', description='Bulk'
+            )
+            for i in range(50)
+        ]
+        get_client_stats(client_user)
+        get_artist_stats(artist)
+        api_client.force_authenticate(user=artist_user)
+        payload = {'transitions': [{'id': c.id, 'status': 'accepted'} for c in commissions]}
+        with django_assert_max_num_queries(10):
+            response = api_client.post(reverse('commission-status-bulk'), payload, format='json')
+        assert response.data['updated'] == 50
+
+
+@pytest.mark.django_db
+class TestCommissionReviewRating:
+    def _review(self, api_client, commission, rating):
+        return api_client.post(
+            reverse('commission-review', kwargs={'pk': commission.pk}), {'rating': rating}
+        )
+    
+    def test_reviews_update_running_rating(self, api_client, client_user, artist_user):
+        artist = artist_user.artist_profile
+        commissions = [
+            Commission.objects.create(
+                client=client_user, artist=artist, title=f'Rated {i}',
+                description='Review', status='completed'
+            )
+            for i in range(3)
+        ]
+        api_client.force_authenticate(user=client_user)
+        for commission, rating in zip(commissions, [5, 4, 4]):
+            assert self._review(api_client, commission, rating).status_code == status.HTTP_200_OK
+        artist.refresh_from_db()
+        assert (artist.rating_sum, artist.total_reviews, str(artist.rating)) == (13, 3, '4.33')
+        
+        # Replacing a rating adjusts the sum without counting a new review.
+        self._review(api_client, commissions[0], 1)
+        artist.refresh_from_db()
+        assert (artist.rating_sum, artist.total_reviews, str(artist.rating)) == (9, 3, '3.00')
+    
+    def test_review_query_count_does_not_grow(self, api_client, client_user, artist_user,
+                                              django_assert_max_num_queries):
+        artist = artist_user.artist_profile
+        Commission.objects.bulk_create([
+            Commission(
+                client=client_user, artist=artist, title=f'Old {i}', description='Review',
+                status='delivered', client_rating=5
+            )
+            for i in range(200)
+        ])
+        Artist.objects.filter(pk=artist.pk).update(rating_sum=1000, total_reviews=200, rating=5)
+        commission = Commission.objects.create(
+            client=client_user, artist=artist, title='New', description='Review', status='completed'
+        )
+        api_client.force_authenticate(user=client_user)
+        with django_assert_max_num_queries(12):
+            response = self._review(api_client, commission, 3)
+        assert response.data['artist']['rating'] == '4.99'
+
+
+def _artwork(name='artwork.gif'):
+    from django.core.files.uploadedfile import SimpleUploadedFile
+    gif = (
+        b'GIF89a\x01\x00\x01\x00\x80\x00\x00\x00\x00\x00\xff\xff\xff!\xf9\x04\x01\x00'
+        b'\x00\x00\x00,\x00\x00\x00\x00\x01\x00\x01\x00\x00\x02\x02D\x01\x00;'
+    )
+    return SimpleUploadedFile(name, gif, content_type='image/gif')
+
+
+@pytest.mark.django_db
+class TestRevisionNumbering:
+    @pytest.fixture(autouse=True)
+    def _media_root(self, settings, tmp_path):
+        settings.MEDIA_ROOT = tmp_path
+    
+    def test_revisions_are_numbered_from_sequence(self, api_client, client_user, artist_user):
+        commission = Commission.objects.create(
+            client=client_user, artist=artist_user.artist_profile,
+            title='Revised', description='Revisions', status='in_progress'
+        )
+        api_client.force_authenticate(user=artist_user)
+        url = reverse('revision-create', kwargs={'commission_id': commission.pk})
+        numbers = [
+            api_client.post(url, {'artwork': _artwork()}, format='multipart').data['revision_number']
+            for _ in range(3)
+        ]
+        assert numbers == [1, 2, 3]
+        commission.refresh_from_db()
+        assert (commission.last_revision_number, commission.revisions_used) == (3, 3)
+    
+    def test_clients_cannot_submit_revisions(self, api_client, client_user, artist_user):
+        commission = Commission.objects.create(
+            client=client_user, artist=artist_user.artist_profile,
+            title='Revised', description='Revisions'
+        )
+        api_client.force_authenticate(user=client_user)
+        url = reverse('revision-create', kwargs={'commission_id': commission.pk})
+        response = api_client.post(url, {'artwork': _artwork()}, format='multipart')
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert not commission.revisions.exists()
+
+
+@pytest.mark.django_db
+class TestRecentRevisions:
+    @pytest.fixture
+    def commission(self, client_user, artist_user):
+        from apps.commissions.models import CommissionRevision
+        commission = Commission.objects.create(
+            client=client_user, artist=artist_user.artist_profile,
+            title='Revised', description='Revisions', status='in_progress'
+        )
+        CommissionRevision.objects.bulk_create([
+            CommissionRevision(
+                commission=commission, revision_number=number,
+                artwork='commissions/revisions/x.png'
+            )
+            for number in range(1, 26)
+        ])
+        Commission.objects.filter(pk=commission.pk).update(last_revision_number=25)
+        return commission
+    
+    def test_detail_embeds_newest_revisions_and_total(self, settings, api_client, client_user,
+                                                     commission):
+        settings.COMMISSION_RECENT_REVISIONS = 3
+        api_client.force_authenticate(user=client_user)
+        response = api_client.get(reverse('commission-detail', args=[commission.pk]))
+        assert [r['revision_number'] for r in response.data['revisions']] == [25, 24, 23]
+        assert response.data['revision_count'] == 25
+    
+    def test_status_change_response_is_bounded(self, settings, api_client, artist_user,
+                                               commission):
+        settings.COMMISSION_RECENT_REVISIONS = 2
+        api_client.force_authenticate(user=artist_user)
+        response = api_client.post(
+            reverse('commission-status', args=[commission.pk]), {'status': 'revision'}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert [r['revision_number'] for r in response.data['revisions']] == [25, 24]
+    
+    def test_revisions_endpoint_pages_history(self, api_client, client_user, commission):
+        api_client.force_authenticate(user=client_user)
+        url = reverse('revision-create', kwargs={'commission_id': commission.pk})
+        first = api_client.get(url).data
+        assert first['count'] == 25
+        assert first['results'][0]['revision_number'] == 25
+        rest = api_client.get(first['next']).data
+        numbers = [r['revision_number'] for r in first['results'] + rest['results']]
+        assert numbers == list(range(25, 0, -1))
+        assert rest['next'] is None
+    
+    def test_revisions_endpoint_hides_other_commissions(self, api_client, commission):
+        stranger = User.objects.create_user(
+            username='stranger', email='stranger@example.com', password='x', role='client'
+        )
+        api_client.force_authenticate(user=stranger)
+        url = reverse('revision-create', kwargs={'commission_id': commission.pk})
+        assert api_client.get(url).status_code == status.HTTP_404_NOT_FOUND
+    
+    
+    def test_patch_keeps_revision_sequence(self, monkeypatch, api_client, client_user,
+                                           artist_user):
+        from apps.commissions.serializers import CommissionUpdateSerializer
+        commission = Commission.objects.create(
+            client=client_user, artist=artist_user.artist_profile,
+            title='Revised', description='Revisions', status='in_progress'
+        )
+        api_client.force_authenticate(user=artist_user)
+        revisions_url = reverse('revision-create', kwargs={'commission_id': commission.pk})
+        save = CommissionUpdateSerializer.update
+        
+        def interleaved(serializer, instance, validated_data):
+            # A revision upload commits after the PATCH loaded the commission.
+            api_client.post(revisions_url, {'artwork': _artwork()}, format='multipart')
+            return save(serializer, instance, validated_data)
+        
+        monkeypatch.setattr(CommissionUpdateSerializer, 'update', interleaved)
+        response = api_client.patch(
+            reverse('commission-update', args=[commission.id]), {'notes': 'Almost there'}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        monkeypatch.undo()
+        commission.refresh_from_db()
+        assert (commission.last_revision_number, commission.revisions_used) == (1, 1)
+        response = api_client.post(revisions_url, {'artwork': _artwork()}, format='multipart')
+        assert response.data['revision_number'] == 2
+
+@pytest.mark.django_db(transaction=True)
+def test_parallel_revisions_get_distinct_numbers(settings, tmp_path, client_user, artist_user):
+    from concurrent.futures import ThreadPoolExecutor
+    from django.db import connection
+    settings.MEDIA_ROOT = tmp_path
+    settings.MEDIA_DERIVATIVES_ASYNC = False
+    commission = Commission.objects.create(
+        client=client_user, artist=artist_user.artist_profile,
+        title='Parallel', description='Revisions', status='in_progress'
+    )
+    url = reverse('revision-create', kwargs={'commission_id': commission.pk})
+    
+    def upload(_):
+        client = APIClient()
+        client.force_authenticate(user=artist_user)
+        try:
+            return client.post(url, {'artwork': _artwork()}, format='multipart').status_code
+        finally:
+            connection.close()
+    
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        codes = list(pool.map(upload, range(40)))
+    
+    assert codes == [status.HTTP_201_CREATED] * 40
+    numbers = sorted(commission.revisions.values_list('revision_number', flat=True))
+    assert numbers == list(range(1, 41))
+    commission.refresh_from_db()
+    assert commission.revisions_used == 40
+
+
+@pytest.mark.django_db
+class TestReferenceImages:
+    @pytest.fixture(autouse=True)
+    def _media_root(self, settings, tmp_path):
+        settings.MEDIA_ROOT = tmp_path
+    
+    @pytest.fixture
+    def commission(self, client_user, artist_user):
+        return Commission.objects.create(
+            client=client_user, artist=artist_user.artist_profile,
+            title='Referenced', description='References'
+        )
+    
+    def test_upload_list_and_delete(self, api_client, client_user, artist_user, commission):
+        url = reverse('reference-images', kwargs={'pk': commission.pk})
+        api_client.force_authenticate(user=client_user)
+        for i in range(3):
+            response = api_client.post(url, {'image': _artwork(f'ref{i}.gif')}, format='multipart')
+            assert response.status_code == status.HTTP_200_OK
+            assert response.data['total_images'] == i + 1
+        last = response.data['image']
+        assert last['url'].startswith('/media/commissions/references/')
+        
+        api_client.force_authenticate(user=artist_user)
+        response = api_client.get(url)
+        assert [img['filename'] for img in response.data['results']] == ['ref2.gif', 'ref1.gif', 'ref0.gif']
+        assert response.data['next'] is None
+        assert 'reference_images' not in api_client.get(
+            reverse('commission-detail', kwargs={'pk': commission.pk})
+        ).data
+        
+        # Only the client (or an admin) may delete.
+        assert api_client.delete(url, {'id': last['id']}, format='json').status_code == 404
+        api_client.force_authenticate(user=client_user)
+        api_client.delete(url, {'id': last['id']}, format='json')
+        assert commission.reference_images.count() == 2
+    
+    def test_delete_by_url_for_older_clients(self, api_client, client_user, commission):
+        url = reverse('reference-images', kwargs={'pk': commission.pk})
+        api_client.force_authenticate(user=client_user)
+        image = api_client.post(url, {'image': _artwork()}, format='multipart').data['image']
+        api_client.delete(url, {'url': image['url']}, format='json')
+        assert not commission.reference_images.exists()
+    
+    def test_rejects_unsupported_type(self, api_client, client_user, commission):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        api_client.force_authenticate(user=client_user)
+        response = api_client.post(
+            reverse('reference-images', kwargs={'pk': commission.pk}),
+            {'image': SimpleUploadedFile('notes.txt', b'hello', content_type='text/plain')},
+            format='multipart'
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def _png_bytes(size=(64, 64)):
+    import os
+    from io import BytesIO
+    from PIL import Image
+    buffer = BytesIO()
+    Image.frombytes('RGB', size, os.urandom(size[0] * size[1] * 3)).save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+@pytest.mark.django_db
+class TestChunkedArtworkUpload:
+    @pytest.fixture(autouse=True)
+    def _media_root(self, settings, tmp_path):
+        settings.MEDIA_ROOT = tmp_path
+        settings.ARTWORK_UPLOAD_CHUNK_SIZE = 4096
+    
+    @pytest.fixture
+    def commission(self, client_user, artist_user):
+        return Commission.objects.create(
+            client=client_user, artist=artist_user.artist_profile,
+            title='Delivered', description='Chunked', status='in_progress'
+        )
+    
+    def _start(self, api_client, commission, data, target='final_artwork', **extra):
+        import hashlib
+        return api_client.post(
+            reverse('artwork-upload-start', kwargs={'pk': commission.pk}),
+            {'target': target, 'filename': 'final.png', 'size': len(data),
+             'sha256': hashlib.sha256(data).hexdigest(), **extra},
+            format='json'
+        )
+    
+    def _put(self, api_client, upload_id, offset, chunk):
+        url = reverse('artwork-upload', kwargs={'upload_id': upload_id})
+        return api_client.put(
+            f'{url}?offset={offset}', chunk, content_type='application/octet-stream'
+        )
+    
+    def test_resumes_and_attaches_final_artwork(self, api_client, artist_user, commission,
+                                                tmp_path):
+        data = _png_bytes()
+        assert len(data) > 3 * 4096
+        api_client.force_authenticate(user=artist_user)
+        upload_id = self._start(api_client, commission, data).data['id']
+        
+        assert self._put(api_client, upload_id, 0, data[:4096]).data['received'] == 4096
+        # A chunk past the current offset is refused with the offset to resume from.
+        response = self._put(api_client, upload_id, 8192, data[8192:12288])
+        assert response.status_code == status.HTTP_409_CONFLICT
+        assert response.data['received'] == 4096
+        # A retried chunk overlapping stored bytes only appends the new part.
+        assert self._put(api_client, upload_id, 2048, data[2048:6144]).data['received'] == 6144
+        offset = 6144
+        while offset < len(data):
+            chunk = data[offset:offset + 4096]
+            offset = self._put(api_client, upload_id, offset, chunk).data['received']
+        status_url = reverse('artwork-upload', kwargs={'upload_id': upload_id})
+        assert api_client.get(status_url).data['received'] == len(data)
+        
+        response = api_client.post(
+            reverse('artwork-upload-complete', kwargs={'upload_id': upload_id}), {}, format='json'
+        )
+        assert response.status_code == status.HTTP_200_OK
+        commission.refresh_from_db()
+        assert commission.final_artwork.name.startswith('commissions/final/')
+        assert commission.final_artwork.read() == data
+        assert not commission.artwork_uploads.exists()
+        assert not list((tmp_path / '.incoming' / 'artwork').iterdir())
+    
+    def test_checksum_mismatch_is_rejected(self, api_client, artist_user, commission):
+        data = _png_bytes(size=(8, 8))
+        api_client.force_authenticate(user=artist_user)
+        upload_id = self._start(api_client, commission, data).data['id']
+        self._put(api_client, upload_id, 0, data[:-1] + b'\x00')
+        
+        response = api_client.post(
+            reverse('artwork-upload-complete', kwargs={'upload_id': upload_id}), {}, format='json'
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        commission.refresh_from_db()
+        assert not commission.final_artwork
+        # The bad bytes are discarded, so the file can be sent again.
+        assert commission.artwork_uploads.get().received == 0
+        assert self._put(api_client, upload_id, 0, data).data['received'] == len(data)
+        response = api_client.post(
+            reverse('artwork-upload-complete', kwargs={'upload_id': upload_id}), {}, format='json'
+        )
+        assert response.status_code == status.HTTP_200_OK
+        commission.refresh_from_db()
+        assert commission.final_artwork.read() == data
+    
+    def test_non_image_discards_the_session(self, api_client, artist_user, commission,
+                                            tmp_path):
+        data = b'%PDF-1.4 not an image' * 8
+        api_client.force_authenticate(user=artist_user)
+        upload_id = self._start(api_client, commission, data).data['id']
+        self._put(api_client, upload_id, 0, data)
+        response = api_client.post(
+            reverse('artwork-upload-complete', kwargs={'upload_id': upload_id}), {}, format='json'
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'start a new upload' in str(response.data)
+        assert not commission.artwork_uploads.exists()
+        assert not list((tmp_path / '.incoming' / 'artwork').iterdir())
+        
+        data = _png_bytes(size=(8, 8))
+        upload_id = self._start(api_client, commission, data).data['id']
+        self._put(api_client, upload_id, 0, data)
+        response = api_client.post(
+            reverse('artwork-upload-complete', kwargs={'upload_id': upload_id}), {}, format='json'
+        )
+        assert response.status_code == status.HTTP_200_OK
+    
+    def test_abort_and_purge_remove_claimed_part_files(self, api_client, artist_user,
+                                                       commission, tmp_path):
+        import os
+        import time
+        from io import StringIO
+        from django.core.management import call_command
+        from apps.commissions.models import ArtworkUpload
+        from apps.commissions.uploads import claimed_path, part_path
+        data = _png_bytes(size=(8, 8))
+        api_client.force_authenticate(user=artist_user)
+        upload = ArtworkUpload.objects.get(pk=self._start(api_client, commission, data).data['id'])
+        os.rename(part_path(upload), claimed_path(upload))
+        response = api_client.delete(reverse('artwork-upload', kwargs={'upload_id': upload.pk}))
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        parts = tmp_path / '.incoming' / 'artwork'
+        assert not list(parts.iterdir())
+        
+        # A claimed file left behind by a crashed finalize, without its row.
+        orphan = parts / '00000000-0000-0000-0000-000000000000.part.done'
+        orphan.write_bytes(b'partial')
+        old = time.time() - 72 * 3600
+        os.utime(orphan, (old, old))
+        call_command('purge_artwork_uploads', stdout=StringIO())
+        assert not orphan.exists()
+    
+    def test_revision_upload_gets_next_number(self, api_client, client_user, artist_user,
+                                              commission):
+        data = _png_bytes(size=(8, 8))
+        api_client.force_authenticate(user=client_user)
+        response = self._start(api_client, commission, data, target='revision')
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        
+        api_client.force_authenticate(user=artist_user)
+        upload_id = self._start(
+            api_client, commission, data, target='revision', notes='Second pass'
+        ).data['id']
+        self._put(api_client, upload_id, 0, data)
+        response = api_client.post(
+            reverse('artwork-upload-complete', kwargs={'upload_id': upload_id}), {}, format='json'
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        assert (response.data['revision_number'], response.data['notes']) == (1, 'Second pass')
+        assert commission.revisions.get().artwork.read() == data
+
+
+@pytest.mark.django_db
+class TestDeadlineReminders:
+    @pytest.fixture
+    def make_commission(self, client_user, artist_user):
+        def make(title, days, status='in_progress'):
+            from datetime import date, timedelta
+            return Commission.objects.create(
+                client=client_user, artist=artist_user.artist_profile, title=title,
+                description='Deadline', status=status,
+                deadline=date(2026, 3, 10) + timedelta(days=days)
+            )
+        return make
+    
+    def test_each_stage_is_notified_once(self, settings, make_commission, client_user,
+                                         artist_user):
+        from datetime import date
+        from apps.commissions.deadlines import send_reminders
+        from apps.notifications.models import Notification
+        settings.DEADLINE_REMINDER_DAYS = 2
+        today = date(2026, 3, 10)
+        soon = make_commission('Soon', 1)
+        late = make_commission('Late', -3)
+        make_commission('Later', 10)
+        make_commission('Done', -3, status='delivered')
+        
+        assert send_reminders(today, batch_size=1) == {'Overdue': 1, 'Due Soon': 1}
+        types = sorted(Notification.objects.values_list('user_id', 'type'))
+        assert types == sorted([
+            (artist_user.pk, 'deadline_approaching'),
+            (artist_user.pk, 'deadline_missed'),
+            (client_user.pk, 'deadline_missed'),
+        ])
+        reminder = Notification.objects.get(type='deadline_approaching')
+        assert (reminder.message, reminder.data) == (
+            '"Soon" is due in 1 day.', {'commission_id': soon.pk}
+        )
+        # Nothing new is due, so a second run sends nothing.
+        assert send_reminders(today) == {'Overdue': 0, 'Due Soon': 0}
+        # Once the due-soon commission slips past its deadline it is reported as missed.
+        assert send_reminders(date(2026, 3, 12)) == {'Overdue': 1, 'Due Soon': 0}
+        late.refresh_from_db()
+        assert late.deadline_reminder == Commission.DeadlineReminder.OVERDUE
+    
+    def test_moving_the_deadline_rearms_reminders(self, api_client, artist_user, make_commission):
+        from datetime import date
+        from apps.commissions.deadlines import send_reminders
+        commission = make_commission('Moved', 1)
+        send_reminders(date(2026, 3, 10))
+        api_client.force_authenticate(user=artist_user)
+        api_client.patch(
+            reverse('commission-update', kwargs={'pk': commission.pk}),
+            {'deadline': '2026-03-20'}, format='json'
+        )
+        commission.refresh_from_db()
+        assert commission.deadline_reminder == Commission.DeadlineReminder.NONE
+    
+    def test_deadline_moved_outside_the_api_rearms_reminders(self, make_commission):
+        from datetime import date
+        from apps.commissions.deadlines import send_reminders
+        commission = make_commission('Admin', 1)
+        send_reminders(date(2026, 3, 10))
+        commission.refresh_from_db()
+        commission.notes = 'Unrelated edit'
+        commission.save(update_fields=['notes', 'updated_at'])
+        commission.save()
+        commission.refresh_from_db()
+        assert commission.deadline_reminder == Commission.DeadlineReminder.DUE_SOON
+        
+        commission.deadline = date(2026, 4, 1)
+        commission.save(update_fields=['deadline', 'updated_at'])
+        commission.refresh_from_db()
+        assert commission.deadline_reminder == Commission.DeadlineReminder.NONE
+    
+    def test_scan_uses_the_deadline_index(self):
+        from datetime import date
+        from apps.commissions.deadlines import overdue
+        plan = overdue(date(2026, 3, 10)).explain()
+        assert 'commission_deadline_idx' in plan
@@ -0,0 +1,287 @@
+"""
+Tests for media app.
+"""
+
+import pytest
+from io import BytesIO, StringIO
+from PIL import Image
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APIClient
+from apps.users.models import User
+from apps.artists.models import Artist, ArtistPortfolio
+from apps.media.imaging import render_variants
+from apps.media.models import ImageDerivative
+
+
+def image_bytes(size=(1600, 800), image_format='PNG', mode='RGBA'):
+    buffer = BytesIO()
+    Image.new(mode, size, (200, 40, 40, 255)[:len(mode)]).save(buffer, image_format)
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.MEDIA_DERIVATIVES_ASYNC = False
+    return tmp_path
+
+
+@pytest.fixture
+def artist():
+    user = User.objects.create_user(username='painter', email='painter@example.com', role='artist')
+    return Artist.objects.create(
+        user=user, display_name='Painter', specialty='Oil', status='approved'
+    )
+
+
+class TestRenderVariants:
+    def test_variants_keep_aspect_ratio_and_never_upscale(self):
+        specs = [('thumb', 320, 'JPEG'), ('thumb_webp', 320, 'WEBP'), ('huge', 4000, 'WEBP')]
+        rendered = {row[0]: row for row in render_variants(image_bytes(), specs)}
+        assert rendered['thumb'][1:4] == (320, 160, 'JPEG')
+        assert rendered['thumb_webp'][1:4] == (320, 160, 'WEBP')
+        assert rendered['huge'][1:3] == (1600, 800)
+        with Image.open(BytesIO(rendered['thumb_webp'][4])) as image:
+            assert image.format == 'WEBP'
+
+
+@pytest.mark.django_db
+class TestImageDerivatives:
+    def test_portfolio_upload_exposes_variants(self, media_root, artist):
+        client = APIClient()
+        client.force_authenticate(user=artist.user)
+        upload = SimpleUploadedFile('piece.png', image_bytes(), content_type='image/png')
+        response = client.post(
+            reverse('portfolio-list'), {'title': 'Piece', 'image': upload}, format='multipart'
+        )
+        assert response.status_code == 201
+        item = ArtistPortfolio.objects.get()
+        assert ImageDerivative.objects.filter(source=item.image.name).count() == 4
+        
+        response = APIClient().get(reverse('artist-detail', kwargs={'pk': artist.pk}))
+        variants = response.data['portfolio_items'][0]['image_variants']
+        assert set(variants) == {'original', 'thumb', 'thumb_webp', 'medium', 'medium_webp'}
+        assert variants['original'] == {
+            'width': 1600, 'height': 800, 'format': 'png', 'size': len(image_bytes())
+        }
+        assert (variants['thumb']['width'], variants['thumb']['height']) == (320, 160)
+        assert variants['thumb_webp']['url'].endswith('.webp')
+    
+    def test_stored_variants_invalidate_cached_artist_pages(
+        self, settings, media_root, artist, django_capture_on_commit_callbacks
+    ):
+        from apps.media import derivatives
+        settings.MEDIA_DERIVATIVES_ASYNC = True  # render later, as the pool would
+        for name in ('portfolio/late.png', 'avatars/late.png'):
+            (media_root / name).parent.mkdir(exist_ok=True)
+            (media_root / name).write_bytes(image_bytes())
+        ArtistPortfolio.objects.create(artist=artist, title='Late', image='portfolio/late.png')
+        User.objects.filter(pk=artist.user_id).update(avatar='avatars/late.png')
+        client = APIClient()
+        list_url = reverse('artist-list')
+        detail_url = reverse('artist-detail', kwargs={'pk': artist.pk})
+        assert 'thumb' not in client.get(list_url).data['results'][0]['avatar_variants']
+        assert 'thumb' not in client.get(detail_url).data['portfolio_items'][0]['image_variants']
+        
+        with django_capture_on_commit_callbacks(execute=True):
+            derivatives.generate('portfolio/late.png')
+            derivatives.generate('avatars/late.png')
+        detail = client.get(detail_url).data
+        assert 'thumb' in detail['portfolio_items'][0]['image_variants']
+        assert 'thumb' in client.get(list_url).data['results'][0]['avatar_variants']
+    
+    def test_unreadable_images_are_skipped(self, media_root, artist):
+        ArtistPortfolio.objects.create(artist=artist, title='Broken', image='portfolio/missing.png')
+        assert not ImageDerivative.objects.exists()
+    
+    def test_backfill_renders_existing_media_in_parallel(self, settings, media_root, artist):
+        settings.MEDIA_DERIVATIVES_ASYNC = True  # keep saves from rendering inline
+        names = []
+        for i in range(3):
+            path = media_root / 'portfolio' / f'old{i}.png'
+            path.parent.mkdir(exist_ok=True)
+            path.write_bytes(image_bytes())
+            names.append(f'portfolio/old{i}.png')
+        ArtistPortfolio.objects.bulk_create([
+            ArtistPortfolio(artist=artist, title=name, image=name) for name in names
+        ])
+        
+        out = StringIO()
+        call_command('generate_image_derivatives', '--workers', '2', stdout=out)
+        assert 'Rendered variants for 3 image(s), 0 failed' in out.getvalue()
+        assert ImageDerivative.objects.filter(source__in=names).count() == 12
+        
+        # A second run has nothing left to do.
+        call_command('generate_image_derivatives', '--workers', '2', stdout=out)
+        assert 'Rendered variants for 0 image(s)' in out.getvalue()
+
+
+@pytest.mark.django_db
+class TestServeMedia:
+    @pytest.fixture
+    def stored(self, media_root):
+        (media_root / 'portfolio').mkdir()
+        (media_root / 'portfolio' / 'piece.png').write_bytes(image_bytes())
+        (media_root / 'commissions' / 'final').mkdir(parents=True)
+        (media_root / 'commissions' / 'final' / 'art.png').write_bytes(image_bytes())
+        return media_root
+    
+    def test_accel_redirect_hands_transfer_to_nginx(self, settings, stored, client):
+        settings.MEDIA_ACCEL_REDIRECT_PREFIX = '/protected-media/'
+        response = client.get('/media/portfolio/piece.png')
+        assert response.status_code == 200
+        assert response['X-Accel-Redirect'] == '/protected-media/portfolio/piece.png'
+        assert response['Content-Type'] == 'image/png'
+        assert response.content == b''
+        assert 'immutable' in response['Cache-Control']
+        
+        cached = client.get('/media/portfolio/piece.png', HTTP_IF_NONE_MATCH=response['ETag'])
+        assert cached.status_code == 304
+    
+    def test_streams_without_accel_prefix(self, settings, stored, client):
+        settings.MEDIA_ACCEL_REDIRECT_PREFIX = ''
+        response = client.get('/media/portfolio/piece.png')
+        assert b''.join(response.streaming_content) == image_bytes()
+    
+    def test_private_media_needs_signed_url(self, settings, stored, client):
+        from django.core.files.storage import default_storage
+        settings.MEDIA_ACCEL_REDIRECT_PREFIX = '/protected-media/'
+        assert client.get('/media/commissions/final/art.png').status_code == 403
+        
+        url = default_storage.url('commissions/final/art.png')
+        response = client.get(url)
+        assert response.status_code == 200
+        assert response['Cache-Control'].startswith('private')
+        tampered = url.replace('final/art', 'final/other')
+        assert client.get(tampered).status_code == 403
+    
+    def test_signed_urls_expire(self, settings):
+        from apps.media.storage import check_signature, signature_params
+        params = signature_params('commissions/final/art.png', now=1000)
+        assert check_signature('commissions/final/art.png', params, now=1000)
+        assert not check_signature('commissions/final/art.png', params, now=params['e'] + 1)
+    
+    def test_rejects_path_traversal(self, stored, client):
+        assert client.get('/media/../config/settings.py').status_code == 404
+        assert client.get('/media/portfolio/missing.png').status_code == 404
+        (stored / '.incoming').mkdir()
+        (stored / '.incoming' / 'part').write_bytes(b'partial')
+        assert client.get('/media/.incoming/part').status_code == 404
+
+
+@pytest.mark.django_db
+class TestContentAddressedStorage:
+    def test_identical_uploads_share_one_file(self, media_root, artist, django_capture_on_commit_callbacks):
+        from apps.media.models import MediaBlob
+        from apps.media.storage import is_content_addressed_name
+        data = image_bytes(size=(40, 20))
+        first = ArtistPortfolio.objects.create(
+            artist=artist, title='One', image=SimpleUploadedFile('a.png', data)
+        )
+        second = ArtistPortfolio.objects.create(
+            artist=artist, title='Two', image=SimpleUploadedFile('b.png', data)
+        )
+        assert first.image.name == second.image.name
+        assert is_content_addressed_name(first.image.name)
+        assert len(list((media_root / 'portfolio').rglob('*.png'))) == 1
+        assert MediaBlob.objects.get(name=first.image.name).refcount == 2
+        
+        with django_capture_on_commit_callbacks(execute=True):
+            first.delete()
+        assert (media_root / first.image.name).exists()
+        assert MediaBlob.objects.get(name=first.image.name).refcount == 1
+        
+        with django_capture_on_commit_callbacks(execute=True):
+            second.delete()
+        assert not (media_root / first.image.name).exists()
+        assert not MediaBlob.objects.exists()
+        assert not ImageDerivative.objects.exists()
+    
+    def test_replacing_an_image_releases_the_old_blob(
+        self, media_root, artist, django_capture_on_commit_callbacks
+    ):
+        from apps.media.models import MediaBlob
+        client = APIClient()
+        client.force_authenticate(user=artist.user)
+        url = reverse('user-profile')
+        names = []
+        for size in ((40, 20), (20, 40)):
+            upload = SimpleUploadedFile('me.png', image_bytes(size=size), content_type='image/png')
+            with django_capture_on_commit_callbacks(execute=True):
+                response = client.patch(url, {'avatar': upload}, format='multipart')
+            assert response.status_code == 200
+            artist.user.refresh_from_db()
+            names.append(artist.user.avatar.name)
+        
+        old, new = names
+        assert old != new
+        assert not (media_root / old).exists()
+        assert not MediaBlob.objects.filter(name=old).exists()
+        assert not ImageDerivative.objects.filter(source=old).exists()
+        assert (media_root / new).exists()
+    
+    def test_dedup_command_merges_legacy_copies(self, settings, media_root, artist):
+        from apps.media.models import MediaBlob
+        settings.MEDIA_DERIVATIVES_ASYNC = True  # keep saves from rendering inline
+        (media_root / 'portfolio').mkdir()
+        for name in ('old1.png', 'old2.png'):
+            (media_root / 'portfolio' / name).write_bytes(image_bytes(size=(40, 20)))
+            ArtistPortfolio.objects.create(artist=artist, title=name, image=f'portfolio/{name}')
+        
+        out = StringIO()
+        call_command('dedup_media', stdout=out)
+        assert '1 file(s) renamed, 1 duplicate(s) merged' in out.getvalue()
+        names = set(ArtistPortfolio.objects.values_list('image', flat=True))
+        assert len(names) == 1
+        name = names.pop()
+        assert [path.name for path in (media_root / 'portfolio').rglob('*.png')] == [
+            name.rsplit('/', 1)[1]
+        ]
+        blob = MediaBlob.objects.get(name=name)
+        assert (blob.refcount, blob.width, blob.height, blob.format) == (2, 40, 20, 'PNG')
+
+
+class TestImageValidation:
+    def test_type_comes_from_magic_bytes(self):
+        from apps.media.validation import inspect
+        upload = SimpleUploadedFile('photo.gif', image_bytes(size=(30, 10)), content_type='image/gif')
+        info = inspect(upload)
+        assert (info.format, info.width, info.height) == ('PNG', 30, 10)
+        assert info.size == upload.size
+    
+    def test_rejects_non_images_and_unlisted_formats(self):
+        from apps.media.validation import InvalidImage, inspect
+        with pytest.raises(InvalidImage):
+            inspect(SimpleUploadedFile('x.png', b'<?php echo 1; ?>', content_type='image/png'))
+        with pytest.raises(InvalidImage):
+            inspect(BytesIO(b'\x89PNG\r\n\x1a\n' + b'\x00' * 64))
+        with pytest.raises(InvalidImage):
+            inspect(BytesIO(image_bytes(image_format='PNG')), formats=('JPEG',))
+    
+    def test_rejects_decompression_bombs_from_the_header(self, settings):
+        from apps.media.validation import InvalidImage, inspect
+        settings.IMAGE_MAX_PIXELS = 1000 * 1000
+        # A 20000x20000 PNG compresses to a few hundred KB; only its header is read.
+        header = BytesIO()
+        Image.new('1', (20000, 20000)).save(header, 'PNG')
+        header.seek(0)
+        reads = []
+        original_read = header.read
+        header.read = lambda size=-1: reads.append(size) or original_read(size)
+        with pytest.raises(InvalidImage, match='too large'):
+            inspect(header)
+        assert sum(size for size in reads if size and size > 0) < 64 * 1024
+    
+    @pytest.mark.django_db
+    def test_portfolio_upload_rejects_spoofed_content_type(self, media_root, artist):
+        client = APIClient()
+        client.force_authenticate(user=artist.user)
+        upload = SimpleUploadedFile('piece.png', b'GIF8 not really', content_type='image/png')
+        response = client.post(
+            reverse('portfolio-list'), {'title': 'Piece', 'image': upload}, format='multipart'
+        )
+        assert response.status_code == 400
+        assert 'image' in response.data
+        assert not ArtistPortfolio.objects.exists()
@@ -0,0 +1,72 @@
+"""
+Tests for payments app.
+"""
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from apps.users.models import User
+from apps.artists.models import Artist
+from apps.commissions.models import Commission
+from apps.payments.models import Payment
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def client_user():
+    return User.objects.create_user(
+        username='client', email='client@example.com', password='testpass123', role='client'
+    )
+
+
+@pytest.fixture
+def payment(client_user):
+    artist_user = User.objects.create_user(
+        username='artist', email='artist@example.com', password='testpass123', role='artist'
+    )
+    artist = Artist.objects.create(
+        user=artist_user, display_name='Test Artist', specialty='Digital Art', status='approved'
+    )
+    commission = Commission.objects.create(
+        client=client_user, artist=artist, title='Paid', description='Payment'
+    )
+    return Payment.objects.create(
+        commission=commission, payer=client_user, payee=artist_user, amount=100, net_amount=95
+    )
+
+
+@pytest.mark.django_db
+class TestPaymentConditionalGet:
+    def test_expanded_commission_changes_produce_a_new_etag(self, api_client, client_user,
+                                                            payment):
+        from apps.commissions.state_machine import transition
+        api_client.force_authenticate(user=client_user)
+        url = reverse('payment-detail', args=[payment.pk]) + '?expand=commission'
+        response = api_client.get(url)
+        etag = response['ETag']
+        assert response.data['commission']['status'] == 'pending'
+        assert api_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == (
+            status.HTTP_304_NOT_MODIFIED
+        )
+        
+        transition(payment.commission, 'accepted')
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['commission']['status'] == 'accepted'
+    
+    def test_expanded_user_profile_changes_produce_a_new_etag(self, api_client, client_user,
+                                                              payment):
+        api_client.force_authenticate(user=client_user)
+        url = reverse('payment-detail', args=[payment.pk]) + '?expand=payer'
+        etag = api_client.get(url)['ETag']
+        profile = client_user.profile
+        profile.bio = 'Collector'
+        profile.save()
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['payer']['profile']['bio'] == 'Collector'
@@ -0,0 +1,105 @@
+"""
+Query budget regression tests for list and detail endpoints.
+
+Each endpoint is rendered against a small and a larger fixed dataset; the
+number of queries must be identical for both and stay within the budget,
+so an N+1 introduced by a serializer change fails here.
+"""
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from apps.users.models import User
+from apps.artists.models import Artist, ArtistPortfolio
+from apps.commissions.models import Commission, CommissionCategory, CommissionRevision
+from apps.payments.models import Payment
+from apps.notifications.models import Notification
+
+
+def build_dataset(size):
+    """Create `size` rows of every kind, all visible to the returned users."""
+    admin = User.objects.create_user(username='admin', email='admin@example.com', role='admin')
+    client = User.objects.create_user(username='client', email='client@example.com')
+    category = CommissionCategory.objects.create(name='Digital Art')
+    artists = []
+    for i in range(size):
+        user = User.objects.create_user(
+            username=f'artist{i}', email=f'artist{i}@example.com', role='artist'
+        )
+        artist = Artist.objects.create(
+            user=user, display_name=f'Artist {i}', specialty='Digital Art', status='approved'
+        )
+        ArtistPortfolio.objects.create(artist=artist, title=f'Piece {i}', image='portfolio/x.png')
+        artists.append(artist)
+    
+    commissions = []
+    for i in range(size):
+        commission = Commission.objects.create(
+            client=client, artist=artists[i], category=category,
+            title=f'Commission {i}', description='Budget test'
+        )
+        Payment.objects.create(
+            commission=commission, payer=client, payee=artists[i].user,
+            amount=100, net_amount=95
+        )
+        Notification.create_notification(client, 'system', f'Notice {i}', 'Budget test')
+        commissions.append(commission)
+    
+    for i in range(size):
+        CommissionRevision.objects.create(
+            commission=commissions[0], revision_number=i + 1, artwork='commissions/revisions/x.png'
+        )
+    
+    return {
+        'admin': admin,
+        'client': client,
+        'artist': artists[0],
+        'commission': commissions[0],
+        'payment': Payment.objects.filter(commission=commissions[0]).first(),
+    }
+
+
+# (url name, role to authenticate as, url args factory, query budget)
+ENDPOINTS = [
+    ('commission-list', 'client', None, 2),
+    ('commission-admin-list', 'admin', None, 2),
+    ('commission-detail', 'client', lambda d: [d['commission'].pk], 5),
+    ('artist-list', None, None, 2),
+    ('artist-admin-list', 'admin', None, 5),
+    ('artist-detail', None, lambda d: [d['artist'].pk], 4),
+    ('payment-list', 'client', None, 2),
+    ('payment-admin-list', 'admin', None, 2),
+    ('payment-detail', 'client', lambda d: [d['payment'].pk], 2),
+    ('user-list', 'admin', None, 2),
+    ('notification-list', 'client', None, 2),
+]
+
+
+def count_queries(name, role, args, size):
+    data = build_dataset(size)
+    api_client = APIClient()
+    if role:
+        api_client.force_authenticate(user=data[role])
+    url = reverse(name, args=args(data) if args else None)
+    # Measure the uncached path of endpoints behind the response cache.
+    cache.clear()
+    with CaptureQueriesContext(connection) as context:
+        response = api_client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+    return len(context.captured_queries)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('name,role,args,budget', ENDPOINTS, ids=[e[0] for e in ENDPOINTS])
+def test_query_budget_is_constant(name, role, args, budget):
+    small = count_queries(name, role, args, size=2)
+    Commission.objects.all().delete()
+    User.objects.all().delete()
+    CommissionCategory.objects.all().delete()
+    large = count_queries(name, role, args, size=8)
+    assert small == large, f'{name}: {small} queries for 2 rows, {large} for 8 rows'
+    assert large <= budget, f'{name}: {large} queries, budget is {budget}'
@@ -96,3 +96,112 @@ class TestUserProfile:
         url = reverse('user-profile')
         response = api_client.get(url)
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    
+    def test_profile_supports_conditional_get(self, api_client, create_user):
+        user = create_user()
+        api_client.force_authenticate(user=user)
+        url = reverse('user-profile')
+        etag = api_client.get(url)['ETag']
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        
+        api_client.patch(url, {'first_name': 'Renamed'})
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['first_name'] == 'Renamed'
+
+
+@pytest.mark.django_db
+class TestDashboardStats:
+    @pytest.fixture(autouse=True)
+    def _clear_cache(self, settings):
+        from django.core.cache import cache
+        settings.DASHBOARD_METRICS_BACKGROUND_REFRESH = False
+        cache.clear()
+    
+    def test_dashboard_stats_counts(self, api_client, create_user):
+        admin = create_user(email='admin@example.com', role='admin')
+        create_user(email='client1@example.com')
+        create_user(email='client2@example.com')
+        api_client.force_authenticate(user=admin)
+        response = api_client.get(reverse('dashboard-stats'))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['total_clients'] == 2
+        assert response.data['total_commissions'] == 0
+    
+    def test_dashboard_stats_served_from_snapshot(self, api_client, create_user,
+                                                  django_assert_num_queries):
+        admin = create_user(email='admin@example.com', role='admin')
+        api_client.force_authenticate(user=admin)
+        with django_assert_num_queries(3):
+            api_client.get(reverse('dashboard-stats'))
+        with django_assert_num_queries(0):
+            api_client.get(reverse('dashboard-stats'))
+    
+    def test_dashboard_stats_invalidated_on_user_change(
+        self, api_client, create_user, django_capture_on_commit_callbacks
+    ):
+        admin = create_user(email='admin@example.com', role='admin')
+        api_client.force_authenticate(user=admin)
+        assert api_client.get(reverse('dashboard-stats')).data['total_clients'] == 0
+        with django_capture_on_commit_callbacks(execute=True):
+            create_user(email='client1@example.com')
+            # Not invalidated before the commit.
+            assert api_client.get(reverse('dashboard-stats')).data['total_clients'] == 0
+        assert api_client.get(reverse('dashboard-stats')).data['total_clients'] == 1
+
+
+@pytest.mark.django_db
+class TestDashboardBootstrap:
+    @pytest.fixture
+    def client_user(self, create_user):
+        from apps.artists.models import Artist
+        from apps.commissions.models import Commission
+        from apps.notifications.models import Notification
+        from apps.payments.models import Payment
+        client = create_user(email='client@example.com')
+        artist = Artist.objects.create(
+            user=create_user(email='artist@example.com', role='artist'),
+            display_name='Artist', specialty='Digital Art', status='approved'
+        )
+        for i in range(3):
+            commission = Commission.objects.create(
+                client=client, artist=artist, title=f'Commission {i}', description='Bootstrap'
+            )
+            Payment.objects.create(
+                commission=commission, payer=client, payee=artist.user,
+                amount=100, net_amount=95, status='completed' if i else 'pending'
+            )
+        Notification.create_notification(client, 'system', 'Hello', 'Bootstrap')
+        return client
+    
+    def test_bootstrap_matches_individual_endpoints(self, api_client, client_user):
+        api_client.force_authenticate(user=client_user)
+        data = api_client.get(reverse('dashboard-bootstrap')).data
+        assert data['profile'] == api_client.get(reverse('user-profile')).data
+        assert data['commission_stats'] == api_client.get(reverse('commission-stats')).data
+        assert data['payment_stats'] == api_client.get(reverse('payment-stats')).data
+        unread = api_client.get(reverse('notification-unread-count')).data
+        assert data['unread_notifications'] == unread['unread_count'] == 1
+        listing = api_client.get(reverse('commission-list')).data
+        assert data['commissions']['results'] == listing['results']
+        assert data['commissions']['count'] == 3
+    
+    def test_bootstrap_page_links_point_to_commission_list(self, monkeypatch, api_client,
+                                                           client_user):
+        from apps.core.pagination import KeysetPagination
+        monkeypatch.setattr(KeysetPagination, 'page_size', 2)
+        api_client.force_authenticate(user=client_user)
+        commissions = api_client.get(reverse('dashboard-bootstrap')).data['commissions']
+        assert len(commissions['results']) == 2
+        assert reverse('commission-list') + '?cursor=' in commissions['next']
+        rest = api_client.get(commissions['next']).data
+        assert [c['title'] for c in rest['results']] == ['Commission 0']
+    
+    def test_payment_stats_use_one_query(self, client_user, django_assert_num_queries):
+        from apps.payments.stats import get_user_stats
+        with django_assert_num_queries(1):
+            stats = get_user_stats(client_user)
+        assert stats['pending_payments'] == 1
+        assert stats['completed_payments'] == 2
+        assert stats['total_spent'] == 200
@@ -44,6 +44,10 @@ export default function UserCommissionDetail() {
   const { id } = useParams()
   const { user } = useAuthStore()
   const [commission, setCommission] = useState(null)
+  const [referenceImages, setReferenceImages] = useState([])
+  const [referenceCursor, setReferenceCursor] = useState(null)
+  const [revisions, setRevisions] = useState([])
+  const [revisionCursor, setRevisionCursor] = useState(null)
   const [loading, setLoading] = useState(true)
   const [uploading, setUploading] = useState(false)
   const [selectedImage, setSelectedImage] = useState(null)
@@ -54,12 +58,15 @@ export default function UserCommissionDetail() {
 
   useEffect(() => {
     fetchCommission()
+    fetchReferenceImages()
   }, [id])
 
   const fetchCommission = async () => {
     try {
       const response = await commissionsAPI.getCommission(id)
       setCommission(response.data)
+      setRevisions(response.data.revisions || [])
+      setRevisionCursor(null)
     } catch (error) {
       toast.error('Failed to load commission')
     } finally {
@@ -67,6 +74,31 @@ export default function UserCommissionDetail() {
     }
   }
 
+  const fetchReferenceImages = async (cursor = null) => {
+    try {
+      const params = cursor ? { cursor, count: false } : { count: false }
+      const response = await commissionsAPI.getReferenceImages(id, params)
+      const { results, next } = response.data
+      setReferenceImages((images) => (cursor ? [...images, ...results] : results))
+      setReferenceCursor(next ? new URL(next, window.location.origin).searchParams.get('cursor') : null)
+    } catch (error) {
+      toast.error('Failed to load reference images')
+    }
+  }
+
+  // The commission embeds only its newest revisions; older ones are paged in.
+  const fetchRevisions = async (cursor = null) => {
+    try {
+      const params = cursor ? { cursor, count: false } : { count: false }
+      const response = await commissionsAPI.getRevisions(id, params)
+      const { results, next } = response.data
+      setRevisions((items) => (cursor ? [...items, ...results] : results))
+      setRevisionCursor(next ? new URL(next, window.location.origin).searchParams.get('cursor') : null)
+    } catch (error) {
+      toast.error('Failed to load revisions')
+    }
+  }
+
   const handleStatusUpdate = async (newStatus) => {
     try {
       await commissionsAPI.updateStatus(id, newStatus)
@@ -113,7 +145,7 @@ export default function UserCommissionDetail() {
     try {
       await commissionsAPI.uploadReferenceImage(id, formData)
       toast.success('Image uploaded successfully')
-      fetchCommission()
+      fetchReferenceImages()
     } catch (error) {
       toast.error(error.response?.data?.error || 'Failed to upload image')
     } finally {
@@ -122,13 +154,13 @@ export default function UserCommissionDetail() {
     }
   }
 
-  const handleDeleteImage = async (imageUrl) => {
+  const handleDeleteImage = async (imageId) => {
     if (!confirm('Delete this image?')) return
 
     try {
-      await commissionsAPI.deleteReferenceImage(id, imageUrl)
+      await commissionsAPI.deleteReferenceImage(id, imageId)
       toast.success('Image deleted')
-      fetchCommission()
+      setReferenceImages((images) => images.filter((img) => img.id !== imageId))
     } catch (error) {
       toast.error('Failed to delete image')
     }
@@ -286,7 +318,7 @@ export default function UserCommissionDetail() {
             </div>
 
             {/* Upload Area */}
-            {isClient && (!commission.reference_images?.length) && (
+            {isClient && !referenceImages.length && (
               <label className="block cursor-pointer">
                 <input
                   type="file"
@@ -306,10 +338,10 @@ export default function UserCommissionDetail() {
             )}
 
             {/* Image Gallery */}
-            {commission.reference_images?.length > 0 && (
+            {referenceImages.length > 0 && (
               <div className="grid grid-cols-2 sm:grid-cols-3 gap-4">
-                {commission.reference_images.map((img, index) => (
-                  <div key={index} className="relative group aspect-square">
+                {referenceImages.map((img, index) => (
+                  <div key={img.id} className="relative group aspect-square">
                     <img
                       src={img.url}
                       alt={img.filename || `Reference ${index + 1}`}
@@ -318,7 +350,7 @@ export default function UserCommissionDetail() {
                     />
                     {isClient && (
                       <button
-                        onClick={() => handleDeleteImage(img.url)}
+                        onClick={() => handleDeleteImage(img.id)}
                         className="absolute top-2 right-2 p-1.5 bg-red-500 text-white rounded-full opacity-0 group-hover:opacity-100 transition-opacity hover:bg-red-600"
                       >
                         <XMarkIcon className="w-4 h-4" />
@@ -329,14 +361,21 @@ export default function UserCommissionDetail() {
                 ))}
               </div>
             )}
+            {referenceCursor && (
+              <div className="mt-4 text-center">
+                <Button variant="secondary" size="sm" onClick={() => fetchReferenceImages(referenceCursor)}>
+                  Load more
+                </Button>
+              </div>
+            )}
           </Card>
 
           {/* Revisions */}
-          {commission.revisions?.length > 0 && (
+          {revisions.length > 0 && (
             <Card className="!p-6">
               <h3 className="text-lg font-semibold text-morning-darker mb-4">Revisions</h3>
               <div className="space-y-4">
-                {commission.revisions.map((revision) => (
+                {revisions.map((revision) => (
                   <div key={revision.id} className="p-4 bg-morning-soft rounded-xl">
                     <div className="flex items-center justify-between mb-3">
                       <span className="font-medium text-morning-darker">
@@ -360,6 +399,13 @@ export default function UserCommissionDetail() {
                   </div>
                 ))}
               </div>
+              {revisions.length < commission.revision_count && (
+                <div className="mt-4 text-center">
+                  <Button variant="secondary" size="sm" onClick={() => fetchRevisions(revisionCursor)}>
+                    Load older revisions
+                  </Button>
+                </div>
+              )}
             </Card>
           )}
 
@@ -1,7 +1,8 @@
 import { useEffect, useState } from 'react'
 import { Link } from 'react-router-dom'
 import { useAuthStore } from '../../store/authStore'
-import { commissionsAPI, paymentsAPI } from '../../services/api'
+import { useNotificationStore } from '../../store/notificationStore'
+import { usersAPI } from '../../services/api'
 import { Card, CardTitle, StatsCard, StatusBadge } from '../../components/ui'
 import {
   BriefcaseIcon,
@@ -20,12 +21,10 @@ export default function UserDashboard() {
   useEffect(() => {
     const fetchData = async () => {
       try {
-        const [statsRes, commissionsRes] = await Promise.all([
-          commissionsAPI.getStats(),
-          commissionsAPI.getCommissions({ page_size: 5 }),
-        ])
-        setStats(statsRes.data)
-        setRecentCommissions(commissionsRes.data.results || [])
+        const { data } = await usersAPI.getDashboardBootstrap()
+        setStats(data.commission_stats)
+        setRecentCommissions((data.commissions.results || []).slice(0, 5))
+        useNotificationStore.setState({ unreadCount: data.unread_notifications })
       } catch (error) {
         console.error('Failed to fetch dashboard data')
       } finally {
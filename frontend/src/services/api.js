@@ -72,12 +72,15 @@ export const usersAPI = {
   updateUser: (id, data) => api.patch(`/users/${id}/`, data),
   deleteUser: (id) => api.delete(`/users/${id}/`),
   getDashboardStats: () => api.get('/users/dashboard/stats/'),
+  // Profile, stats, unread count and first commissions page in one request
+  getDashboardBootstrap: () => api.get('/users/dashboard/bootstrap/'),
 }
 
 // Artists API
 export const artistsAPI = {
   getArtists: (params) => api.get('/artists/', { params }),
   getArtist: (id) => api.get(`/artists/${id}/`),
+  getTagFacets: () => api.get('/artists/tags/'),
   createArtist: (data) => api.post('/artists/create/', data),
   updateArtist: (data) => api.patch('/artists/me/', data),
   getPortfolio: () => api.get('/artists/portfolio/'),
@@ -101,14 +104,25 @@ export const commissionsAPI = {
   // Categories
   getCategories: () => api.get('/commissions/categories/'),
   // Revisions
+  getRevisions: (commissionId, params) => api.get(`/commissions/${commissionId}/revisions/`, { params }),
   addRevision: (commissionId, data) => api.post(`/commissions/${commissionId}/revisions/`, data),
+  // Chunked artwork uploads (final artwork or a revision)
+  startArtworkUpload: (commissionId, data) => api.post(`/commissions/${commissionId}/uploads/`, data),
+  getArtworkUpload: (uploadId) => api.get(`/commissions/uploads/${uploadId}/`),
+  uploadArtworkChunk: (uploadId, offset, chunk) => api.put(`/commissions/uploads/${uploadId}/`, chunk, {
+    params: { offset },
+    headers: { 'Content-Type': 'application/octet-stream' }
+  }),
+  completeArtworkUpload: (uploadId, sha256) => api.post(`/commissions/uploads/${uploadId}/complete/`, { sha256 }),
+  abortArtworkUpload: (uploadId) => api.delete(`/commissions/uploads/${uploadId}/`),
   // Admin
   getAdminCommissions: (params) => api.get('/commissions/admin/list/', { params }),
   // Reference Images
+  getReferenceImages: (commissionId, params) => api.get(`/commissions/${commissionId}/reference-images/`, { params }),
   uploadReferenceImage: (commissionId, formData) => api.post(`/commissions/${commissionId}/reference-images/`, formData, {
     headers: { 'Content-Type': 'multipart/form-data' }
   }),
-  deleteReferenceImage: (commissionId, url) => api.delete(`/commissions/${commissionId}/reference-images/`, { data: { url } }),
+  deleteReferenceImage: (commissionId, imageId) => api.delete(`/commissions/${commissionId}/reference-images/`, { data: { id: imageId } }),
 }
 
 // Payments API